@@ -5,17 +5,41 @@
 
 __version__ = "2019-10-28 Oct"
 
-from .lprec      import LP, lp_check, print_lp
+from .lprec      import LP, lp_check, check_many, print_lp
+from .lpstats    import lp_stats, sketch_quantiles
+from .names      import NameTable
+from .builder    import LPBuilder
+from .compact    import PatternMatrix, compact_A, scipy_A
 from .load_lp    import load_lp
+from .load_many  import load_many
+from .batch      import batch_solve
+from .read_mps   import read_mps
+from .lpcache    import cache_clear
+from .glpz       import read_glpz, write_glpz
 from .save_lp    import save_lp
-from .lp_gnu     import gnulp_to_lp, lp_to_gnulp, gnulp_solve
+from .pgzip      import PGzipWriter, pgzip_file
+from .lpwriters  import write_cpxlp, write_freemps, LPWriter
+from .lp_gnu     import gnulp_to_lp, lp_to_gnulp, gnulp_solve, gnulp_basis, set_gnulp_basis
+from .solver     import Solver
+from .portfolio  import solve_portfolio
+from .solvecache import cached_solve, lp_hash
 from .lp_linprog import lp_to_linprog, linprog_to_lp
+from .presolve   import presolve, postsolve
+from .scaling    import scale, unscale_solution
+from .duplicates import merge_duplicates, unmerge_solution
+from .           import generators  # glp.generators.latin_square ...
+from .           import tracing  # glp.tracing.enable() ... write_chrome
 
 __all__ = """
-    LP lp_check print_lp
-    load_lp save_lp
-    gnulp_to_lp lp_to_gnulp gnulp_solve
-    lp_to_linprog linprog_to_lp
+    LP lp_check check_many print_lp lp_stats sketch_quantiles
+    NameTable PatternMatrix compact_A scipy_A LPBuilder
+    load_lp load_many batch_solve read_mps save_lp cache_clear PGzipWriter pgzip_file
+    read_glpz write_glpz write_cpxlp write_freemps LPWriter
+    gnulp_to_lp lp_to_gnulp gnulp_solve gnulp_basis set_gnulp_basis
+    Solver solve_portfolio cached_solve lp_hash
+    lp_to_linprog linprog_to_lp presolve postsolve scale unscale_solution
+    merge_duplicates unmerge_solution
+    generators tracing
 
 """.split()
 
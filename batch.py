@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+""" batch.py: solve many LP files on all cores, per-model limits, one summary file
+    python -m glp.batch [solver=simplex workers=8 time_limit=600 mem_limit=4e9 ...] files*
+    for r in batch_solve( "netlib/*.mps.gz", workers=8, summary="batch.jsonl" ): ...
+
+    Each model runs in its own process, so a runaway can be stopped:
+        time_limit: wall sec, the process is killed, status "timeout"
+        cpu_limit: cpu sec, RLIMIT_CPU, status "cpulimit"
+        mem_limit: bytes, RLIMIT_AS, status "memlimit" on a MemoryError,
+            "died" if GLPK runs out, glp_realloc: no memory available -> abort()
+    A RuntimeError in gnulp_solve, e.g. glp/dea.glp NUMERIC INSTABILITY, is retried:
+    a fresh LPX unscaled, then the other solver, simplex <-> interior;  retries=0: none.
+    A worker that dies, GLPK abort(), gets status "died", the rest run on.
+    summary: one JSON line per model as they finish --
+        lpfile problemname shape nnz obj status status_dual solver tries
+        wall cpu loadtime solvetime iters maxrss_mb error
+    iters: simplex iterations, None without glpkc / glp_get_it_cnt.
+    Replaces bin/glpsols: glpsol on each file, one at a time, scattered .glpsollog files.
+"""
+
+from __future__ import division, print_function
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from queue import Empty
+import numpy as np
+
+import glp
+from glp import glpkc
+from glp.portfolio import _kill
+from glp.zutil import Bag, globs
+
+#...............................................................................
+def batch_solve( lpfiles, solver="simplex", workers=None, time_limit=None, cpu_limit=None,
+                mem_limit=None, retries=2, summary=None, verbose=1 ):
+    """ lpfiles, globs ok -> iterator of Bag( lpfile obj status ... ), as they finish, see above
+        summary: a .jsonl file, appended a line per model
+    """
+    lpfiles = globs( lpfiles )
+    workers = workers or os.cpu_count()
+    todo = list( reversed( lpfiles ))
+    queue = multiprocessing.Queue()
+    running = dict()  # lpfile -> (Process, start time)
+    out = open( summary, "a" ) if summary  else None
+    limits = Bag( cpu_limit=cpu_limit, mem_limit=mem_limit )
+    try:
+        while todo or running:
+            while todo and len(running) < workers:
+                lpfile = todo.pop()
+                p = multiprocessing.Process( target=_solve1,
+                        args=(lpfile, solver, retries, limits, queue),
+                        name="batch " + lpfile, daemon=True )
+                p.start()
+                running[lpfile] = (p, time.time())
+            done = []
+            try:
+                res = queue.get( timeout=.1 )
+                running.pop( res.lpfile )[0].join()
+                done.append( res )
+            except Empty:
+                pass
+                # limits every pass, not only when the queue is quiet:
+                # other workers' results < .1 sec apart must not keep a hung model alive
+            for lpfile, (p, t0) in list( running.items() ):
+                if time_limit is not None and time.time() - t0 > time_limit:
+                    _kill( p )
+                    res = _record( lpfile, solver, status="timeout", wall=time.time() - t0,
+                            error="killed after %g sec" % time_limit )
+                elif not p.is_alive() and queue.empty():  # no result: rlimit, abort()
+                    p.join()
+                    status = "cpulimit" if p.exitcode in (-24, -9) and cpu_limit  else "died"
+                    res = _record( lpfile, solver, status=status, wall=time.time() - t0,
+                            error="exitcode %s" % p.exitcode )
+                else:
+                    continue
+                running.pop( lpfile )
+                done.append( res )
+            for res in done:
+                if verbose:
+                    print( "batch: %-40s %-9s obj %-14.8g wall %.2f  cpu %.2f  %s iters  %d tries" % (
+                            res.lpfile, res.status, res.obj if res.obj is not None  else np.nan,
+                            res.wall, res.cpu or 0, res.iters, res.tries ))
+                if out is not None:
+                    out.write( json.dumps( res ) + "\n" )
+                    out.flush()
+                yield res
+    finally:
+        for p, _ in running.values():
+            _kill( p )
+        if out is not None:
+            out.close()
+
+
+#...............................................................................
+def _solve1( lpfile, solver, retries, limits, queue ):
+    """ in a worker: rlimits, load_lp, gnulp_solve, retry on RuntimeError -> queue Bag """
+    import resource
+    t0 = time.time()
+    if limits.cpu_limit:
+        cpu = int( limits.cpu_limit + .999 )
+        resource.setrlimit( resource.RLIMIT_CPU, (cpu, cpu + 1) )  # SIGXCPU, then SIGKILL
+    if limits.mem_limit:
+        resource.setrlimit( resource.RLIMIT_AS, (int( limits.mem_limit ),) * 2 )
+    res = _record( lpfile, solver )
+    other = "interior" if solver == "simplex"  else "simplex"
+    plans = [(solver, True), (solver, False), (other, True)][: 1 + retries]  # solver, scale
+    try:
+        lp = glp.load_lp( lpfile, to="lp", verbose=0 )
+        res.update( problemname=lp.problemname, shape=list( lp.A.shape ), nnz=int( lp.A.nnz ),
+                loadtime=time.time() - t0 )
+        for solve_with, scale in plans:
+            res.tries += 1
+            t1 = time.time()
+            try:
+                gnulp = glp.lp_to_gnulp( lp, verbose=0 )  # fresh, no stale basis
+                sol = glp.gnulp_solve( gnulp, solver=solve_with, scale=scale, verbose=0 )
+            except RuntimeError:
+                res.error = traceback.format_exc()
+                continue
+            P = glpkc.prob_ptr( gnulp )
+            res.update( obj=sol.obj, status=sol.status, status_dual=sol.status_dual,
+                    solver=solve_with, solvetime=time.time() - t1, error=None,
+                    iters=None if P is None  else glpkc.iter_count( P ))
+            break
+    except MemoryError:
+        res.update( status="memlimit", error=traceback.format_exc() )
+    except Exception:
+        res.error = traceback.format_exc()
+    res.wall = time.time() - t0
+    res.cpu = time.process_time()
+    res.maxrss_mb = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss / 1e3  # linux KB
+    queue.put( res )
+
+
+def _record( lpfile, solver, **kw ):
+    """ -> Bag( the summary fields ), status "error" until solved """
+    res = Bag( lpfile=lpfile, problemname=None, shape=None, nnz=None, obj=None,
+            status="error", status_dual=None, solver=solver, tries=0,
+            wall=0., cpu=None, loadtime=None, solvetime=None, iters=None,
+            maxrss_mb=None, error=None )
+    res.update( kw )
+    return res
+
+
+
+#...............................................................................
+if __name__ == "__main__":
+    import sys
+    from glp.zutil import scan_args
+
+    lpfiles = "netlib/zib/mps/*.mps.gz"
+    solver = "simplex"  # interior
+    workers = None  # all cores
+    time_limit = None  # wall sec per model
+    cpu_limit = None
+    mem_limit = None  # bytes
+    retries = 2
+    summary = "batch.jsonl"
+
+        # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+    eqargs, fileargs = scan_args( sys.argv )
+    for eqarg in eqargs:
+        exec( eqarg )
+
+    t0 = time.time()
+    counts = dict()
+    for r in batch_solve( fileargs or lpfiles, solver=solver, workers=workers,
+            time_limit=time_limit, cpu_limit=cpu_limit, mem_limit=mem_limit,
+            retries=retries, summary=summary ):
+        counts[r.status] = counts.get( r.status, 0 ) + 1
+    print( "batch: %s  %.1f sec  -> %s" % (
+            "  ".join( "%d %s" % (v, k) for k, v in sorted( counts.items() )),
+            time.time() - t0, summary ))
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+""" builder.py: LPBuilder, grow an LP a row or a block of rows at a time
+    B = LPBuilder()
+    x = B.add_cols( n, c=c, ub=1 )  # -> column indices
+    B.add_row( [x[0], x[3]], [2, -1], b=4 )  # 2 x0 - x3 <= 4
+    B.add_rows( cols, vals=1, b=1, blo=1 )  # k x p index array: k rows at once
+    B.add_coo( nrow, i, j, val, b=... )  # ragged rows, i local 0 .. nrow-1
+    j = B.add_col( rows, vals, c=1, ub=5 )  # a column into rows already there
+    lp = B.to_lp( problemname="my" )  # one csr, no vstack
+
+    Rows come in order, so the nonzeros are csr already: column indices and values
+    go into growable buffers, doubled when full (amortized O(1) an entry),
+    plus a count per row.  to_lp() makes indptr from the counts
+    and wraps the buffers, no sort, no per-row matrices.
+    add_col nonzeros go into coo buffers, row col val, added to the csr in to_lp().
+"""
+
+from __future__ import division, print_function
+import numpy as np
+from scipy import sparse
+
+import glp
+from glp.names import nametable
+from glp.zutil import boundsvec
+from numpy import inf
+
+#...............................................................................
+class LPBuilder( object ):
+    """ rows, columns, bounds, names -> growable buffers -> LP() """
+
+    def __init__( self, nnz=1 << 16, verbose=1 ):
+        self.indices = _Buffer( np.int64, nnz )  # column of each nonzero
+        self.data = _Buffer( float, nnz )
+        self.rowcount = _Buffer( np.int64 )  # nonzeros in each row
+        self.colrow = _Buffer( np.int64 )  # add_col nonzeros, coo
+        self.colcol = _Buffer( np.int64 )
+        self.coldata = _Buffer( float )
+        self.b = _Buffer( float )
+        self.blo = _Buffer( float )
+        self.c = _Buffer( float )
+        self.lb = _Buffer( float )
+        self.ub = _Buffer( float )
+        self.kind = _Buffer( "U1" )  # mipvars "c" "i" "b"
+        self.rownames = []  # (first row, names or None) chunks
+        self.colnames = []
+        self.verbose = verbose
+
+    @property
+    def nrow( self ):
+        return len(self.rowcount)
+
+    @property
+    def ncol( self ):
+        return len(self.c)
+
+    def add_cols( self, n=1, c=0, lb=0, ub=inf, colname=None, kind="c" ):
+        """ n columns, c lb ub kind ("c" "i" "b") scalars or n-vecs -> their indices """
+        j0 = self.ncol
+        self.c.extend( boundsvec( c, n, 0 ))
+        self.lb.extend( boundsvec( lb, n, 0 ))
+        self.ub.extend( boundsvec( ub, n, inf ))
+        self.kind.extend( np.broadcast_to( np.asarray( kind, dtype="U1" ), (n,) ))
+        self.colnames.append( (j0, n, colname) )
+        return np.arange( j0, j0 + n )
+
+    def add_col( self, rows, vals=1., c=0, lb=0, ub=inf, colname=None, kind="c" ):
+        """ a column, vals in existing rows -> its index;
+            later add_row etc. can use it too
+        """
+        rows = np.atleast_1d( rows )
+        if len(rows):
+            assert 0 <= rows.min() and rows.max() < self.nrow, \
+                "LPBuilder: row %d, only %d -- add_col after the rows" % (rows.max(), self.nrow)
+        j = self.add_cols( 1, c=c, lb=lb, ub=ub,
+                colname=None if colname is None  else [colname], kind=kind )[0]
+        self.colrow.extend( rows )
+        self.colcol.extend( np.full( len(rows), j ))
+        self.coldata.extend( np.broadcast_to( np.asarray( vals, dtype=float ), rows.shape ))
+        return j
+
+    def add_row( self, cols, vals=1., b=inf, blo=-inf, rowname=None ):
+        """ blo <= sum vals * x[cols] <= b -> the row's index """
+        cols = np.atleast_1d( cols )
+        i = self.add_rows( cols[None, :], np.broadcast_to( vals, cols.shape )[None, :],
+                b=b, blo=blo, rowname=None if rowname is None  else [rowname] )
+        return i[0]
+
+    def add_rows( self, cols, vals=1., b=inf, blo=-inf, rowname=None ):
+        """ cols k x p int array: k rows of p nonzeros each, vals scalar or k x p,
+            b blo scalars or k-vecs -> row indices
+        """
+        cols = np.asarray( cols )
+        assert cols.ndim == 2, cols.shape
+        k, p = cols.shape
+        vals = np.broadcast_to( np.asarray( vals, dtype=float ), (k, p) )
+        return self._append( k, np.full( k, p ), cols.ravel(), vals.ravel(), b, blo, rowname )
+
+    def add_coo( self, nrow, i, j, val=1., b=inf, blo=-inf, rowname=None ):
+        """ nrow rows from coo triples, i local 0 .. nrow-1, any order -> row indices """
+        i = np.asarray( i )
+        order = np.argsort( i, kind="stable" )
+        j = np.asarray( j )[order]
+        val = np.broadcast_to( np.asarray( val, dtype=float ), i.shape )[order]
+        counts = np.bincount( i, minlength=nrow )
+        assert len(counts) == nrow, "add_coo: row index %d >= nrow %d" % (i.max(), nrow)
+        return self._append( nrow, counts, j, val, b, blo, rowname )
+
+    def _append( self, k, counts, cols, vals, b, blo, rowname ):
+        if len(cols):
+            assert 0 <= cols.min() and cols.max() < self.ncol, \
+                "LPBuilder: column %d, only %d -- add_cols first" % (cols.max(), self.ncol)
+        i0 = self.nrow
+        self.indices.extend( cols )
+        self.data.extend( vals )
+        self.rowcount.extend( counts )
+        self.b.extend( boundsvec( b, k, inf ))
+        self.blo.extend( boundsvec( blo, k, -inf ))
+        self.rownames.append( (i0, k, rowname) )
+        return np.arange( i0, i0 + k )
+
+    def tocsr( self ):
+        """ -> A csr, the buffers trimmed, duplicates summed, + add_col coo """
+        indptr = np.zeros( self.nrow + 1, dtype=np.int64 )
+        np.cumsum( self.rowcount.array(), out=indptr[1:] )
+        A = sparse.csr_matrix( (self.data.array(), self.indices.array(), indptr),
+                shape=(self.nrow, self.ncol) )
+        A.sum_duplicates()  # in place, sorts each row
+        if len(self.colrow):
+            A = A + sparse.csr_matrix( (self.coldata.array(),
+                    (self.colrow.array(), self.colcol.array())), shape=A.shape )
+        return A
+
+    def to_lp( self, problemname="noname", maximize=False, compact=False, verbose=None ):
+        """ -> LP( A b c blo lb ub rowname colname mipvars ... )
+            compact: A -> compact_A, e.g. a PatternMatrix of 1s
+        """
+        verbose = self.verbose if verbose is None  else verbose
+        A = self.tocsr()
+        if compact:
+            A = glp.compact_A( A, verbose=verbose )
+        kind = self.kind.array()
+        return glp.LP( A=A, b=self.b.array(), blo=self.blo.array(), c=self.c.array(),
+                lb=self.lb.array(), ub=self.ub.array(), problemname=problemname,
+                maximize=maximize,
+                rowname=_names( self.rownames, "r%d" ), colname=_names( self.colnames, "x%d" ),
+                mipvars=kind if (kind != "c").any()  else None,
+                verbose=verbose )
+
+
+#...............................................................................
+class _Buffer( object ):
+    """ a growable 1-d array: extend() doubles the capacity when full """
+
+    def __init__( self, dtype, size=1024 ):
+        self.buf = np.empty( size, dtype=dtype )
+        self.n = 0
+
+    def __len__( self ):
+        return self.n
+
+    def extend( self, x ):
+        x = np.asarray( x ).ravel()
+        n = self.n + len(x)
+        if n > len(self.buf):
+            buf = np.empty( max( n, 2 * len(self.buf) ), dtype=self.buf.dtype )
+            buf[:self.n] = self.buf[:self.n]
+            self.buf = buf
+        self.buf[self.n:n] = x
+        self.n = n
+
+    def array( self ):
+        """ -> the filled part, a view """
+        return self.buf[:self.n]
+
+
+def _names( chunks, fmt ):
+    """ [(first, n, names or None)] -> NameTable, None if no names at all;
+        chunks without names get fmt % index
+    """
+    if all( names is None for _, _, names in chunks ):
+        return None
+    strs = np.concatenate( [np.asarray( nametable( names ).strings() ) if names is not None
+                else np.char.add( fmt[:-2], np.arange( i0, i0 + n ).astype( str ))
+                for i0, n, names in chunks] )
+    return nametable( strs )
@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+""" compact.py: smaller A for LP( A b c ... )
+    A = compact_A( A )  # all nonzeros one value, e.g. lpgen34's 1s -> PatternMatrix
+        else csr with int32 indices, optional float32 data
+    A float64 csr with int64 indices is 16 bytes a nonzero; a PatternMatrix is 4.
+
+    PatternMatrix: indptr indices, one `value`, no data array --
+        A.data is a 0-stride view, A * x, A[rows], A.T, tocsr tocsc stay compact;
+        the writers, print_lp lp_check drop_unconstrained_rows use it as is.
+    scipy_A( A ): scipy.sparse float64, for consumers that need one --
+        lp_to_linprog, and lp_to_gnulp, as GLPK copies A into doubles anyway.
+"""
+
+from __future__ import division, print_function
+import numpy as np
+from scipy import sparse
+
+from glp.zutil import nbytes
+
+#...............................................................................
+class PatternMatrix( object ):
+    """ sparse csr or csc, every stored entry == value: indptr indices only,
+        int32 if they fit
+    """
+    ndim = 2
+
+    def __init__( self, indptr, indices, shape, value=1., format="csr" ):
+        assert format in ("csr", "csc"), format
+        dtype = _indexdtype( max( max( shape ), len(indices) ))
+        self.indptr = np.asarray( indptr, dtype=dtype )
+        self.indices = np.asarray( indices, dtype=dtype )
+        self.shape = tuple( int( s ) for s in shape )
+        self.value = np.float64( value )
+        self.format = format
+        nmajor = self.shape[format == "csc"]
+        assert len(self.indptr) == nmajor + 1, [len(self.indptr), self.shape, format]
+
+    @property
+    def nnz( self ):
+        return int( self.indptr[-1] )
+
+    @property
+    def dtype( self ):
+        return self.value.dtype
+
+    @property
+    def data( self ):
+        """ nnz x value, a read-only 0-stride view: 8 bytes """
+        return np.broadcast_to( self.value, (self.nnz,) )
+
+    @property
+    def T( self ):
+        """ csr <-> csc on the same arrays, no copy """
+        return PatternMatrix( self.indptr, self.indices, self.shape[::-1], self.value,
+                format="csc" if self.format == "csr"  else "csr" )
+
+    def tocsr( self, copy=False ):
+        return self if self.format == "csr"  else self._convert()
+
+    def tocsc( self, copy=False ):
+        return self if self.format == "csc"  else self._convert()
+
+    def _convert( self ):
+        """ csr <-> csc, the same matrix: counting sort of the minor indices """
+        nminor = self.shape[self.format == "csr"]
+        counts = np.bincount( self.indices, minlength=nminor )
+        indptr = np.r_[ 0, np.cumsum( counts ) ]
+        major = np.repeat( np.arange( len(self.indptr) - 1 ), np.diff( self.indptr ))
+        indices = major[ np.argsort( self.indices, kind="stable" )]
+        return PatternMatrix( indptr, indices, self.shape, self.value,
+                format="csc" if self.format == "csr"  else "csr" )
+
+    def dot( self, x ):
+        """ A x, x a vector -> float64 vector, without expanding A """
+        x = np.asarray( x )
+        if x.ndim != 1:
+            return scipy_A( self ).dot( x )
+        assert len(x) == self.shape[1], [len(x), self.shape]
+        if self.format == "csc":
+            xcol = np.repeat( x, np.diff( self.indptr ))
+            return self.value * np.bincount( self.indices, weights=xcol,
+                    minlength=self.shape[0] )
+        y = np.zeros( self.shape[0] )
+        starts = self.indptr[:-1]
+        nonempty = np.diff( self.indptr ) > 0
+        if self.nnz > 0:  # reduceat sums from each start to the next
+            y[nonempty] = np.add.reduceat( x[self.indices], starts[nonempty] )
+        return self.value * y
+
+    __mul__ = __matmul__ = dot
+
+    def __getitem__( self, rows ):
+        """ A[rows]: slice, int array or bool mask -> PatternMatrix csr """
+        assert not isinstance( rows, tuple ), "PatternMatrix: rows only, A[rows]"
+        A = self.tocsr()
+        if isinstance( rows, slice ):
+            rows = np.arange( A.shape[0] )[rows]
+        rows = np.asarray( rows )
+        if rows.dtype == bool:
+            assert len(rows) == A.shape[0], [len(rows), A.shape]
+            rows = np.flatnonzero( rows )
+        rows = np.atleast_1d( rows )
+        starts = A.indptr[rows].astype( np.int64 )
+        lens = A.indptr[rows + 1] - starts
+        indptr = np.r_[ 0, np.cumsum( lens ) ]
+        pos = np.repeat( starts - indptr[:-1], lens ) + np.arange( indptr[-1] )
+        return PatternMatrix( indptr, A.indices[pos], (len(rows), A.shape[1]), A.value )
+
+    def tocoo( self ):
+        return scipy_A( self ).tocoo()
+
+    def toarray( self ):
+        return scipy_A( self ).toarray()
+
+    @property
+    def A( self ):  # dense, as scipy's .A
+        return self.toarray()
+
+    def __repr__( self ):
+        return "<%d x %d PatternMatrix, %d entries == %g, %s %s>" % (
+                self.shape + (self.nnz, self.value, self.indices.dtype, self.format))
+
+
+#...............................................................................
+def compact_A( A, dtype=None, verbose=1 ):
+    """ A sparse -> the smallest form:
+        all stored entries one value -> PatternMatrix csr,
+        else csr with int32 indices if they fit, data .astype( dtype ) e.g. np.float32
+    """
+    if isinstance( A, PatternMatrix ):
+        return A
+    before = nbytes( A )
+    A = sparse.csr_matrix( A )
+    if A.nnz > 0 and A.data[0] != 0 and (A.data == A.data[0]).all():
+        C = PatternMatrix( A.indptr, A.indices, A.shape, A.data[0] )
+    else:
+        idx = _indexdtype( max( max( A.shape ), A.nnz ))
+        data = A.data if dtype is None  else A.data.astype( dtype )
+        C = sparse.csr_matrix( (data, A.indices.astype( idx ), A.indptr.astype( idx )),
+                shape=A.shape )
+        C.indices = C.indices.astype( idx, copy=False )  # scipy may widen
+        C.indptr = C.indptr.astype( idx, copy=False )
+    if verbose:
+        print( "compact_A: A %s  %d non0  %.3g -> %.3g mbytes  %s" % (
+                A.shape, A.nnz, before / 1e6, nbytes( C ) / 1e6, type(C).__name__ ))
+    return C
+
+
+def scipy_A( A, dtype=float ):
+    """ PatternMatrix or scipy.sparse -> scipy.sparse csr / csc of dtype,
+        A itself if it's that already
+    """
+    if isinstance( A, PatternMatrix ):
+        mat = sparse.csr_matrix if A.format == "csr"  else sparse.csc_matrix
+        return mat( (np.full( A.nnz, A.value, dtype=dtype ), A.indices, A.indptr),
+                shape=A.shape )
+    if not sparse.issparse( A ):
+        return sparse.csr_matrix( A, dtype=dtype )
+    return A if A.dtype == dtype  else A.astype( dtype )
+
+
+def _indexdtype( n ):
+    return np.int32 if n < 2**31 - 1  else np.int64
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+""" duplicates.py: merge parallel rows and identical columns, found by hashing
+    lpr, post = merge_duplicates( lp )
+    sol = gnulp_solve( lp_to_gnulp( lpr ))
+    full = unmerge_solution( post, sol.x, sol.y )  # -> Bag( x y ) of lp
+
+    Rows: each csr row, sorted, is divided by its first nonzero, a_i = f_i v;
+    rows with the same v are parallel, blo_i <= f_i v x <= b_i,
+    so one row with the tightest bounds on v x does for all of them.
+    Columns: the same A column and the same c, continuous:
+    x_j + x_k ... = z, one column with lb ub the sums.
+    Each row / col -> a 64-bit hash, the wrapping sum of splitmix64( col, value to 20 bits )
+    over its nonzeros, then np.unique; candidates are checked against
+    the first of their group, nonzero by nonzero, so a hash collision only misses a merge.
+    O(nnz), no per-row loops.
+
+    unmerge_solution: the y of a merged row goes to the row whose bound is active,
+    z is split over its columns from their lb (or ub) up, so every x_j is in bounds.
+"""
+
+from __future__ import division, print_function
+import numpy as np
+
+import glp
+from glp.compact import scipy_A
+from glp.names import nametable
+from glp.zutil import Bag
+
+#...............................................................................
+def merge_duplicates( lp, tol=1e-9, rows=True, cols=True, verbose=1 ):
+    """ LP -> lpr, post: parallel rows and identical columns merged, see above
+        post.status "ok" or "infeasible" (parallel rows with no common v x)
+    """
+    A = scipy_A( lp.A ).tocsr()
+    if not A.has_canonical_format or np.count_nonzero( A.data ) < A.nnz:
+        A = A.copy()  # not the caller's
+        A.sum_duplicates()  # sorts each row
+        A.eliminate_zeros()
+    m, n = A.shape
+    b = np.asarray( lp.b, dtype=float )
+    blo = np.asarray( lp.blo, dtype=float )
+    post = Bag( shape=(m, n), status="ok", sign=-1 if lp.maximize  else 1 )
+
+        # parallel rows: v = row / its first nonzero
+    cnt = np.diff( A.indptr )
+    first = np.zeros( m )
+    first[cnt > 0] = A.data[ A.indptr[:-1][cnt > 0] ]
+    f = np.where( cnt > 0, first, 1 )
+    v = A.data / np.repeat( f, cnt )
+    rep = _groups( A.indptr, A.indices, v, cnt > 0, tol ) if rows \
+        else np.arange( m )
+    with np.errstate( invalid="ignore" ):
+        lo = np.where( f > 0, blo, b ) / f  # bounds on v x
+        hi = np.where( f > 0, b, blo ) / f
+    lov, lofrom = _best( rep, lo, +1 )  # -> per row, of its group
+    hiv, hifrom = _best( rep, hi, -1 )
+    keeprows = (rep == np.arange( m )).nonzero()[0]
+    bad = keeprows[ lov[keeprows] > hiv[keeprows] + tol * (1 + np.abs( lov[keeprows] )) ]
+    if len(bad):
+        post.status = "infeasible"
+        if verbose:
+            print( "merge_duplicates %s: infeasible parallel rows %s" % (
+                    lp.problemname, bad[:10] ))
+    fk = f[keeprows]
+    lok, hik = lov[keeprows], hiv[keeprows]
+    lok = np.minimum( lok, hik )  # within tol, e.g. an eq row and a looser copy
+    bnew = np.where( fk > 0, hik, lok ) * fk
+    blonew = np.where( fk > 0, lok, hik ) * fk
+        # the row's own bounds exactly, not / f * f
+    own = np.where( fk > 0, hifrom[keeprows], lofrom[keeprows] ) == keeprows
+    bnew[own] = b[keeprows[own]]
+    own = np.where( fk > 0, lofrom[keeprows], hifrom[keeprows] ) == keeprows
+    blonew[own] = blo[keeprows[own]]
+    bnew = np.maximum( bnew, blonew )  # an ulp apart
+
+        # identical columns: A column and c, continuous only
+    C = A.tocsc()
+    C.sort_indices()
+    c = np.asarray( lp.c, dtype=float )
+    ccnt = np.diff( C.indptr )
+    mipvars = lp.get( "mipvars" )
+    cont = np.ones( n, dtype=bool ) if mipvars is None \
+        else (np.asarray( mipvars ) == "c")
+    crep = _groups( C.indptr, C.indices, C.data, cont & (ccnt > 0), 0, extra=c ) if cols \
+        else np.arange( n )
+    keepcols = (crep == np.arange( n )).nonzero()[0]
+    lb, ub = np.asarray( lp.lb, dtype=float ), np.asarray( lp.ub, dtype=float )
+    lbsum = np.bincount( crep, weights=lb, minlength=n )[keepcols]
+    ubsum = np.bincount( crep, weights=ub, minlength=n )[keepcols]
+
+    lpr = glp.LP( A=A[keeprows][:, keepcols], b=bnew, blo=blonew, c=c[keepcols],
+            lb=lbsum, ub=ubsum, problemname=lp.problemname, maximize=lp.maximize,
+            rowname=_take( lp.get( "rowname" ), keeprows ),
+            colname=_take( lp.get( "colname" ), keepcols ),
+            mipvars=None if mipvars is None  else np.asarray( mipvars )[keepcols],
+            verbose=0 )
+    post.update( rowrep=rep, keeprows=keeprows, f=f, lofrom=lofrom, hifrom=hifrom,
+            colrep=crep, keepcols=keepcols, lb=lb, ub=ub,
+            nrows=m - len(keeprows), ncols=n - len(keepcols) )
+    if verbose:
+        print( "merge_duplicates %s: %s -> %s, %d parallel rows, %d identical cols merged" % (
+                lp.problemname, A.shape, lpr.A.shape, post.nrows, post.ncols ))
+    return lpr, post
+
+
+def unmerge_solution( post, x, y=None ):
+    """ x y of the merged LP -> Bag( x y ) of the original, see above """
+    m, n = post.shape
+        # x: split each z over its group, base lb (or ub, or 0), then the room to ub / lb
+    lb, ub, crep = post.lb, post.ub, post.colrep
+    z = np.zeros( n )
+    z[post.keepcols] = x
+    base = np.where( np.isfinite( lb ), lb, np.where( np.isfinite( ub ), ub, 0 ))
+    rest = z - np.bincount( crep, weights=base, minlength=n )  # per rep
+    xfull = base.copy()
+    order = np.lexsort(( np.arange( n ), crep ))  # group by group, rep first
+    starts = np.r_[ True, crep[order][1:] != crep[order][:-1] ]
+    rank = np.arange( n ) - np.maximum.accumulate( np.where( starts, np.arange( n ), 0 ))
+    byrank = order[ np.argsort( rank, kind="stable" )]
+    ends = np.r_[ 0, np.cumsum( np.bincount( rank )) ]
+    for room, sign in ((ub - base, 1), (base - lb, -1)):
+        need = np.maximum( sign * rest, 0 )  # per rep
+        for r0, r1 in zip( ends[:-1], ends[1:] ):  # the 1st of each group, the 2nd ...
+            j = byrank[r0:r1]
+            take = np.minimum( need[crep[j]], room[j] )
+            xfull[j] += sign * take
+            need[crep[j]] -= take
+    if y is None:
+        return Bag( x=xfull, y=None )
+
+        # y: the merged row's y_v = y f_rep goes to the row with the active bound
+        # y > 0 at blo when minimizing, < 0 when maximizing, as in presolve
+    yfull = np.zeros( m )
+    keep = post.keeprows
+    yv = np.asarray( y ) * post.f[keep]
+    src = np.where( post.sign * yv > 0, post.lofrom[keep], post.hifrom[keep] )
+    yfull[src] = yv / post.f[src]
+    return Bag( x=xfull, y=yfull )
+
+
+#...............................................................................
+def _groups( indptr, indices, vals, live, tol, extra=None ):
+    """ csr / csc arrays -> rep[i], the first row equal to row i, i itself if none
+        live: rows to look at;  extra: one more value per row, e.g. c
+    """
+    k = len(indptr) - 1
+    cnt = np.diff( indptr )
+    h = _mix( indices.astype( np.uint64 ) ^ _mix( _quantize( vals )))
+    rowh = np.zeros( k, dtype=np.uint64 )
+    full = cnt > 0
+    rowh[full] = np.add.reduceat( h, indptr[:-1][full] )  # wraps, mod 2^64
+    rowh ^= _mix( cnt.astype( np.uint64 ))
+    if extra is not None:
+        rowh ^= _mix( _quantize( extra ) ^ np.uint64( 0x5bd1e995 ))
+    rep = np.arange( k )
+    ix = live.nonzero()[0]
+    _, first, inv = np.unique( rowh[ix], return_index=True, return_inverse=True )
+    cand = ix[ first[inv.ravel()] ]  # the first live row with the same hash
+    mem = (cand != ix).nonzero()[0]
+    i, p = ix[mem], cand[mem]
+    ok = cnt[i] == cnt[p]
+    i, p = i[ok], p[ok]
+    if extra is not None:
+        same = extra[i] == extra[p]
+        i, p = i[same], p[same]
+    if len(i):  # check nonzero by nonzero
+        c = cnt[i]
+        off = np.arange( c.sum() ) - np.repeat( np.cumsum( c ) - c, c )
+        qi = np.repeat( indptr[i], c ) + off
+        qp = np.repeat( indptr[p], c ) + off
+        eq = (indices[qi] == indices[qp]) & \
+            (np.abs( vals[qi] - vals[qp] ) <= tol * np.abs( vals[qp] ))
+        eq = np.logical_and.reduceat( eq, np.cumsum( c ) - c )
+        rep[ i[eq] ] = p[eq]
+    return rep
+
+
+def _best( rep, bound, more ):
+    """ -> per row, the tightest bound in its group (max if more > 0) and the row it's from """
+    k = len(rep)
+    order = np.lexsort(( - more * bound, rep ))  # the tightest first in each group
+    firsts = np.r_[ True, rep[order][1:] != rep[order][:-1] ]
+    src = np.zeros( k, dtype=int )
+    src[ rep[order][firsts] ] = order[firsts]  # by rep
+    src = src[rep]
+    return bound[src], src
+
+
+def _quantize( x ):
+    """ float64 -> uint64 bits, rounded to 20 bits of mantissa:
+        values a few ulp apart, 3 a / 3 a0 vs a / a0, land in the same bin but once in ~ 2^30
+    """
+    bits = np.ascontiguousarray( x, dtype=float ).view( np.uint64 )
+    return (bits + np.uint64( 1 << 31 )) & ~ np.uint64( (1 << 32) - 1 )
+
+
+def _mix( z ):
+    """ splitmix64 finalizer, uint64 -> uint64, wrapping """
+    z = (z ^ (z >> np.uint64( 30 ))) * np.uint64( 0xbf58476d1ce4e5b9 )
+    z = (z ^ (z >> np.uint64( 27 ))) * np.uint64( 0x94d049bb133111eb )
+    return z ^ (z >> np.uint64( 31 ))
+
+
+def _take( names, ix ):
+    names = nametable( names )
+    return None if names is None  else names.take( ix )
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+""" generators.py: scalable LP test problems, vectorized, straight to csr, seeded
+    lp = latin_square( n=55, d=3 )  # lpgen34: A 3n^2 x n^3, 3 1s in each column
+    lp = klee_minty( d=20 )  # the classic, dense lower triangle
+    lp = klee_minty_sparse( d=1000 )  # 2 nonzeros a row, 2^d vertices, max 1
+    lp = transportation( m, n )  # m + n rows, m n columns, 2 1s in each column
+    lp = random_feasible( m, n, k=10 )  # k nonzeros a row, known optimum lp.fopt lp.xopt
+
+    Every A is built in closed form, index arithmetic on whole arrays,
+    no per-row matrices; 10^7 nonzeros take a few seconds.
+    The same seed gives the same LP, bit for bit.
+    compact=True: A -> compact_A, e.g. a PatternMatrix for the 0/1 ones.
+"""
+    # test/lpgen34.py test/Klee_Minty_cube.py call these
+
+from __future__ import division, print_function
+import numpy as np
+from numpy import inf
+from scipy import sparse
+
+import glp
+from glp.compact import PatternMatrix
+
+#...............................................................................
+def latin_square( n, d=3, cint=9, seed=0, bmul=1, compact=False, verbose=1 ):
+    """ -> LP Ax = b = bmul, 0 <= x, A d n^(d-1) x n^d, d 1s in each column
+        c randint 0 .. cint, cint <= 0: uniform -- as test/lpgen34.py
+    """
+    A = latin_square_A( n, d, compact=compact )
+    b = np.full( A.shape[0], float( bmul ))
+    return glp.LP( A=A, b=b, blo=b, c=randc( A.shape[1], cint=cint, seed=seed ),
+            problemname="latin-square n%d d%d" % (n, d), verbose=verbose )
+
+
+def latin_square_A( n, d=3, compact=False ):
+    """ -> A d n^(d-1) x n^d csr, rows in the order of lpgen34's A2 A3 A4:
+        for each free axis d-1 .. 0, for each point of the other axes, n 1s along it
+    """
+    block = next( latin_rowblocks( n, d=d, block=None ))
+    return block if compact  else glp.scipy_A( block )
+
+
+def latin_rowblocks( n, d=3, block=1 << 14 ):
+    """ -> PatternMatrix blocks of `block` rows, None: all; for LPWriter """
+    nrow = n ** (d-1)
+    line = np.arange( n )
+    strides = n ** (d-1 - np.arange( d ))  # cube.ravel() index
+    if block is None:  # one block, all d axes
+        yield _latin_rows( n, d, [(axis, 0, nrow) for axis in range( d-1, -1, -1 )],
+                line, strides )
+        return
+    for axis in range( d-1, -1, -1 ):  # A3: i j line, i line k, line j k
+        for r0 in range( 0, nrow, block ):
+            yield _latin_rows( n, d, [(axis, r0, min( r0 + block, nrow ))], line, strides )
+
+
+def _latin_rows( n, d, parts, line, strides ):
+    indices = []
+    for axis, r0, r1 in parts:
+        fixed = [a for a in range( d ) if a != axis]
+        ix = np.unravel_index( np.arange( r0, r1 ), (n,) * (d-1) )
+        base = sum( i * strides[a] for i, a in zip( ix, fixed ))
+        indices.append( (base[:, None] + strides[axis] * line) .ravel() )
+    indices = np.concatenate( indices )
+    return PatternMatrix( np.arange( 0, len(indices) + 1, n ), indices,
+            shape=(len(indices) // n, n**d) )
+
+
+def randc( nc, cint=9, seed=0 ):
+    """ -> c randint 0 .. cint inclusive, cint <= 0: uniform 0 .. 1 """
+    random = seed if isinstance( seed, np.random.RandomState ) \
+            else np.random.RandomState( seed=seed )
+    if cint > 0:
+        return random.randint( 0, cint+1, size=nc ).astype( float )
+    return random.uniform( size=nc )
+
+
+#...............................................................................
+def klee_minty( d, inc=1, verbose=1 ):
+    """ Klee-Minty cube: d variables, d constraints, 2^d vertices, min f = - 5^d
+        A[i, i] = 1, A[i, j] = 2^(i-j+1) below, + inc everywhere -- dense, ill-conditioned
+        as test/Klee_Minty_cube.py, https://en.wikipedia.org/wiki/Klee-Minty_cube
+    """
+    i, j = np.indices( (d, d) )
+    A = np.where( i > j, 2. ** (i - j + 1), 0 ) + np.eye( d )
+    if inc:
+        A += inc
+    dpow = np.arange( d )
+    b = 5. ** (dpow + 1)  # 5 25 .. 5^d
+    c = - (2. ** dpow)[::-1]  # 2^(d-1) 2^(d-2) .. 1  minimize
+    return glp.LP( A=sparse.csr_matrix( A ), b=b, c=c,
+            problemname="Klee-Minty d%d inc%g" % (d, inc), verbose=verbose )
+
+
+def klee_minty_sparse( d, eps=1/3, verbose=1 ):
+    """ sparse Klee-Minty, the deformed cube:  max x_d,  0 <= x_1 <= 1,
+        eps x_j-1 <= x_j <= 1 - eps x_j-1 -- 2 nonzeros a row, 2^d vertices,
+        max 1 at x = (0 .. 0 1);  as rows x_j - eps x_j-1 >= 0, x_j + eps x_j-1 <= 1
+    """
+    assert 0 < eps < 1/2, eps
+    j = np.arange( 1, d )
+    k = len(j)
+    rows = np.repeat( np.arange( 2 * k ), 2 )
+    cols = np.c_[ j - 1, j, j - 1, j ].reshape( 2 * k, 2 ).ravel()
+    vals = np.c_[ np.full( k, - eps ), np.ones( k ), np.full( k, eps ), np.ones( k ) ].ravel()
+    A = sparse.csr_matrix( (vals, (rows, cols)), shape=(2 * k, d) )
+    b = np.r_[ np.full( k, inf ), np.ones( k ) ]
+    blo = np.r_[ np.zeros( k ), np.full( k, - inf ) ]
+    c = np.zeros( d )
+    c[-1] = 1
+    lp = glp.LP( A=A, b=b, blo=blo, c=c, ub=1, maximize=True,
+            problemname="Klee-Minty sparse d%d" % d, verbose=verbose )
+    lp.xopt = np.r_[ np.zeros( d - 1 ), 1. ]
+    lp.fopt = 1.
+    return lp
+
+
+#...............................................................................
+def transportation( m, n, cmax=100, seed=0, compact=False, verbose=1 ):
+    """ m sources, n sinks:  min sum cost_ij x_ij,
+            sum_j x_ij <= supply_i,  sum_i x_ij >= demand_j,  x >= 0
+        A (m + n) x mn, 2 1s in each column; sum supply >= sum demand, feasible
+        cost randint 1 .. cmax
+    """
+    random = np.random.RandomState( seed )
+    supply = random.randint( 1, 100, size=m ).astype( float )
+    demand = random.randint( 1, 100, size=n ).astype( float )
+    demand *= supply.sum() / demand.sum() * .95  # slack
+    cost = random.randint( 1, cmax + 1, size=m * n ).astype( float )
+    ij = np.arange( m * n ).reshape( m, n )
+    indices = np.r_[ ij.ravel(), ij.T.ravel() ]  # supply rows, then demand rows
+    indptr = np.r_[ np.arange( 0, m * n, n ), m * n + np.arange( 0, m * n + 1, m ) ]
+    A = PatternMatrix( indptr, indices, shape=(m + n, m * n) )
+    A = A if compact  else glp.scipy_A( A )
+    b = np.r_[ supply, np.full( n, inf ) ]
+    blo = np.r_[ np.full( m, - inf ), demand ]
+    return glp.LP( A=A, b=b, blo=blo, c=cost,
+            problemname="transportation %d x %d" % (m, n), verbose=verbose )
+
+
+def random_feasible( m, n, k=10, eq=.5, seed=0, verbose=1 ):
+    """ random sparse LP with a known optimum, from KKT conditions:
+        min c x,  Ax = b (fraction eq of the rows) or Ax <= b,  x >= 0
+        A: k nonzeros a row, uniform -1 .. 1;  x* >= 0 half 0, y* duals
+        b = A x* (+ slack on some <= rows, y 0 there),  c = A'y* + z, z >= 0, z x* = 0
+        -> LP with lp.xopt, lp.fopt = c x* = b y*
+    """
+    random = np.random.RandomState( seed )
+    indices = random.randint( 0, n, size=m * k )
+    data = random.uniform( -1, 1, size=m * k )
+    A = sparse.csr_matrix( (data, indices, np.arange( 0, m * k + 1, k )), shape=(m, n) )
+    A.sum_duplicates()
+
+    x = np.where( random.rand( n ) < .5, 0, random.uniform( 0, 10, size=n ))
+    iseq = random.rand( m ) < eq
+    slack = np.where( ~ iseq & (random.rand( m ) < .5), random.uniform( 0, 1, size=m ), 0 )
+    y = np.where( iseq, random.uniform( -1, 1, size=m ),
+            np.where( slack > 0, 0, - random.uniform( 0, 1, size=m )))  # <= rows: y <= 0
+    z = np.where( x > 0, 0, random.uniform( 0, 1, size=n ))
+    Ax = A.dot( x )
+    b = Ax + slack
+    blo = np.where( iseq, b, - inf )
+    c = A.T.dot( y ) + z
+    lp = glp.LP( A=A, b=b, blo=blo, c=c,
+            problemname="random-feasible %d x %d k%d seed%d" % (m, n, k, seed), verbose=verbose )
+    lp.xopt = x
+    lp.fopt = c.dot( x )
+    return lp
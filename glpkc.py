@@ -0,0 +1,381 @@
+#!/usr/bin/env python
+""" glpkc.py: numpy <-> LPX through the GLPK C API, ctypes -- opt-in
+    pyglpk moves one element at a time, glp.obj[j] = ... row.bounds = ... col.primal,
+    each through a Python Bar object. Here the matrix goes in with one glp_load_matrix
+    and out a row per glp_get_mat_row; obj, bounds, names, solutions and basis are still
+    a ctypes call per element -- GLPK has no array get / set -- but no Bar objects,
+    bounds split by type with numpy.
+
+    P = prob_ptr( gnulp ) reads the glp_prob * out of pyglpk's LPXObject, a private layout,
+    so only if asked for: GLP_BULK=1 in the environment or glpkc.enable(),
+    a pyglpk version in PYGLPK_VERSIONS, and a glpk.LPX itself. Else None, and lp_gnu
+    falls back to the per-element pyglpk code. The glp_* symbols come from pyglpk's own
+    extension module, i.e. the libglpk it's linked to, not some other one on the path.
+    GLPK abort()s the process on bad input where pyglpk raises, so inputs are checked
+    here first, ValueError: index ranges, duplicate (i, j), names > 255 bytes or with
+    control characters, basis stats not 1 .. 5.
+"""
+    # pyglpk src/lp.h: typedef struct { PyObject_HEAD  glp_prob *lp; ... } LPXObject;
+
+from __future__ import division, print_function
+import ctypes
+import os
+import numpy as np
+
+from glp.names import NameTable
+from glp.zutil import Bag
+from numpy import inf
+
+GLP_FR, GLP_LO, GLP_UP, GLP_DB, GLP_FX = 1, 2, 3, 4, 5  # glpk.h
+GLP_MIN, GLP_MAX = 1, 2
+GLP_BS, GLP_NL, GLP_NU, GLP_NF, GLP_NS = 1, 2, 3, 4, 5  # basis status
+PYGLPK_VERSIONS = ("0.4.", "0.5.")  # LPXObject { PyObject_HEAD  glp_prob *lp; ... }
+MAXNAME = 255  # GLPK's limit, bytes
+_enabled = os.environ.get( "GLP_BULK", "0" ) == "1"
+_lib = None
+
+#...............................................................................
+def enable( on=True ):
+    """ opt in to the C path, or out, for this process; GLP_BULK=1 does it at import """
+    global _enabled, _lib
+    _enabled = on
+    _lib = None
+
+
+def glpk_lib():
+    """ -> ctypes.CDLL of pyglpk's extension module with glp_* restype argtypes, or None """
+    global _lib
+    if _lib is not None:
+        return _lib or None
+    _lib = False
+    if not _enabled or pyglpk_version() is None:
+        return None
+    import glpk
+    try:
+        lib = ctypes.CDLL( glpk.__file__ )  # dlsym: the libglpk pyglpk is linked to
+        lib.glp_get_num_rows
+    except (OSError, AttributeError):
+        return None
+    _declare( lib )
+    _lib = lib
+    return lib
+
+
+def pyglpk_version():
+    """ -> pyglpk's version if it's one whose LPXObject layout is known, else None """
+    try:
+        from importlib.metadata import version
+        v = version( "glpk" )
+    except Exception:  # not installed, or not from a distribution
+        return None
+    return v if v.startswith( PYGLPK_VERSIONS )  else None
+
+
+def prob_ptr( gnulp ):
+    """ pyglpk LPX -> its glp_prob * as a c_void_p, or None, see above """
+    lib = glpk_lib()
+    if lib is None:
+        return None
+    import glpk
+    if type(gnulp) is not glpk.LPX:  # not a subclass or lookalike, the layout is LPX's
+        return None
+    P = ctypes.c_void_p.from_address( id(gnulp) + object.__basicsize__ ).value
+    if not P:
+        return None
+    P = ctypes.c_void_p( P )
+    if lib.glp_get_num_rows( P ) != len(gnulp.rows) \
+    or lib.glp_get_num_cols( P ) != len(gnulp.cols):
+        return None  # a sanity check, not a safety net
+    return P
+
+
+#...............................................................................
+def load_matrix( P, i, j, data ):
+    """ coo i j data, 0-based -> glp_load_matrix, one call """
+    check_coo( i, j, (_lib.glp_get_num_rows( P ), _lib.glp_get_num_cols( P )) )
+    ne = len(data)
+    ia = np.empty( ne + 1, dtype=np.intc )  # 1-based, [0] unused
+    ja = np.empty( ne + 1, dtype=np.intc )
+    ar = np.empty( ne + 1 )
+    ia[1:] = i
+    ia[1:] += 1
+    ja[1:] = j
+    ja[1:] += 1
+    ar[1:] = data
+    _lib.glp_load_matrix( P, ne, _intp( ia ), _intp( ja ), _dblp( ar ))
+
+
+def get_matrix( P ):
+    """ -> csr arrays data indices indptr, row by row into one buffer """
+    lib = _lib
+    nr = lib.glp_get_num_rows( P )
+    nnz = lib.glp_get_num_nz( P )
+    ind = np.empty( nnz + 1, dtype=np.intc )
+    val = np.empty( nnz + 1 )
+    indptr = np.zeros( nr + 1, dtype=np.intc )
+    indaddr, valaddr = ind.ctypes.data, val.ctypes.data
+    isize, dsize = ind.itemsize, val.itemsize
+    get_row = lib.glp_get_mat_row
+    k = 0
+    for i in range( nr ):  # writes ind[k+1 ..] val[k+1 ..]
+        k += get_row( P, i + 1, indaddr + k * isize, valaddr + k * dsize )
+        indptr[i + 1] = k
+    ind -= 1
+    return val[1:], ind[1:], indptr
+
+
+def set_obj( P, c, maximize=False, ix=None ):
+    """ new LPX: the nonzeros of c;  ix: c[k] -> col ix[k], 0s too, maximize None: as is """
+    set_coef = _lib.glp_set_obj_coef
+    if ix is not None:
+        check_ix( ix, _lib.glp_get_num_cols( P ), "set_obj: cols" )
+    if ix is None:
+        for j in np.flatnonzero( c ).tolist():
+            set_coef( P, j + 1, float( c[j] ))
+    else:
+        for j, cj in zip( np.asarray( ix ).tolist(), np.asarray( c, dtype=float ).tolist() ):
+            set_coef( P, j + 1, cj )
+    if maximize is not None:
+        _lib.glp_set_obj_dir( P, GLP_MAX if maximize  else GLP_MIN )
+
+
+def set_coefs( P, i, j, v ):
+    """ A[i, j] = v, 0-based, 0 removes: per row get_mat_row, merge, set_mat_row """
+    lib = _lib
+    n = lib.glp_get_num_cols( P )
+    ind = np.empty( n + 1, dtype=np.intc )
+    val = np.empty( n + 1 )
+    i, j, v = np.asarray( i ), np.asarray( j ), np.asarray( v, dtype=float )
+    check_ix( i, lib.glp_get_num_rows( P ), "set_coefs: rows" )
+    check_ix( j, n, "set_coefs: cols" )
+    order = np.argsort( i, kind="stable" )
+    rows, starts = np.unique( i[order], return_index=True )
+    for r, k0, k1 in zip( rows.tolist(), starts, np.r_[ starts[1:], len(i) ] ):
+        k = lib.glp_get_mat_row( P, r + 1, ind.ctypes.data, val.ctypes.data )
+        cols = np.r_[ ind[1:k+1], j[order[k0:k1]] + 1 ][::-1]  # reversed, the newest first
+        vals = np.r_[ val[1:k+1], v[order[k0:k1]] ][::-1]
+        cols, first = np.unique( cols, return_index=True )
+        vals = vals[first]
+        nz = vals != 0
+        rind = np.r_[ 0, cols[nz] ].astype( np.intc )  # 1-based, [0] unused
+        rval = np.r_[ 0., vals[nz] ]
+        lib.glp_set_mat_row( P, r + 1, int( nz.sum() ), rind.ctypes.data, rval.ctypes.data )
+
+
+def get_obj( P ):
+    n = _lib.glp_get_num_cols( P )
+    return _getvec( _lib.glp_get_obj_coef, P, n )
+
+
+def set_bounds( P, lo, hi, rows=True, ix=None ):
+    """ lo <= row or col <= hi, +- inf, split by type: a loop per type, only non-default
+        ix: lo[k] hi[k] -> row / col ix[k], every type
+    """
+    typ = bound_types( lo, hi )
+    set_bnds = _lib.glp_set_row_bnds if rows  else _lib.glp_set_col_bnds
+    lo = np.where( np.isfinite( lo ), lo, 0. )
+    hi = np.where( np.isfinite( hi ), hi, 0. )
+    types = (GLP_LO, GLP_UP, GLP_DB, GLP_FX) if rows and ix is None \
+        else (GLP_FR, GLP_LO, GLP_UP, GLP_DB, GLP_FX)
+    n = _lib.glp_get_num_rows( P ) if rows  else _lib.glp_get_num_cols( P )
+    ix = np.arange( len(lo) ) if ix is None  else np.asarray( ix )
+    check_ix( ix, n, "set_bounds: %s" % ("rows" if rows  else "cols") )
+    for t in types:
+        k = np.flatnonzero( typ == t )  # new rows are free, new cols fixed at 0
+        for j, l, u in zip( ix[k].tolist(), lo[k].tolist(), hi[k].tolist() ):
+            set_bnds( P, j + 1, t, l, u )
+
+
+def get_bounds( P, rows=True ):
+    """ -> lo hi, +- inf """
+    lib = _lib
+    n = lib.glp_get_num_rows( P ) if rows  else lib.glp_get_num_cols( P )
+    if rows:
+        gtype, glb, gub = lib.glp_get_row_type, lib.glp_get_row_lb, lib.glp_get_row_ub
+    else:
+        gtype, glb, gub = lib.glp_get_col_type, lib.glp_get_col_lb, lib.glp_get_col_ub
+    typ = _getvec( gtype, P, n, dtype=int )
+    lo = _getvec( glb, P, n )
+    hi = _getvec( gub, P, n )
+    lo[ (typ == GLP_FR) | (typ == GLP_UP) ] = - inf
+    hi[ (typ == GLP_FR) | (typ == GLP_LO) ] = inf
+    return lo, hi
+
+
+def bound_types( lo, hi ):
+    """ lo hi +- inf -> GLP_FR LO UP DB FX, vectorized """
+    lofin = np.isfinite( lo )
+    hifin = np.isfinite( hi )
+    typ = np.full( len(lo), GLP_FR, dtype=np.intc )
+    typ[ lofin & ~ hifin ] = GLP_LO
+    typ[ ~ lofin & hifin ] = GLP_UP
+    typ[ lofin & hifin ] = GLP_DB
+    typ[ lofin & hifin & (lo == hi) ] = GLP_FX
+    return typ
+
+
+def set_names( P, names, rows=True ):
+    set_name = _lib.glp_set_row_name if rows  else _lib.glp_set_col_name
+    n = _lib.glp_get_num_rows( P ) if rows  else _lib.glp_get_num_cols( P )
+    if len(names) > n:
+        raise ValueError( "set_names: %d names for %d %s" % (
+                len(names), n, "rows" if rows  else "cols" ))
+    if isinstance( names, NameTable ) and names.fmt is None:  # utf-8 already
+        check_names( names )
+        blob, off = names.blob.tobytes(), names.offsets.tolist()
+        for j in range( len(names) ):
+            set_name( P, j + 1, blob[ off[j] : off[j+1] ] )
+    else:
+        names = [str( nm ).encode( "utf-8" ) for nm in names]
+        check_names( names )
+        for j, nm in enumerate( names ):
+            set_name( P, j + 1, nm )
+
+
+def get_names( P, rows=True ):
+    """ -> NameTable """
+    lib = _lib
+    n = lib.glp_get_num_rows( P ) if rows  else lib.glp_get_num_cols( P )
+    get_name = lib.glp_get_row_name if rows  else lib.glp_get_col_name
+    names = [get_name( P, j ) or b"" for j in range( 1, n + 1 )]
+    return NameTable.from_bytes( b"".join( names ), [len(nm) for nm in names] )
+
+
+def get_solution( P, interior=False ):
+    """ -> Bag( x dj Ax y ): col primal, col dual = reduced costs, row primal, row dual """
+    lib = _lib
+    nr = lib.glp_get_num_rows( P )
+    nc = lib.glp_get_num_cols( P )
+    if interior:
+        fx, fd, fa, fy = (lib.glp_ipt_col_prim, lib.glp_ipt_col_dual,
+                        lib.glp_ipt_row_prim, lib.glp_ipt_row_dual)
+    else:
+        fx, fd, fa, fy = (lib.glp_get_col_prim, lib.glp_get_col_dual,
+                        lib.glp_get_row_prim, lib.glp_get_row_dual)
+    return Bag( x=_getvec( fx, P, nc ), dj=_getvec( fd, P, nc ),
+                Ax=_getvec( fa, P, nr ), y=_getvec( fy, P, nr ))
+
+
+def get_basis( P ):
+    """ -> row stats, col stats: GLP_BS NL NU NF NS """
+    lib = _lib
+    return (_getvec( lib.glp_get_row_stat, P, lib.glp_get_num_rows( P ), dtype=int ),
+            _getvec( lib.glp_get_col_stat, P, lib.glp_get_num_cols( P ), dtype=int ))
+
+
+def set_basis( P, rowstat, colstat ):
+    lib = _lib
+    for stat, n, what in ((rowstat, lib.glp_get_num_rows( P ), "rows"),
+                          (colstat, lib.glp_get_num_cols( P ), "cols")):
+        stat = np.asarray( stat )
+        if len(stat) != n or stat.size and not ((GLP_BS <= stat) & (stat <= GLP_NS)).all():
+            raise ValueError( "set_basis: %s: %d stats, need %d in 1 .. 5" % (what, len(stat), n) )
+    for f, stat in ((lib.glp_set_row_stat, rowstat), (lib.glp_set_col_stat, colstat)):
+        for j, st in enumerate( np.asarray( stat ).tolist() ):
+            f( P, j + 1, st )
+
+
+def iter_count( P ):
+    """ simplex iterations so far, or None if this GLPK hasn't glp_get_it_cnt """
+    f = getattr( _lib, "glp_get_it_cnt", None )
+    return None if f is None  else f( P )
+
+
+#...............................................................................
+def check_coo( i, j, shape ):
+    """ 0-based i j in range, no duplicate (i, j) -- glp_load_matrix abort()s -- else ValueError """
+    i, j = np.asarray( i, dtype=np.int64 ), np.asarray( j, dtype=np.int64 )
+    check_ix( i, shape[0], "load_matrix: rows" )
+    check_ix( j, shape[1], "load_matrix: cols" )
+    ij = np.sort( i * shape[1] + j )
+    dup = np.flatnonzero( ij[1:] == ij[:-1] )
+    if len(dup):
+        k = ij[dup[0]]
+        raise ValueError( "load_matrix: %d duplicate (i, j), the first (%d, %d)" % (
+                len(dup), k // shape[1], k % shape[1] ))
+
+
+def check_ix( ix, n, what ):
+    """ 0 <= ix < n else ValueError """
+    ix = np.asarray( ix )
+    if ix.size and (ix.min() < 0 or ix.max() >= n):
+        raise ValueError( "%s: index %d not in 0 .. %d" % (
+                what, ix.min() if ix.min() < 0  else ix.max(), n - 1 ))
+
+
+def check_names( names ):
+    """ NameTable utf-8, or a list of bytes: <= 255 bytes, no control chars, else ValueError
+        -- glp_set_row_name / col_name abort()
+    """
+    if isinstance( names, NameTable ):
+        lens = np.diff( names.offsets )
+        blob = np.asarray( names.blob )
+        ncntrl = np.r_[ 0, np.cumsum( (blob < 32) | (blob == 127) ) ]
+        bad = np.flatnonzero( ncntrl[ names.offsets[1:] ] > ncntrl[ names.offsets[:-1] ] )
+    else:
+        lens = np.array([ len(nm) for nm in names ], dtype=int )
+        bad = [k for k, nm in enumerate( names )
+                if any( ch < 32 or ch == 127 for ch in bytearray( nm ))]
+    long_ = np.flatnonzero( lens > MAXNAME )
+    if len(long_):
+        raise ValueError( "name %d: %d bytes, GLPK's limit is %d" % (
+                long_[0], lens[long_[0]], MAXNAME ))
+    if len(bad):
+        raise ValueError( "name %d has control characters, GLPK won't take them" % bad[0] )
+
+
+def _getvec( f, P, n, dtype=float ):
+    """ f( P, 1 ) .. f( P, n ) -> numpy vec """
+    return np.fromiter( (f( P, j ) for j in range( 1, n + 1 )), dtype=dtype, count=n )
+
+
+def _intp( x ):
+    return x.ctypes.data_as( ctypes.POINTER( ctypes.c_int ))
+
+
+def _dblp( x ):
+    return x.ctypes.data_as( ctypes.POINTER( ctypes.c_double ))
+
+
+def _declare( lib ):
+    """ restype argtypes of the glp_ functions used here """
+    vp, i, d, s = ctypes.c_void_p, ctypes.c_int, ctypes.c_double, ctypes.c_char_p
+    ip, dp = ctypes.POINTER( ctypes.c_int ), ctypes.POINTER( ctypes.c_double )
+    for name, res, args in [
+            ("glp_get_num_rows", i, [vp]),
+            ("glp_get_num_cols", i, [vp]),
+            ("glp_get_num_nz", i, [vp]),
+            ("glp_load_matrix", None, [vp, i, ip, ip, dp]),
+            ("glp_get_mat_row", i, [vp, i, vp, vp]),
+            ("glp_set_obj_coef", None, [vp, i, d]),
+            ("glp_get_obj_coef", d, [vp, i]),
+            ("glp_set_obj_dir", None, [vp, i]),
+            ("glp_set_row_bnds", None, [vp, i, i, d, d]),
+            ("glp_set_col_bnds", None, [vp, i, i, d, d]),
+            ("glp_set_row_name", None, [vp, i, s]),
+            ("glp_set_col_name", None, [vp, i, s]),
+            ("glp_get_row_name", s, [vp, i]),
+            ("glp_get_col_name", s, [vp, i]),
+            ("glp_set_mat_row", None, [vp, i, i, vp, vp]),
+            ("glp_get_row_stat", i, [vp, i]),
+            ("glp_get_col_stat", i, [vp, i]),
+            ("glp_set_row_stat", None, [vp, i, i]),
+            ("glp_set_col_stat", None, [vp, i, i]),
+            ]:
+        f = getattr( lib, name )
+        f.restype, f.argtypes = res, args
+    try:  # GLPK >= 4.50 ?
+        lib.glp_get_it_cnt.restype, lib.glp_get_it_cnt.argtypes = i, [vp]
+    except AttributeError:
+        pass
+    for rc in ("row", "col"):
+        for name in ("type",):
+            f = getattr( lib, "glp_get_%s_%s" % (rc, name) )
+            f.restype, f.argtypes = i, [vp, i]
+        for name in ("lb", "ub"):
+            f = getattr( lib, "glp_get_%s_%s" % (rc, name) )
+            f.restype, f.argtypes = d, [vp, i]
+        for pre in ("get", "ipt"):
+            for name in ("prim", "dual"):
+                f = getattr( lib, "glp_%s_%s_%s" % (pre, rc, name) )
+                f.restype, f.argtypes = d, [vp, i]
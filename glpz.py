@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+""" glpz.py: LP( A b c ... ) <-> .glpz, raw numpy arrays in one file, memory-mapped
+    save_lp( "my.glpz", lp )  # zero-copy writes from the numpy buffers
+    lp = load_lp( "my.glpz" )  # fields are mapped on first access: lp.A lp.b ...
+
+    Several jobs on one box that open the same .glpz share its pages,
+    and print_lp or a few rows of a huge LP don't read the rest.
+
+.glpz layout, all little-endian --
+    bytes 0 .. 8    magic b"GLPZ0001"
+    bytes 8 .. 16   uint64 H, the length of the header
+    bytes 16 .. 16+H  header, JSON utf-8:
+        { "problemname": ..., "maximize": ..., "shape": [nrow, ncol], "nnz": ...,
+          "arrays": { name: { "dtype": "<f8", "shape": [n], "offset": bytes }}}
+    then the arrays, raw C order, each at an offset that's a multiple of 64:
+        A_data A_indices A_indptr  -- A csr; a PatternMatrix has no A_data,
+            header "A_value": its one value
+        b c blo lb ub
+        rowname_blob rowname_offsets  -- a NameTable: names utf-8 end to end, uint8;
+        colname_blob colname_offsets     offsets int64 n+1, name i = blob[o[i]:o[i+1]]
+            or generated names "x%d": header "names_fmt": { "colname": "x%d" },
+            optional colname_ix
+        mipvars  -- optional, S1 "c" "i" "b"
+"""
+
+from __future__ import division, print_function
+import json
+import struct
+import numpy as np
+from scipy import sparse
+
+import glp
+from glp.compact import PatternMatrix
+from glp.names import NameTable, nametable
+from glp.zutil import Bag
+
+MAGIC = b"GLPZ0001"
+ALIGN = 64
+_vecs = "b c blo lb ub".split()
+_lazy = ["A", "rowname", "colname", "mipvars"] + _vecs
+
+#...............................................................................
+def write_glpz( outfile, lp, verbose=1 ):
+    """ LP( A b c ... ) -> outfile.glpz, see the layout above """
+    A = lp.A.tocsr()
+    arrays = [("A_indices", A.indices), ("A_indptr", A.indptr)]
+    if not isinstance( A, PatternMatrix ):
+        arrays.insert( 0, ("A_data", A.data) )
+    arrays += [(k, lp[k]) for k in _vecs]
+    names_fmt = dict()
+    for nm in ("rowname", "colname"):
+        names = nametable( lp.get( nm ))
+        if names is None:
+            continue
+        if names.fmt is not None:  # generated, nothing to write
+            names_fmt[nm] = names.fmt
+            if names.ix is not None:
+                arrays.append( (nm + "_ix", names.ix) )
+        else:
+            arrays += [(nm + "_blob", names.blob), (nm + "_offsets", names.offsets)]
+    if lp.get( "mipvars" ) is not None:
+        arrays.append( ("mipvars", np.asarray( lp.mipvars ).astype( "S1" )) )
+    arrays = [(nm, np.ascontiguousarray( x )) for nm, x in arrays]
+
+        # header first: the offsets follow from the array sizes
+    index = dict()
+    nbytes = 0
+    for nm, x in arrays:
+        index[nm] = dict( dtype=x.dtype.newbyteorder( "<" ).str,
+                        shape=list( x.shape ), offset=nbytes )
+        nbytes = _align( nbytes + x.nbytes )
+    start = ALIGN
+    while True:  # the header's length depends on the offsets, so iterate
+        for nm, _ in arrays:
+            index[nm]["start"] = start + index[nm]["offset"]
+        header = dict( problemname=lp.problemname, maximize=bool( lp.maximize ),
+                shape=list( A.shape ), nnz=int( A.nnz ), names_fmt=names_fmt,
+                A_value=float( A.value ) if isinstance( A, PatternMatrix )  else None,
+                arrays=dict( (nm, dict( dtype=v["dtype"], shape=v["shape"], offset=v["start"] ))
+                            for nm, v in index.items() ))
+        header = json.dumps( header ).encode( "utf-8" )
+        need = _align( len(MAGIC) + 8 + len(header) )
+        if need <= start:
+            break
+        start = need
+    header += b" " * (start - len(MAGIC) - 8 - len(header))
+
+    with open( outfile, "wb" ) as f:
+        f.write( MAGIC + struct.pack( "<Q", len(header) ) + header )
+        for nm, x in arrays:
+            f.seek( index[nm]["start"] )
+            if x.dtype.byteorder == ">":
+                x = x.astype( x.dtype.newbyteorder( "<" ))
+            f.write( memoryview( x.reshape( -1 ).view( np.uint8 )))  # no copy
+        f.truncate( f.tell() )
+    if verbose:
+        print( "write_glpz: %s  A %s  %d non0  %.3g mbytes" % (
+                outfile, A.shape, A.nnz, (start + nbytes) / 1e6 ))
+    return lp
+
+
+def read_glpz( glpzfile, mode="c", verbose=1 ):
+    """ .glpz -> GlpzLP, an LP Bag with A b c ... memory-mapped on first access
+        mode "c": copy-on-write, callers can change A b c, the file not
+        mode "r": read-only
+    """
+    with open( glpzfile, "rb" ) as f:
+        magic = f.read( len(MAGIC) )
+        assert magic == MAGIC, "%s: not a .glpz file, magic %r" % (glpzfile, magic)
+        nheader, = struct.unpack( "<Q", f.read( 8 ))
+        header = json.loads( f.read( nheader ).decode( "utf-8" ))
+    lp = GlpzLP( glpzfile, header, mode )
+    if verbose:
+        glp.print_lp( lp, verbose=verbose )
+    return lp
+
+
+class GlpzLP( Bag ):
+    """ LP Bag from a .glpz file, fields A b c blo lb ub rowname colname
+        are mapped on first access, lp.A or lp["A"]
+    """
+    __slots__ = ("_glpzfile", "_header", "_mode")
+
+    def __init__( self, glpzfile, header, mode="c" ):
+        Bag.__init__( self,
+            nnz=header["nnz"],
+            problemname=header["problemname"],
+            maximize=header["maximize"],
+            )
+        self._glpzfile = glpzfile
+        self._header = header
+        self._mode = mode
+
+    def __getattr__( self, name ):  # not yet in the Bag
+        if name in _lazy:
+            return self[name]
+        raise AttributeError( name )
+
+    def __missing__( self, key ):
+        if key not in _lazy:
+            raise KeyError( key )
+        val = self[key] = self._load( key )
+        return val
+
+    def __contains__( self, key ):
+        return key in _lazy or dict.__contains__( self, key )
+
+    def get( self, key, default=None ):
+        return self[key] if key in self  else default
+
+    def __reduce__( self ):  # pickle -> plain Bag, all fields
+        return (Bag, (dict( (k, self[k]) for k in set( _lazy ) | set( self.keys() )),))
+
+    def _load( self, key ):
+        arrays = self._header["arrays"]
+        if key == "A":
+            if self._header.get( "A_value" ) is not None:
+                return PatternMatrix( self._array( "A_indptr" ), self._array( "A_indices" ),
+                        tuple( self._header["shape"] ), self._header["A_value"] )
+            return sparse.csr_matrix(
+                (self._array( "A_data" ), self._array( "A_indices" ), self._array( "A_indptr" )),
+                shape=tuple( self._header["shape"] ))
+        if key in ("rowname", "colname"):  # NameTable on the memmaps
+            fmt = self._header.get( "names_fmt", {} ).get( key )
+            if fmt is not None:
+                ix = self._array( key + "_ix" ) if key + "_ix" in arrays  else None
+                return NameTable( fmt=fmt, ix=ix, n=self._header["shape"][key == "colname"] )
+            if key + "_blob" not in arrays:
+                return None
+            return NameTable( blob=self._array( key + "_blob" ),
+                            offsets=self._array( key + "_offsets" ))
+        if key == "mipvars":
+            return self._array( key ).astype( str ) if key in arrays  else None
+        return self._array( key )
+
+    def _array( self, nm ):
+        a = self._header["arrays"][nm]
+        shape = tuple( a["shape"] )
+        if np.prod( shape ) == 0:  # can't mmap size 0
+            return np.empty( shape, dtype=a["dtype"] )
+        return np.memmap( self._glpzfile, dtype=a["dtype"], mode=self._mode,
+                        offset=a["offset"], shape=shape )
+
+
+#...............................................................................
+def _align( n ):
+    return - (- n // ALIGN) * ALIGN
@@ -8,30 +8,56 @@ import numpy as np
 
 import glpk  # https://github.com/bradfordboyle/pyglpk
 import glp
+from glp.tracing import note, traced
 from glp.zutil import Bag
 
 #...............................................................................
-def load_lp( lpfile, to="lp", verbose=1 ):
+@traced
+def load_lp( lpfile, to="lp", engine="glpk", cache=None, verbose=1 ):
     """ GLPK file .mod .mps ...  to= "lp" | "linprog" | "glpk"
         lp = load_lp( to="lp" ): Bag( A b c blo lb ub ... ), see LP()
         lp, linrec = load_lp( to="linprog" )
             linprog( **linrec ), a Bag( A_ub b_ub A_eq b_eq c bounds )
         gnulp = load_lp( to="glpk" ): a glpk rec, see pyglpk-brief.doc
 
+        engine="native": .mps [.gz] -> read_mps, numpy, no GLPK -- much faster;
+            other files and to="glpk" fall back to GLPK
+        cache=True or a cachedir: keep "lp" / "linprog" results in a binary cache,
+            a hit loads memory-mapped in milliseconds, see lpcache.py
+        .glpz files: memory-mapped, fields read on first access, see glpz.py
+
         GLPK file formats: see glpk.pdf and http://lpsolve.sourceforge.net/5.5/formulate.htm
     """
     open( lpfile )  # else IOError: No such file or directory
+    note( lpfile=lpfile, to=to, engine=engine )
     assert to in "glpk lp linprog ".split(), to
-
-    gnulp = glpk.LPX( **_gnufiletype( lpfile ))  # read .mod .mps ...
-        # free rows removed from .mps, others ?
-    if to == "glpk":
-        return gnulp  # .matrix .rows .cols .obj ...
-
-    lp = glp.gnulp_to_lp( gnulp,  # Bag( A b c blo lb ub ... ), see lprec.py
-            drop_uncon=True, verbose=verbose )
+    assert engine in "glpk native ".split(), engine
+    if lpfile.endswith( ".glpz" ):
+        lp = glp.read_glpz( lpfile, verbose=verbose )
+        if to == "glpk":
+            return glp.lp_to_gnulp( lp, verbose=verbose )
+        if to == "lp":
+            return lp
+        return glp.lp_to_linprog( lp, verbose=verbose )
+
+    if cache and to != "glpk":
+        return glp.lpcache.cached_load( lpfile, to=to, engine=engine, cache=cache,
+                verbose=verbose )
+
+    if engine == "native" and to != "glpk" \
+    and lpfile.replace( ".gz", "" ).endswith( ".mps" ):
+        lp = glp.read_mps( lpfile,  # Bag( A b c blo lb ub ... ), see lprec.py
+                drop_uncon=True, verbose=verbose )
+    else:
+        gnulp = glpk.LPX( **_gnufiletype( lpfile ))  # read .mod .mps ...
+            # free rows removed from .mps, others ?
+        if to == "glpk":
+            return gnulp  # .matrix .rows .cols .obj ...
+
+        lp = glp.gnulp_to_lp( gnulp,  # Bag( A b c blo lb ub ... ), see lprec.py
+                drop_uncon=True, verbose=verbose )
     if to == "lp":
-        return lp  # LP( A b c ... ) after rows_le -- may change A b blo
+        return lp  # LP( A b c ... )
 
         # linrec: Bag( A_ub b_ub A_eq b_eq c bounds ) for linprog( **linrec )
     lp, linrec = glp.lp_to_linprog( lp, verbose=verbose )
@@ -145,6 +171,7 @@ if __name__ == "__main__":
     nin = 10
     save = 1
     to = "lp"  # glpk | lp | linprog
+    engine = "glpk"  # native: .mps
 
         # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
     eqargs, fileargs = scan_args( sys.argv )
@@ -156,7 +183,7 @@ if __name__ == "__main__":
         print( "\n" + 80 * "-" )
         print( "--", lpfile )
 
-        lp = load_lp( lpfile, to=to, verbose=1 )  # Bag( A b c blo lb ub )  drop_uncon
+        lp = load_lp( lpfile, to=to, engine=engine, verbose=1 )  # Bag( A b c blo lb ub )  drop_uncon
         if to == "linprog":
             lp, linrec = lp  # grr
         if save:
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+""" load_many( lpfiles, to="lp", workers=N ) -> iterator of Bag( lpfile lp error time )
+    load_lp on a process pool, results as they finish
+"""
+
+from __future__ import division, print_function
+import os
+import time
+import traceback
+
+import glp
+from glp.zutil import Bag, globs
+
+#...............................................................................
+def load_many( lpfiles, to="lp", workers=None, verbose=0, **kw ):
+    """ lpfiles, globs ok -> iterator of Bag( lpfile lp linrec error time ), as they finish
+        to= "lp" | "linprog", kw: engine= cache= ... see load_lp
+        An error in one file, or a crashed worker, goes to .error, a traceback string;
+        the rest run on. A crash breaks the whole pool: the files that were running
+        are rerun, those that failed with it one at a time in a pool of their own,
+        so only the culprit gets "worker died".
+        for r in load_many( "netlib/*.mps.gz", workers=8 ):
+            if r.error: ...
+    """
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    from concurrent.futures.process import BrokenProcessPool
+
+    assert to in ("lp", "linprog"), to  # not "glpk", can't pickle
+    lpfiles = globs( lpfiles )
+    workers = workers or os.cpu_count()
+    todo = list( reversed( lpfiles ))
+    pool = ProcessPoolExecutor( workers )
+    running = dict()  # future -> lpfile
+    try:
+        while todo or running:
+            while todo and len(running) < 2 * workers:  # a window, not all at once
+                lpfile = todo.pop()
+                running[ pool.submit( _load1, lpfile, to, verbose, kw )] = lpfile
+            done, _ = wait( running, return_when=FIRST_COMPLETED )
+            broken = []
+            results = []
+            for fut in done:
+                lpfile = running.pop( fut )
+                try:
+                    results.append( fut.result() )
+                except BrokenProcessPool:  # GLPK abort() in some worker, which ?
+                    broken.append( lpfile )
+            if broken:
+                todo.extend( running.values() )  # rerun the others
+                running.clear()
+                pool.shutdown( wait=False )
+                pool = ProcessPoolExecutor( workers )
+                results += [_load_alone( lpfile, to, verbose, kw ) for lpfile in broken]
+            for res in results:
+                if verbose:
+                    print( "load_many: %s  %.2f sec  %s" % (
+                            res.lpfile, res.time, "error" if res.error else "ok" ))
+                yield res
+    finally:
+        pool.shutdown( wait=False, cancel_futures=True )
+
+
+def _load_alone( lpfile, to, verbose, kw ):
+    """ _load1 in a pool of its own: its result, or "worker died" if it's the culprit """
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+
+    with ProcessPoolExecutor( 1 ) as pool:
+        try:
+            return pool.submit( _load1, lpfile, to, verbose, kw ).result()
+        except BrokenProcessPool:
+            return Bag( lpfile=lpfile, lp=None, linrec=None, time=0,
+                    error="load_many: worker died, BrokenProcessPool" )
+
+
+def _load1( lpfile, to, verbose, kw ):
+    """ in a worker: load_lp -> Bag( lpfile lp linrec error time ) """
+    t0 = time.time()
+    lp = linrec = error = None
+    try:
+        lp = glp.load_lp( lpfile, to=to, verbose=verbose, **kw )
+        if to == "linprog":
+            lp, linrec = lp
+    except Exception:
+        error = traceback.format_exc()
+    return Bag( lpfile=lpfile, lp=lp, linrec=linrec, error=error,
+                time=time.time() - t0 )
+
+
+#...............................................................................
+if __name__ == "__main__":
+    import sys
+    from glp.zutil import scan_args
+
+    lpfiles = "../netlib/zib/mps/*.mps.gz"
+    to = "lp"  # lp | linprog
+    engine = "glpk"  # native: .mps
+    workers = None  # all cores
+
+        # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+    eqargs, fileargs = scan_args( sys.argv )
+    for eqarg in eqargs:
+        exec( eqarg )
+
+    t0 = time.time()
+    nerr = 0
+    for r in load_many( fileargs or lpfiles, to=to, workers=workers, engine=engine ):
+        if r.error:
+            nerr += 1
+            print( "-- %s: error\n%s" % (r.lpfile, r.error) )
+        else:
+            print( "-- %s  A %s  %d non0  %.2f sec" % (
+                    r.lpfile, r.lp.A.shape, r.lp.A.nnz, r.time ))
+    print( "load_many: %d errors  %.1f sec" % (nerr, time.time() - t0) )
@@ -5,6 +5,8 @@
     # test: lp-randomc.py
 
 from __future__ import division, print_function
+import multiprocessing
+import time
 import traceback
 import numpy as np
 from scipy import sparse
@@ -12,27 +14,39 @@ from scipy import sparse
 import glpk  # https://github.com/bradfordboyle/pyglpk
 import glp
 
+from glp import glpkc  # bulk numpy <-> LPX, ctypes
+from glp.compact import scipy_A
+from glp.names import nametable
+from glp.tracing import note, span, traced
 from glp.zutil import Bag, boundsvec
 from numpy import inf
 
 #...............................................................................
+@traced
 def gnulp_to_lp( gnulp, drop_uncon=True, verbose=1 ):
     """ gnulp .matrix .rows .cols .obj -> LP( A b c ... ) numpy arrays, A scipy.sparse
         from e.g. gnulp = glpk.LPX( gmp=filename.mod )  # gmp= cpxlp= freemps=
     """
-    i, j, data = zip( *gnulp.matrix )
-    A = sparse.coo_matrix( (data, (i, j) )).tocsr()
-    blo, b = np.asarray([ row.bounds for row in gnulp.rows ]) .T  # always n x 2 ?
-    lb, ub = np.asarray([ col.bounds for col in gnulp.cols ]) .T
-    c = np.array( list( gnulp.obj ), dtype=float )
+    P = glpkc.prob_ptr( gnulp )
+    if P is not None:  # bulk, C calls
+        data, indices, indptr = glpkc.get_matrix( P )
+        A = sparse.csr_matrix( (data, indices, indptr),
+                shape=(len(gnulp.rows), len(gnulp.cols)) )
+        c = glpkc.get_obj( P )
+    else:
+        i, j, data = zip( *gnulp.matrix )
+        A = sparse.coo_matrix( (data, (i, j) ),  # shape: empty last rows / cols
+                shape=(len(gnulp.rows), len(gnulp.cols)) ).tocsr()
+        c = np.array( list( gnulp.obj ), dtype=float )
     name = gnulp.name
-
-    blo = boundsvec( blo, len(blo), - inf )
-    b = boundsvec( b, len(b), inf )  # brandy.mps.gz A 219, b 220 ??
-    lb = boundsvec( lb, len(lb), 0 )
-    ub = boundsvec( ub, len(ub), inf )
-    rowname = np.array( [row.name for row in gnulp.rows] )  # np.array for savez ?
-    colname = np.array( [col.name for col in gnulp.cols] )
+    blo, b, lb, ub = gnulp_bounds( gnulp )
+    if P is not None:
+        rowname = glpkc.get_names( P, rows=True )
+        colname = glpkc.get_names( P, rows=False )
+    else:
+        rowname = nametable( [row.name for row in gnulp.rows] )  # NameTable, utf-8 blob
+        colname = nametable( [col.name for col in gnulp.cols] )
+    note( shape=A.shape, nnz=A.nnz )
     if drop_uncon:
         A, b, blo, rowname = drop_unconstrained_rows( A, b, blo, rowname, name, verbose=verbose )
 
@@ -42,20 +56,43 @@ def gnulp_to_lp( gnulp, drop_uncon=True, verbose=1 ):
             verbose=verbose )
 
 
+def gnulp_bounds( gnulp ):
+    """ -> blo b lb ub, +- inf """
+    P = glpkc.prob_ptr( gnulp )
+    if P is not None:  # bulk, C calls
+        blo, b = glpkc.get_bounds( P, rows=True )
+        lb, ub = glpkc.get_bounds( P, rows=False )
+    else:
+        blo, b = np.asarray([ row.bounds for row in gnulp.rows ]) .T  # always n x 2 ?
+        lb, ub = np.asarray([ col.bounds for col in gnulp.cols ]) .T
+    blo = boundsvec( blo, len(blo), - inf )
+    b = boundsvec( b, len(b), inf )  # brandy.mps.gz A 219, b 220 ??
+    lb = boundsvec( lb, len(lb), - inf )  # glpk None: free, not 0
+    ub = boundsvec( ub, len(ub), inf )
+    return blo, b, lb, ub
+
+
+@traced
 def drop_unconstrained_rows( A, b, blo, rowname, name, verbose=1 ):
-    """ drop rows blo -inf <= Ax <= b inf """
+    """ drop rows blo -inf <= Ax <= b inf
+        rowname: NameTable, np.array or None
+    """
     jfinite = np.isfinite( blo ) | np.isfinite( b )
     ncon = jfinite.sum()
     nuncon = len(b) - ncon
+    note( dropped=int( nuncon ))
     if nuncon > 0:
         if verbose:
             print( "drop_unconstrained_rows: %d -> %d rows" % (len(b), ncon) )
-        return A[jfinite], b[jfinite], blo[jfinite], rowname[jfinite]
+        if rowname is not None:
+            rowname = rowname[jfinite]
+        return A[jfinite], b[jfinite], blo[jfinite], rowname
     else:
         return A, b, blo, rowname
 
 
 #...............................................................................
+@traced
 def lp_to_gnulp( lp, verbose=1 ):
     """ LP( A b c blo lb ub ... ) -> glpk .matrix .rows .cols ... """
     A, b, c, blo, lb, ub, problemname \
@@ -66,16 +103,36 @@ def lp_to_gnulp( lp, verbose=1 ):
     lb = boundsvec( lb, nc, 0 )
     ub = boundsvec( ub, nc, inf )
 
-    def _infnone( x ):
-        return x if np.isfinite(x) \
-            else None  # grr
-
     glp = glpk.LPX()  # empty
     glp.name = problemname
     glp.rows.add( nr )
     glp.cols.add( nc )
 
-    S = sparse.coo_matrix( A )
+    S = sparse.coo_matrix( scipy_A( A ))  # GLPK copies to doubles anyway
+    note( shape=A.shape, nnz=S.nnz )
+    P = glpkc.prob_ptr( glp )
+    if P is not None:  # bulk, C calls
+        glpkc.load_matrix( P, S.row, S.col, S.data )
+        glpkc.set_obj( P, c, maximize=lp.maximize )
+        glpkc.set_bounds( P, blo, b, rows=True )
+        glpkc.set_bounds( P, lb, ub, rows=False )
+        if lp.rowname is not None:
+            glpkc.set_names( P, lp.rowname, rows=True )
+        if lp.colname is not None:
+            glpkc.set_names( P, lp.colname, rows=False )
+    else:
+        _lp_to_gnulp_1by1( glp, lp, S, b, c, blo, lb, ub )
+
+    if verbose:
+        print( "\nlp_to_gnulp: A %s, %d non0 " % (
+                A.shape, S.nnz ))
+
+    return glp
+
+
+def _lp_to_gnulp_1by1( glp, lp, S, b, c, blo, lb, ub ):
+    """ pyglpk one element at a time, if not glpkc """
+
     Srow = S.row.tolist()  # not astype(int)
     Scol = S.col.tolist()
     glp.matrix = zip( Srow, Scol, S.data )  # py2 list of tuples, py3 generator
@@ -85,30 +142,56 @@ def lp_to_gnulp( lp, verbose=1 ):
     glp.obj.maximize = lp.maximize
 
     for row, bi, bloi in zip( glp.rows, b, blo ):
-        row.bounds = _infnone( bi ) if bi == bloi \
-            else _infnone( bloi ), _infnone( bi )
+        row.bounds = bounds_pair( bloi, bi )
     if lp.rowname is not None:
         for row, nm in zip( glp.rows, lp.rowname ):
             row.name = nm
 
     for col, l, u in zip( glp.cols, lb, ub ):
-        col.bounds = _infnone( l ) if l == u \
-            else _infnone( l ), _infnone( u )
+        col.bounds = bounds_pair( l, u )
             # glp/13-powplant.glp  j 1 s -868
     if lp.colname is not None:
         for col, nm in zip( glp.cols, lp.colname ):
             col.name = nm
 
-    if verbose:
-        print( "\nlp_to_gnulp: A %s, %d non0 " % (
-                A.shape, S.nnz ))
+def bounds_pair( lo, hi ):
+    """ lo hi +- inf -> pyglpk .bounds (lo, hi), None for inf; lo == hi fixed """
 
-    return glp
+    def _infnone( x ):
+        return x if np.isfinite(x) \
+            else None  # grr
+
+    return _infnone( lo ), _infnone( hi )
 
 #...............................................................................
-def gnulp_solve( gnulp, solver="simplex", verbose=1 ):
-    """ gnulp / LPX simplex() or interior() -> Bag( obj, x, y, status, info ) """
+@traced
+def gnulp_solve( gnulp, solver="simplex", scale=True, time_limit=None, iter_limit=None,
+                cancel=None, progress=None, every=1., subprocess=None, verbose=1 ):
+    """ gnulp / LPX simplex() or interior() -> Bag( obj, x, y, dj, Ax, status, info )
+        dj: reduced costs, Ax: row activities
+        scale=False: as is, e.g. scaled already -- glp.Solver scales once, re-solves warm
+        Limits, simplex: GLPK's tm_lim it_lim, x y ... from the last basis, status_primal says
+            if it's feasible, status "timeout" or "itlim"; iters, None without glp_get_it_cnt
+        time_limit: sec;  iter_limit: simplex iterations, ValueError for interior, it has none
+        cancel: e.g. a threading.Event, set() -> stop at the next check, status "cancelled"
+        progress( Bag( iters obj infeas time ) ): simplex runs in chunks of ~ every sec,
+            the basis kept between them; infeas: max bound violation of x, Ax
+        subprocess: solve in a forked child, killed at time_limit or on cancel,
+            status "timeout" "cancelled" "died", x None -- the default for interior()
+            with a limit, which has no tm_lim or callback; progress then only ticks time.
+            Simplex in a child stops itself at time_limit, and the parent's gnulp gets its basis;
+            killed 1 sec + 10 usec a row / col later, unless it has started sending.
+    """
         # glpsol -h: 100 options
+    interior = solver.startswith(( "interior", "ip" ))
+    if interior and iter_limit is not None:
+        raise ValueError( "gnulp_solve: iter_limit %s, but interior() has no iteration limit" % (
+                iter_limit) )
+    if subprocess is None:
+        subprocess = interior and not (time_limit is None and cancel is None and progress is None)
+    if subprocess:
+        return _solve_subprocess( gnulp, solver, scale, time_limit, iter_limit,
+                cancel, progress, every, verbose )
     nr = len(gnulp.rows)
     nc = len(gnulp.cols)
     minmax = "maximize" if gnulp.obj.maximize  else ""
@@ -117,14 +200,20 @@ def gnulp_solve( gnulp, solver="simplex", verbose=1 ):
     if verbose:
         print( "\n{ gnulp_solve", info )
     glpk.env.term_on = bool(verbose)  # grr several calls ?
-    gnulp.scale()
+    note( solver=solver, shape=(nr, nc) )
+    if scale:
+        with span( "scale" ):
+            gnulp.scale()
+    iters = None
     try:
-        if solver.startswith(( "interior", "ip" )):
-            gnulp.interior()
+        if interior:
+            with span( "interior" ):
+                gnulp.interior()
             status = gnulp.status_i
         else:
-            gnulp.simplex()  # no per-iter ?
-            status = gnulp.status_s
+            with span( "simplex" ):
+                stop, iters = _simplex( gnulp, time_limit, iter_limit, cancel, progress, every )
+            status = stop or gnulp.status_s
         status_dual = gnulp.status_dual  # ip: undef ?
         obj = gnulp.obj.value  # c.x
     except RuntimeError:
@@ -134,8 +223,7 @@ def gnulp_solve( gnulp, solver="simplex", verbose=1 ):
         traceback.print_exc()
         raise
 
-    x = np.array([ col.primal for col in gnulp.cols ], dtype=float )
-    y = np.array([ row.dual for row in gnulp.rows ], dtype=float )
+    x, y, dj, Ax = gnulp_solution( gnulp, interior=interior )
     # gap = obj - b.dot( y )  # no, glpk.pdf p. 52
     if verbose:
         print( "obj: %g  status: %s %s  %s" % (
@@ -146,5 +234,178 @@ def gnulp_solve( gnulp, solver="simplex", verbose=1 ):
     elif gnulp.status == "unbnd":
         print( "Warning: gnulp_solve: unbounded ", info )
 
-    return Bag( obj=obj, x=x, y=y, status=status, status_dual=status_dual, info=info )
+    return Bag( obj=obj, x=x, y=y, dj=dj, Ax=Ax,
+                status=status, status_dual=status_dual, info=info,
+                status_primal=gnulp.status_i if interior  else gnulp.status_primal,
+                iters=iters )
+
+
+def _simplex( gnulp, time_limit, iter_limit, cancel, progress, every ):
+    """ simplex() with limits, in chunks if progress or cancel
+        -> None if done, or "timeout" "itlim" "cancelled";  iters or None
+    """
+    P = glpkc.prob_ptr( gnulp )
+    it0 = None if P is None  else glpkc.iter_count( P )
+    chunked = progress is not None or cancel is not None
+    bychunk = chunked and it0 is None and iter_limit is not None  # count itlim chunks
+    t0 = time.time()
+    iters = 0
+    bounds = None
+    while True:
+        kw = dict()
+        left = None if time_limit is None  else time_limit - (time.time() - t0)
+        if left is not None and left <= 0:
+            stop = "timeout"
+            break
+        if chunked and not bychunk:
+            left = every if left is None  else min( left, every )
+        if left is not None:
+            kw["tm_lim"] = max( 1, int( left * 1000 ))  # msec
+        if iter_limit is not None:
+            kw["it_lim"] = iter_limit - iters
+            if kw["it_lim"] <= 0:
+                stop = "itlim"
+                break
+            if bychunk:
+                kw["it_lim"] = min( kw["it_lim"], 1000 )
+        ret = gnulp.simplex( **kw )
+        if it0 is not None:
+            iters = glpkc.iter_count( P ) - it0
+        elif ret == "itlim":
+            iters += kw["it_lim"]
+        if ret not in ("tmlim", "itlim"):
+            stop = None  # done, or failed: gnulp.status_s
+            break
+        if progress is not None:
+            if bounds is None:
+                bounds = gnulp_bounds( gnulp )
+            progress( _progress( gnulp, bounds, iters if it0 is not None or bychunk  else None,
+                    time.time() - t0 ))
+        if cancel is not None and cancel.is_set():
+            stop = "cancelled"
+            break
+    return stop, iters if it0 is not None or bychunk  else None
+
+
+def _progress( gnulp, bounds, iters, secs ):
+    """ -> Bag( iters obj infeas time ), infeas the max bound violation of x and Ax """
+    blo, b, lb, ub = bounds
+    x, _, _, Ax = gnulp_solution( gnulp )
+    infeas = max( np.max( blo - Ax, initial=0 ), np.max( Ax - b, initial=0 ),
+                  np.max( lb - x, initial=0 ), np.max( x - ub, initial=0 ))
+    return Bag( iters=iters, obj=gnulp.obj.value, infeas=infeas, time=secs )
+
+
+def _solve_subprocess( gnulp, solver, scale, time_limit, iter_limit, cancel, progress, every,
+                        verbose ):
+    """ gnulp_solve in a forked child, the parent waits, ticks progress, kills """
+    interior = solver.startswith(( "interior", "ip" ))
+    ctx = multiprocessing.get_context( "fork" )  # the child has gnulp, no pickling
+    recv, send = ctx.Pipe( duplex=False )
+    p = ctx.Process( target=_solve_child, daemon=True,
+            args=(gnulp, solver, scale, None if interior  else time_limit, iter_limit,
+                  progress is not None, every, send) )
+    p.start()
+    send.close()
+    t0 = tick = time.time()
+        # simplex: let GLPK's tm_lim stop it, then x y basis out, ~ 10 usec a row / col
+    grace = 0 if interior  else 1 + (len(gnulp.rows) + len(gnulp.cols)) / 1e5
+    sol = status = None
+    sending = False  # the child has solved, x y basis on the way: wait for them
+    while True:
+        if recv.poll( .05 ):
+            try:
+                kind, val = recv.recv()
+            except EOFError:
+                status = "died"
+                break
+            if kind == "progress":
+                progress( val )
+                continue
+            if kind == "sending":
+                sending = True
+                continue
+            sol, basis = val
+            break
+        now = time.time()
+        if time_limit is not None and now - t0 > time_limit + grace and not sending:
+            status = "timeout"
+            break
+        if cancel is not None and cancel.is_set() and not sending:
+            status = "cancelled"
+            break
+        if not p.is_alive() and not recv.poll():
+            status = "died"
+            break
+        if progress is not None and interior and now - tick >= every:
+            progress( Bag( iters=None, obj=None, infeas=None, time=now - t0 ))
+            tick = now
+    if p.is_alive() and sol is None:
+        p.terminate()
+    p.join( 1 )
+    if p.is_alive():
+        p.kill()
+        p.join()
+    recv.close()
+    info = "%s %s  %d rows, %d cols  subprocess" % (
+            gnulp.name, solver, len(gnulp.rows), len(gnulp.cols) )
+    if sol is None:
+        if verbose:
+            print( "gnulp_solve %s: %s after %.1f sec" % (info, status, time.time() - t0 ))
+        return Bag( obj=None, x=None, y=None, dj=None, Ax=None, status=status,
+                status_dual=None, status_primal=None, iters=None, info=info )
+    if basis is not None:
+        set_gnulp_basis( gnulp, basis )
+    if verbose:
+        print( "gnulp_solve %s: obj %g  %s  %.1f sec" % (info, sol.obj, sol.status, time.time() - t0 ))
+    return sol
+
+
+def _solve_child( gnulp, solver, scale, time_limit, iter_limit, wantprogress, every, send ):
+    """ in the forked child: gnulp_solve -> send ("progress", Bag) ..., ("sending",), ("sol", Bag) """
+    progress = (lambda pr: send.send(( "progress", pr ))) if wantprogress  else None
+    sol = gnulp_solve( gnulp, solver=solver, scale=scale, time_limit=time_limit,
+            iter_limit=iter_limit, progress=progress, every=every, subprocess=False, verbose=0 )
+    send.send(( "sending", None ))  # no kill now
+    basis = None if solver.startswith(( "interior", "ip" ))  else gnulp_basis( gnulp )
+    send.send(( "sol", (sol, basis) ))
+    send.close()
+
+
+#...............................................................................
+def gnulp_basis( gnulp ):
+    """ -> Bag( rows cols ) of GLP_BS NL NU NF NS, 1 .. 5 """
+    P = glpkc.prob_ptr( gnulp )
+    if P is not None:
+        rows, cols = glpkc.get_basis( P )
+    else:
+        rows = np.array([ _stats.index( row.status ) + 1 for row in gnulp.rows ])
+        cols = np.array([ _stats.index( col.status ) + 1 for col in gnulp.cols ])
+    return Bag( rows=rows, cols=cols )
 
+
+def set_gnulp_basis( gnulp, basis ):
+    """ basis from gnulp_basis() -> the next simplex() starts there """
+    P = glpkc.prob_ptr( gnulp )
+    if P is not None:
+        glpkc.set_basis( P, basis.rows, basis.cols )
+    else:
+        for bars, stat in ((gnulp.rows, basis.rows), (gnulp.cols, basis.cols)):
+            for bar, st in zip( bars, np.asarray( stat ).tolist() ):
+                bar.status = _stats[st - 1]
+
+_stats = "bs nl nu nf ns".split()  # pyglpk .status <-> GLP_BS ..
+
+
+@traced
+def gnulp_solution( gnulp, interior=False ):
+    """ gnulp after simplex() or interior() -> x y dj Ax """
+    P = glpkc.prob_ptr( gnulp )
+    if P is not None:  # bulk, C calls
+        sol = glpkc.get_solution( P, interior=interior )
+        return sol.x, sol.y, sol.dj, sol.Ax
+    x = np.array([ col.primal for col in gnulp.cols ], dtype=float )
+    y = np.array([ row.dual for row in gnulp.rows ], dtype=float )
+    dj = np.array([ col.dual for col in gnulp.cols ], dtype=float )  # reduced costs
+    Ax = np.array([ row.primal for row in gnulp.rows ], dtype=float )
+    return x, y, dj, Ax
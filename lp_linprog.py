@@ -4,47 +4,50 @@
 
 from __future__ import division, print_function
 import numpy as np
-from numpy import inf, all, any, isfinite
+from numpy import inf, isfinite
 from scipy import sparse
 
 import glp
+from glp.tracing import traced
 from glp.zutil import Bag, inftonone
 
 #...............................................................................
+@traced
 def lp_to_linprog( lp, verbose=1 ):
-    """ in: LP( A b c ... ), see lprec.py
+    """ in: LP( A b c ... ), see lprec.py -- not changed
         ->lp, linrec:
-            lp: LP() 
-                (after rows_le, may change A b blo)
+            lp: a shallow copy, minimize: c negated if maximize, A b blo as is
             linrec: Bag( A_ub b_ub A_eq b_eq bounds c )
                     for scipy linprog( **linrec )
 
+        -inf <= Ax <= inf: dropped
+        blo == b: A_eq
+        -inf <= Ax <= b: A_ub asis
         blo <= Ax <= inf: flip to - Ax <= - blo
-        blo <= Ax <= b: add rows  ** change A b **
-        split A b -> A_eq A_ub, b_eq b_ub  csr_matrix or None
+        blo <= Ax <= b, both finite: Ax <= b, and - Ax <= - blo at the end of A_ub
+        one pass over A csr, see linprog_rows
         rownames, colnames ? ouch
     """
-    A, b, c, blo, lb, ub, name \
-        = lp.A, lp.b, lp.c, lp.blo, lp.lb, lp.ub, lp.problemname
-    A = sparse.csr_matrix( A )  # csR, don't change
-    # b blo lb ub +- inf, not None
+    A, c, name = lp.A, lp.c, lp.problemname
+    if verbose:
+        st = glp.lp_stats( lp )
     if lp.maximize:
-        lp.c *= -1
-        lp.maximize = False
-
-        # change A b blo for linprog: rows_le, split_Ab
-    lp.A, lp.b, lp.blo = rows_le( A, b, blo )
+        c = - c
+    lpmin = Bag( lp, A=A, b=lp.b, blo=lp.blo, lb=lp.lb, ub=lp.ub, c=c, maximize=False,
+            rowname=lp.get( "rowname" ), colname=lp.get( "colname" ),
+            mipvars=lp.get( "mipvars" ))
 
-    linrec = split_Ab( lp.A, lp.b, lp.blo )  # grr A_ub b_ub A_eq b_eq
-    linrec.bounds = np.c_[ inftonone(lb), inftonone(ub) ]
+    linrec = linprog_rows( A, lp.b, lp.blo, verbose=verbose )  # grr A_ub b_ub A_eq b_eq
+    linrec.bounds = np.c_[ inftonone(lp.lb), inftonone(lp.ub) ]
     linrec.c = c
     if verbose:
         print( "lp_to_linprog %s:" % name )
-        _norms_near0( A, "|A| rows", axis=1 )
-        # _norms_near0( A, "|A| cols", axis=0 )
+        if st.rownorm_near0 > 0:
+            print( "|A| rows: %d of %d are ~ 0, max |a_ij| < 1e-8" % (
+                    st.rownorm_near0, st.shape[0] ))
         _print_linrec( name=name, **linrec )
 
-    return lp, linrec  # Bag( A_ub b_ub A_eq b_eq bounds c ) for scipy linprog
+    return lpmin, linrec  # Bag( A_ub b_ub A_eq b_eq bounds c ) for scipy linprog
 
 
 def linprog_to_lp( linrec, name="noname" ):
@@ -68,69 +71,65 @@ def linprog_to_lp( linrec, name="noname" ):
 
 
 #...............................................................................
-def rows_le( A, b, blo ):
-    """ -inf <= Ax <= inf: drop these rows, unconstrained
-        finite <= Ax <= inf: flip to - Ax <= - blo
-        2-sided blo < b, both finite: add rows - Ax <= - blo
-        blo == b: asis
+def linprog_rows( A, b, blo, block=1 << 20, verbose=1 ):
+    """ A b blo -> Bag( A_ub b_ub A_eq b_eq ), csr_matrix or None, A not changed
+        A_ub: the rows with b finite or blo finite, not blo == b, in order,
+                blo <= Ax <= inf flipped to - Ax <= - blo,
+            then - Ax <= - blo for the 2-sided rows, both finite
+        A_eq: blo == b
+        -inf <= Ax <= inf: dropped (drop_unconstrained_rows in glp.py too)
+        One walk over A csr, the rows copied into preallocated
+        indices data of A_ub A_eq, ~ block non0 at a time: no fancy-indexed
+        submatrices, no vstack.  PatternMatrix A -> float64 rows.
     """
-        # -inf <= Ax <= inf, unconstrained
-        # (drop_unconstrained_rows in glp.py too)
-    juncon = (blo == -inf) & (b == inf)
-    nuncon = juncon.sum()
-    if nuncon > 0:
-        jcon = ~ juncon
-        ncon = jcon.sum()
-        print( "dropping unconstrained rows: %d -> %d" % (len(b), ncon) )
-        A, b, blo = A[jcon], b[jcon], blo[jcon]
-
-        # finite <= Ax <= inf: flip to - Ax <= - blo
-    jflip = isfinite( blo ) & (b == inf)
-    if any( jflip ):
-        A[jflip] *= -1
-        b[jflip] = - blo[jflip]
-        blo[jflip] = - inf
-        # print( "rows_le jflip: %s \n%s \n%s " % (jflip.astype(int), blo, b ))
-
-        # 2-sided blo <= Ax <= b, both finite: add rows - Ax <= - blo
-    jboth = isfinite( blo ) & (blo < b) & isfinite( b )  # leave blo == b alone
-    if any( jboth ):
-        A = A.tocsr()
-        A = sparse.vstack(( A, - A[jboth] ))
-        b = np.hstack(( b, - blo[jboth] ))
-        blo[jboth] = - inf
-        blo = np.hstack(( blo, - inf * np.ones( jboth.sum() )))
-        # print( "rows_le jboth: %s \n%s \n%s " % (jboth.astype(int), blo, b ))
-
-    assert A.shape[0] == len(b) == len(blo), [A.shape[0], len(b), len(blo)]
-    assert all( (blo == -inf) | (blo == b) ), "\n%s \n%s" % (blo, b)
-    return A, b, blo
-
-#...............................................................................
-def split_Ab( A, b, blo ):
-    """ -> Bag( A_ub b_ub A_eq b_eq ) """
-        # grr, stupid back-and-forth
+    A = A.tocsr()
+    b = np.asarray( b, dtype=float )
+    blo = np.asarray( blo, dtype=float )
+    finlo, finhi = isfinite( blo ), isfinite( b )
     jeq = (b == blo)
-    if not any( jeq ):
-        return Bag( A_ub=A, b_ub=b,
-                    A_eq=None, b_eq=None )
-    if all( jeq ):
-        return Bag( A_ub=None, b_ub=None,
-                    A_eq=A, b_eq=b )
-    A = A.tocsr()  # see SO vstack
-    jne = (~ jeq).nonzero()[0]
-    jeq = jeq.nonzero()[0]
-    return Bag( A_ub=A[jne], b_ub=b[jne],
-                A_eq=A[jeq], b_eq=b[jeq] )
-
-
-def _norms_near0( A, text, axis=1, near=1e-8 ):
-    from scipy.sparse.linalg import norm
-    norms = np.sort( norm( A, axis=axis, ord=np.inf ))
-    j = np.searchsorted( norms, near )
-    if j > 0:
-        print( "%s: %d of %d are ~ 0, then %s .. %s " % (
-            text, j, len(norms), norms[j:j+3], norms[-3:] ))
+    jne = ~ jeq & (finlo | finhi)
+    nuncon = (~ jeq & ~ finlo & ~ finhi).sum()
+    if nuncon > 0 and verbose:
+        print( "dropping unconstrained rows: %d -> %d" % (len(b), len(b) - nuncon) )
+
+    jflip = ~ jeq & finlo & ~ finhi  # blo <= Ax: - Ax <= - blo
+    jboth = ~ jeq & finlo & finhi
+    ne = jne.nonzero()[0]
+    both = jboth.nonzero()[0]
+    ubrows = np.r_[ ne, both ]
+    ubsign = np.r_[ np.where( jflip[ne], -1., 1. ), - np.ones( len(both) ) ]
+    b_ub = np.r_[ np.where( jflip[ne], - blo[ne], b[ne] ), - blo[both] ]
+    eqrows = jeq.nonzero()[0]
+    return Bag( A_ub=_csr_rows( A, ubrows, ubsign, block ) if len(ubrows)  else None,
+                b_ub=b_ub if len(ubrows)  else None,
+                A_eq=_csr_rows( A, eqrows, None, block ) if len(eqrows)  else None,
+                b_eq=b[eqrows] if len(eqrows)  else None )
+
+
+def _csr_rows( A, rows, sign, block ):
+    """ A csr, row indices, +-1 each or None -> csr_matrix A[rows] * sign, float64 """
+    n = A.shape[1]
+    counts = np.diff( A.indptr )[rows]
+    nnz = int( counts.sum() )
+    itype = np.int32 if max( nnz, n ) < 2**31  else np.int64  # indices indptr the same
+    indptr = np.zeros( len(rows) + 1, dtype=itype )
+    np.cumsum( counts, out=indptr[1:] )
+    indices = np.empty( nnz, dtype=itype )
+    data = np.empty( nnz )
+    cuts = np.r_[ np.searchsorted( indptr, np.arange( 0, nnz, block ), "right" ) - 1, len(rows) ]
+    for r0, r1 in zip( cuts[:-1], cuts[1:] ):
+        lo, hi = indptr[r0], indptr[r1]
+        if lo == hi:
+            continue
+            # out position lo + k <- A position src[k], row by row
+        src = np.repeat( A.indptr[rows[r0:r1]] - indptr[r0:r1], counts[r0:r1] ) \
+            + np.arange( lo, hi )
+        indices[lo:hi] = A.indices[src]
+        data[lo:hi] = A.data[src]
+        if sign is not None:
+            data[lo:hi] *= np.repeat( sign[r0:r1], counts[r0:r1] )
+    return sparse.csr_matrix( (data, indices, indptr), shape=(len(rows), n) )
+
 
 def _print_linrec( A_ub, b_ub, A_eq, b_eq, name, **kw ):
     if A_ub is not None:
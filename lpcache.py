@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+""" lpcache.py: load_lp( cache=True ) -> binary sidecar cache of parsed LP files
+    cachedir/<key>/ A_data.npy A_indices.npy ... b.npy c.npy ... meta.json
+    key: lpfile path size mtime_ns, to=, engine= -- a stat, no read of the file,
+    so a hit loads with np.load( mmap_mode="c" ), milliseconds, no GLPK.
+    meta.json keeps the sha1 of the contents: a miss, e.g. a touched or copied file,
+    first looks for an entry with the same sha1, one file cachedir/.bysha1/<sha1 to engine>:
+    the same path, touched, renames it; another path, a copy, hard-links its arrays
+    under the new key with its own meta, so both paths keep a stat hit;
+    verify=True re-hashes the file on a hit too, seconds for GB files
+    size-bounded: least-recently-used entries are dropped beyond maxbytes
+"""
+
+from __future__ import division, print_function
+import hashlib
+import json
+import os
+import shutil
+import time
+import numpy as np
+
+import glp
+from glp.names import NameTable, nametable
+from glp.zutil import Bag, dict_sparsematrix, inftonone, sparsematrix_dict
+
+CACHEDIR = os.environ.get( "GLP_CACHE", "~/.cache/glp" )
+MAXBYTES = float( os.environ.get( "GLP_CACHE_MAXBYTES", 4e9 ))
+_vecs = "b c blo lb ub".split()
+
+#...............................................................................
+def cached_load( lpfile, to="lp", engine="glpk", cache=True, maxbytes=None, verbose=1,
+                verify=False ):
+    """ load_lp( cache=True or cachedir ): a hit -> LP, or (lp, linrec) for to="linprog"
+        a miss: an entry with the same contents sha1, else load_lp, save in the cache,
+        evict down to maxbytes
+        verify: check the sha1 of the contents on a hit too
+    """
+    cachedir = _cachedir( cache )
+    key = cache_key( lpfile, to=to, engine=engine )
+    entry = os.path.join( cachedir, key )
+    sha1 = None
+    if os.path.isdir( entry ) and verify:
+        sha1 = file_sha1( lpfile )
+        meta = _meta( entry )
+        if meta is None or meta.get( "sha1" ) != sha1:
+            shutil.rmtree( entry, ignore_errors=True )  # changed in place, same size mtime
+    if not os.path.isdir( entry ):
+        sha1 = sha1 or file_sha1( lpfile )
+        same = _find_sha1( cachedir, sha1, to, engine )
+        if same is not None:
+            _reuse_entry( same, entry, lpfile, sha1, to, engine )
+    if os.path.isdir( entry ):
+        os.utime( entry, None )  # lru
+        if verbose:
+            print( "load_lp: cache hit %s  %s" % (lpfile, entry) )
+        return _load_entry( entry, verbose=verbose )
+
+    t0 = time.time()
+    result = glp.load_lp( lpfile, to=to, engine=engine, verbose=verbose )
+    _save_entry( entry, result, to=to, engine=engine, lpfile=lpfile, sha1=sha1,
+            loadtime=time.time() - t0 )
+    evict( cachedir, MAXBYTES if maxbytes is None  else maxbytes )
+    return result
+
+
+def cache_key( lpfile, to="lp", engine="glpk" ):
+    """ -> sha1 hex of path size mtime_ns to engine, a stat only """
+    st = os.stat( lpfile )
+    return hashlib.sha1( ("%s %d %d %s %s " % (
+            os.path.abspath( lpfile ), st.st_size, st.st_mtime_ns, to, engine )
+            ).encode() ).hexdigest()
+
+
+def file_sha1( lpfile, block=1 << 20 ):
+    """ -> sha1 hex of the contents """
+    h = hashlib.sha1()
+    with open( lpfile, "rb" ) as f:
+        for buf in iter( lambda: f.read( block ), b"" ):
+            h.update( buf )
+    return h.hexdigest()
+
+
+def cache_clear( lpfile=None, cache=True, verbose=1 ):
+    """ invalidate: entries for lpfile, any to= engine=, or the whole cache
+        (a changed lpfile gets a new key anyway; its old entries age out)
+    """
+    cachedir = _cachedir( cache )
+    if not os.path.isdir( cachedir ):
+        return 0
+    path = lpfile and os.path.abspath( lpfile )
+    nclear = 0
+    if path is None:
+        shutil.rmtree( os.path.join( cachedir, ".bysha1" ), ignore_errors=True )
+    for entry in _entries( cachedir ):
+        if path is not None:
+            meta = _meta( entry )
+            if meta is None or meta["lpfile"] != path:
+                continue
+        shutil.rmtree( entry, ignore_errors=True )
+        nclear += 1
+    if verbose:
+        print( "cache_clear %s: %d entries" % (cachedir, nclear) )
+    return nclear
+
+
+def evict( cachedir, maxbytes ):
+    """ drop least-recently-used entries until the total <= maxbytes """
+    entries = [(os.path.getmtime( e ), _dirbytes( e ), e) for e in _entries( cachedir )]
+    total = sum( nbytes for _, nbytes, _ in entries )
+    for _, nbytes, entry in sorted( entries ):
+        if total <= maxbytes:
+            break
+        shutil.rmtree( entry, ignore_errors=True )
+        total -= nbytes
+    return total
+
+
+#...............................................................................
+def _save_entry( entry, result, to, engine, lpfile, sha1, loadtime ):
+    """ LP, or (lp, linrec) -> entry/ *.npy meta.json, atomic rename """
+    lp, linrec = result if to == "linprog"  else (result, None)
+    arrays = sparsematrix_dict( lp.A, "A" )
+    arrays.update( (k, lp[k]) for k in _vecs )
+    for k in ("rowname", "colname"):
+        names = nametable( lp.get( k ))
+        if names is not None:
+            names = NameTable.from_names( names.strings() ) if names.fmt  else names
+            arrays[k + "_blob"] = names.blob
+            arrays[k + "_offsets"] = names.offsets
+    if lp.get( "mipvars" ) is not None:
+        arrays["mipvars"] = np.asarray( lp.mipvars )
+    if linrec is not None:
+        for nm in ("A_ub", "A_eq"):
+            if linrec[nm] is not None:
+                arrays.update( sparsematrix_dict( linrec[nm], nm ))
+                arrays["b" + nm[1:]] = linrec["b" + nm[1:]]
+
+    meta = dict( lpfile=os.path.abspath( lpfile ), to=to, engine=engine, sha1=sha1,
+            problemname=lp.problemname, maximize=bool( lp.maximize ),
+            loadtime=loadtime,
+            dtypes=dict( (k, v) for k, v in arrays.items() if isinstance( v, str )))
+    tmp = "%s.tmp%d" % (entry, os.getpid())
+    os.makedirs( tmp )
+    for k, v in arrays.items():
+        if not isinstance( v, str ):
+            np.save( os.path.join( tmp, k + ".npy" ), v )
+    with open( os.path.join( tmp, "meta.json" ), "w" ) as f:
+        json.dump( meta, f )
+    try:
+        os.rename( tmp, entry )
+    except OSError:  # another process got there first
+        shutil.rmtree( tmp, ignore_errors=True )
+    if sha1 is not None:
+        _index_sha1( entry, sha1, to, engine )
+
+
+def _reuse_entry( same, entry, lpfile, sha1, to, engine ):
+    """ an entry of the same contents -> entry:
+        the same path, touched: rename;  another path: hard links, a new meta.json
+    """
+    meta = _meta( same )
+    path = os.path.abspath( lpfile )
+    if meta is None:
+        return
+    if meta["lpfile"] == path:
+        try:
+            os.rename( same, entry )  # its old key, the old mtime, is dead
+        except OSError:
+            return
+    else:
+        tmp = "%s.tmp%d" % (entry, os.getpid())
+        try:
+            os.makedirs( tmp )
+            for name in os.listdir( same ):
+                if name.endswith( ".npy" ):
+                    try:
+                        os.link( os.path.join( same, name ), os.path.join( tmp, name ))
+                    except OSError:  # no hard links here
+                        shutil.copy2( os.path.join( same, name ), os.path.join( tmp, name ))
+            meta.update( lpfile=path )
+            with open( os.path.join( tmp, "meta.json" ), "w" ) as f:
+                json.dump( meta, f )
+            os.rename( tmp, entry )
+        except OSError:  # same gone meanwhile, or another process got there first
+            shutil.rmtree( tmp, ignore_errors=True )
+            return
+    _index_sha1( entry, sha1, to, engine )
+
+
+def _index_sha1( entry, sha1, to, engine ):
+    """ cachedir/.bysha1/<sha1 to engine>: the newest entry's key """
+    index = os.path.join( os.path.dirname( entry ), ".bysha1" )
+    if not os.path.isdir( index ):
+        os.makedirs( index, exist_ok=True )
+    fname = os.path.join( index, "%s-%s-%s" % (sha1, to, engine) )
+    with open( fname + ".tmp%d" % os.getpid(), "w" ) as f:
+        f.write( os.path.basename( entry ))
+    os.replace( fname + ".tmp%d" % os.getpid(), fname )
+
+
+def _load_entry( entry, verbose=1 ):
+    meta = _meta( entry )
+    arrays = dict( meta["dtypes"] )
+    for name in os.listdir( entry ):
+        if name.endswith( ".npy" ):
+            arrays[name[:-4]] = _npload( os.path.join( entry, name ))
+    lp = glp.LP( dict_sparsematrix( arrays, "A" ),
+            problemname=meta["problemname"], maximize=meta["maximize"],
+            rowname=_names( arrays, "rowname" ), colname=_names( arrays, "colname" ),
+            mipvars=arrays.get( "mipvars" ),
+            verbose=verbose,
+            **dict( (k, arrays[k]) for k in _vecs ))
+    if meta["to"] != "linprog":
+        return lp
+
+    linrec = Bag( c=lp.c )
+    for nm in ("A_ub", "A_eq"):
+        b = "b" + nm[1:]
+        linrec[nm] = dict_sparsematrix( arrays, nm ) if b in arrays  else None
+        linrec[b] = arrays.get( b )
+    linrec.bounds = np.c_[ inftonone( lp.lb ), inftonone( lp.ub ) ]
+    return lp, linrec
+
+
+def _find_sha1( cachedir, sha1, to, engine ):
+    """ -> an entry of these contents to= engine=, or None; one index file, no scan """
+    try:
+        with open( os.path.join( cachedir, ".bysha1", "%s-%s-%s" % (sha1, to, engine) )) as f:
+            entry = os.path.join( cachedir, f.read().strip() )
+    except IOError:
+        return None
+    meta = _meta( entry )  # evicted, or a stale index
+    if meta is not None and meta.get( "sha1" ) == sha1 \
+    and meta["to"] == to and meta.get( "engine" ) == engine:
+        return entry
+    return None
+
+
+def _names( arrays, nm ):
+    if nm + "_blob" in arrays:
+        return NameTable( blob=arrays[nm + "_blob"], offsets=arrays[nm + "_offsets"] )
+    return arrays.get( nm )  # older entries: np.array of str
+
+
+def _npload( npyfile ):
+    try:
+        return np.load( npyfile, mmap_mode="c" )  # copy-on-write
+    except ValueError:  # can't mmap size 0
+        return np.load( npyfile )
+
+
+def _cachedir( cache ):
+    cachedir = CACHEDIR if cache is True  else cache
+    return os.path.expanduser( cachedir )
+
+
+def _entries( cachedir ):
+    if not os.path.isdir( cachedir ):
+        return []
+    return [os.path.join( cachedir, e ) for e in os.listdir( cachedir )
+            if ".tmp" not in e and not e.startswith( "." )]
+
+
+def _meta( entry ):
+    try:
+        with open( os.path.join( entry, "meta.json" )) as f:
+            return json.load( f )
+    except (IOError, ValueError):
+        return None
+
+
+def _dirbytes( entry ):
+    return sum( os.path.getsize( os.path.join( entry, f )) for f in os.listdir( entry ))
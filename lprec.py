@@ -1,21 +1,27 @@
 #!/usr/bin/env python
 """ LP: linear-programming problem Bag( A b c blo lb ub ... )
-    numpy arrays, A scipy.sparse
+    numpy arrays, A scipy.sparse or a compact.py PatternMatrix
 """
 
 from __future__ import division, print_function
+from concurrent.futures import ThreadPoolExecutor
+import os
 import numpy as np
 from scipy import sparse
 
-from glp.zutil import Bag, boundsvec, nbytes, quantiles
+from glp.compact import PatternMatrix, scipy_A
+from glp.lpstats import lp_stats, print_stats
+from glp.zutil import Bag, boundsvec, quantiles
 from numpy import inf
 
 #...........................................................................
 def LP( A, b, c=0, blo=-inf, lb=0, ub=inf, problemname="noname",
         maximize=False, rowname=None, colname=None, mipvars=None,  # glpk
         verbose=1 ):
-    """ -> Bag( A b c blo lb ub ... A sparse, b c ... numpy vecs """
-    if not sparse.issparse( A ):
+    """ -> Bag( A b c blo lb ub ... A sparse, b c ... numpy vecs
+        A is kept as is: a PatternMatrix, int32 indices, float32 data, see compact.py
+    """
+    if not sparse.issparse( A ) and not isinstance( A, PatternMatrix ):
         A = sparse.csr_matrix( A )  # beware, hstack vstack may -> coo
     nr, nc = A.shape
     c = boundsvec( c, nc, 0 )  # zeros(nc) / array of len nc
@@ -57,6 +63,69 @@ def lp_check( lp, x ):
     _le( lb, x, "lb", "x" )
     _le( x, ub, "x", "ub" )
 
+def check_many( lp, X, tol=1e-6, blockbytes=1 << 26, workers=None ):
+    """ X n x k, k solutions -> Bag( obj rowviol rowworst boundviol boundworst ok tol ),
+        each a k-vec, no print:
+            rowviol: max over rows of blo - Ax, Ax - b, 0,  / max( 1, |b| ) -- relative
+            rowworst: the row, -1 if none
+            boundviol boundworst: the same for lb <= x <= ub
+            ok: rowviol <= tol and boundviol <= tol
+        A X in row blocks of ~ blockbytes, on a thread pool (scipy's spmm drops the GIL),
+        so A X, m x k, is never all in memory
+    """
+    A = lp.A.tocsr()
+    X = np.asarray( X, dtype=float )
+    if X.ndim == 1:
+        X = X[:, None]
+    m, n = A.shape
+    k = X.shape[1]
+    assert X.shape[0] == n, [X.shape, A.shape]
+    b, blo = np.asarray( lp.b, dtype=float ), np.asarray( lp.blo, dtype=float )
+    nrow = max( blockbytes // (8 * k), 1 )
+
+    def rowblock( r0 ):
+        r1 = min( r0 + nrow, m )
+        lo, hi = A.indptr[r0], A.indptr[r1]
+        if isinstance( A, PatternMatrix ):
+            B = scipy_A( PatternMatrix( A.indptr[r0:r1+1] - lo, A.indices[lo:hi],
+                    (r1 - r0, n), A.value ))
+        else:  # views, no copy
+            B = sparse.csr_matrix( (A.data[lo:hi], A.indices[lo:hi], A.indptr[r0:r1+1] - lo),
+                    shape=(r1 - r0, n) )
+        return _worst( B.dot( X ), blo[r0:r1, None], b[r0:r1, None], r0 )
+
+    pool = ThreadPoolExecutor( workers or os.cpu_count() or 1 )
+    try:
+        blocks = list( pool.map( rowblock, range( 0, m, nrow )))
+    finally:
+        pool.shutdown()
+    rowviol, rowworst = np.zeros( k ), np.full( k, -1 )
+    for viol, worst in blocks:
+        more = viol > rowviol
+        rowviol[more], rowworst[more] = viol[more], worst[more]
+    boundviol, boundworst = _worst( X, lp.lb[:, None], lp.ub[:, None], 0 )
+    return Bag(
+        obj=np.asarray( lp.c, dtype=float ).dot( X ),
+        rowviol=rowviol,
+        rowworst=rowworst,
+        boundviol=boundviol,
+        boundworst=boundworst,
+        ok=(rowviol <= tol) & (boundviol <= tol),
+        tol=tol,
+        )
+
+def _worst( Y, lo, hi, i0 ):
+    """ Y rows x k, lo <= Y <= hi -> max relative violation in each column, its row + i0 """
+    if len(Y) == 0:
+        return np.zeros( Y.shape[1] ), np.full( Y.shape[1], -1 )
+    with np.errstate( invalid="ignore" ):  # inf - inf
+        v = np.fmax( np.fmax( lo - Y, Y - hi ), 0 )
+        v /= np.maximum( 1, np.where( Y > hi, np.abs( hi ), np.abs( lo )))
+    v[ np.isnan( v ) ] = 0
+    j = v.argmax( axis=0 )
+    viol = v[j, np.arange( v.shape[1] )]
+    return viol, np.where( viol > 0, j + i0, -1 )
+
 def _le( xlo, xhi, lo, hi ):
         # check Ax <= b etc.
     j = (xlo - xhi).argmax()
@@ -67,42 +136,41 @@ def _le( xlo, xhi, lo, hi ):
 
 
 def print_lp( lp, verbose=1, header="", footer="" ):
-    """ print c A ... with caller's printoptions """
-    A, b, c, blo, lb, ub, nnz, problemname \
-        = lp.A, lp.b, lp.c, lp.blo, lp.lb, lp.ub, lp.nnz, lp.problemname
+    """ print c A ... with caller's printoptions, counts from lp_stats( lp ), cached """
+    st = lp_stats( lp )
+    A, b, c, blo, lb, ub, problemname \
+        = lp.A, lp.b, lp.c, lp.blo, lp.lb, lp.ub, lp.problemname
+    rg = st.ranges
     minmax = "maximize" if lp.maximize  else "minimize"
-    c0 = (1 - np.count_nonzero( c ) / len(c)) * 100
+    c0 = (1 - st.c_nnz / len(c)) * 100 if len(c)  else 0
     c0 = "%.0f %% == 0 " % c0  if c0 >= 50 \
         else ""
-    neq = (b == blo).sum()
-    nlt = (np.isfinite(blo) & (blo < b)).sum()
     print(
 """
 { LP %s  %s
 c  : %.3g .. %.3g  %s  %s
-A  : %s  %d non0, %.2g mbytes, %.3g .. %.3g  
+A  : %s  %d non0, %.2g mbytes %s, %.3g .. %.3g  
 lb : %.3g .. %.3g  %s
 ub : %.3g .. %.3g  %s
 b  : %.3g .. %.3g  %s
 blo : %d == b, %d < b  %.3g .. %.3g  %s\
 """ % (
         header or problemname, minmax,
-        c.min(), c.max(), c0, c,
-        A.shape, A.nnz, nbytes(A) / 1e6, A.data.min(), A.data.max(),
-        lb.min(), lb.max(), lb,
-        ub.min(), ub.max(), ub,
-        b.min(), b.max(), b,
-        neq, nlt, blo.min(), blo.max(), blo
+        rg.c[0], rg.c[1], c0, c,
+        st.shape, st.nnz, st.mbytes, st.Akind, st.A_min, st.A_max,
+        rg.lb[0], rg.lb[1], lb,
+        rg.ub[0], rg.ub[1], ub,
+        rg.b[0], rg.b[1], b,
+        st.rows.eq, st.rows.ranged + st.rows.ge, rg.blo[0], rg.blo[1], blo
         ))
 
-    if verbose >= 2 and A.nnz < 500:
-        print( "A: \n", A.A )  # dense
-    if lp.mipvars is not None:
+    if verbose >= 2:
+        print_stats( st )
+        if A.nnz < 500:
+            print( "A: \n", A.toarray() )  # dense
+    if st.mip is not None:
         print( "mip: %d continuous  %d int  %d binary " % (
-            (lp.mipvars == 'c').sum(),
-            (lp.mipvars == 'i').sum(),
-            (lp.mipvars == 'b').sum() ))
+            st.mip.c, st.mip.i, st.mip.b ))
     if footer:
         print( footer )
     print( "}\n" )
-
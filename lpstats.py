@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+""" lpstats.py: lp_stats( lp ) -> Bag of counts and ranges, one pass over A, cached
+    st = lp_stats( lp )
+    st.rows  # Bag( eq le ge ranged free ), blo <= Ax <= b, eq first
+    st.cols  # Bag( fixed boxed lower upper free ), lb <= x <= ub, fixed first
+    st.rownnz_hist  # [k]: rows with 2^(k-1) <= nnz < 2^k, [0]: empty;  colnnz_hist
+    st.A_min st.A_max st.A_absmin st.A_absmax  # nonzeros, signed and |a_ij|
+    sketch_quantiles( st.A_sketch, [0, 50, 100] )  # |a_ij| quantiles, to a factor 2
+    st.ranges.c  # (min, max), also b blo lb ub
+
+    print_lp and lp_to_linprog( verbose ) use this.
+    A goes by in row blocks of ~ 4m nonzeros: no |A| copy, no sort, no sparse norms;
+    the quantiles come from a histogram of binary exponents, the sketch,
+    which adds up block by block.
+    The cache is a module dict, one entry per live A -- a weakref, dropped when A goes --
+    checked against A's shape nnz and buffer addresses and crc32s of b c blo lb ub mipvars:
+    a new A or any change to the vecs -> recomputed; nothing is stored in the LP.
+    After changing A.data in place, lp_stats( lp, cache=False ).
+"""
+
+from __future__ import division, print_function
+import weakref
+import zlib
+import numpy as np
+from numpy import inf, isfinite
+
+from glp.compact import PatternMatrix
+from glp.zutil import Bag, nbytes
+
+_vecs = "b c blo lb ub".split()
+_E0 = 1100  # frexp exponents -1074 .. 1024 -> bins 26 .. 2124
+_cache = {}  # id( A ) -> (weakref( A ), key, stats)
+
+#...............................................................................
+def lp_stats( lp, cache=True, block=1 << 22, near0=1e-8 ):
+    """ LP -> Bag( shape nnz mbytes Akind A_min A_max A_absmin A_absmax A_sketch
+            rownnz_hist colnnz_hist emptyrows emptycols rownnz_max colnnz_max
+            rownorm_min rownorm_near0 rows cols ranges c_nnz mip ), see above
+    """
+    A = lp.A
+    key = _key( lp )
+    if cache:
+        old = _cache.get( id( A ))
+        if old is not None and old[0]() is A and old[1] == key:
+            return old[2]
+    st = _stats( lp, block, near0 )
+    _remember( A, key, st )
+    return st
+
+
+def _remember( A, key, st ):
+    """ _cache[ id( A )] while A lives """
+    k = id( A )
+
+    def drop( ref ):
+        if _cache.get( k, (None,) )[0] is ref:
+            del _cache[k]
+
+    try:
+        _cache[k] = (weakref.ref( A, drop ), key, st)
+    except TypeError:  # no weakrefs, not cached
+        pass
+
+
+def _stats( lp, block, near0 ):
+    A, b, c, blo, lb, ub = lp.A, lp.b, lp.c, lp.blo, lp.lb, lp.ub
+    A = A.tocsr()
+    m, n = A.shape
+    indptr = A.indptr
+    rownnz = np.diff( indptr )
+    colnnz = np.bincount( A.indices, minlength=n )
+    st = Bag(
+        shape=A.shape,
+        nnz=A.nnz,
+        mbytes=nbytes( A ) / 1e6,
+        Akind=_Akind( A ),
+        rownnz_hist=_log2hist( rownnz ),
+        colnnz_hist=_log2hist( colnnz ),
+        emptyrows=int( (rownnz == 0).sum() ),
+        emptycols=int( (colnnz == 0).sum() ),
+        rownnz_max=int( rownnz.max( initial=0 )),
+        colnnz_max=int( colnnz.max( initial=0 )),
+        )
+
+        # one pass over A.data in row blocks: min max, |a| sketch, row inf-norms
+    amin, amax, absmin, absmax = inf, -inf, inf, 0.
+    sketch = np.zeros( 2 * _E0, dtype=np.int64 )
+    rownorm = np.zeros( m )
+    if isinstance( A, PatternMatrix ):
+        v = float( A.value )
+        if A.nnz:
+            amin = amax = v
+            absmin = absmax = abs( v )
+            sketch[ _E0 + np.frexp( abs( v ))[1] ] = A.nnz
+            rownorm[ rownnz > 0 ] = abs( v )
+    else:
+        data = A.data
+        cuts = np.searchsorted( indptr, np.arange( 0, A.nnz, block ), "right" ) - 1
+        cuts = np.unique( np.r_[ cuts, m ] )  # row blocks of ~ block non0
+        for r0, r1 in zip( cuts[:-1], cuts[1:] ):
+            lo, hi = indptr[r0], indptr[r1]
+            if lo == hi:
+                continue
+            d = data[lo:hi]
+            amin, amax = min( amin, d.min() ), max( amax, d.max() )
+            d = np.abs( d )
+            nz = d[ d > 0 ]
+            if len(nz):
+                absmin, absmax = min( absmin, nz.min() ), max( absmax, nz.max() )
+                sketch += np.bincount( _E0 + np.frexp( nz )[1], minlength=2 * _E0 )
+            full = rownnz[r0:r1] > 0
+            rownorm[r0:r1][full] = np.maximum.reduceat( d, indptr[r0:r1][full] - lo )
+    st.update(
+        A_min=float( amin ) if A.nnz  else 0.,
+        A_max=float( amax ) if A.nnz  else 0.,
+        A_absmin=float( absmin ) if absmax > 0  else 0.,
+        A_absmax=float( absmax ),
+        A_sketch=sketch,
+        rownorm_min=float( rownorm.min( initial=inf )) if m  else 0.,
+        rownorm_near0=int( (rownorm < near0).sum() ),
+        )
+
+        # bound types, vec ranges
+    finlo, finhi = isfinite( blo ), isfinite( b )
+    eq = blo == b
+    st.rows = Bag(
+        eq=int( eq.sum() ),
+        le=int( (~ eq & ~ finlo & finhi).sum() ),
+        ge=int( (~ eq & finlo & ~ finhi).sum() ),
+        ranged=int( (~ eq & finlo & finhi).sum() ),
+        free=int( (~ eq & ~ finlo & ~ finhi).sum() ),
+        )
+    finlo, finhi = isfinite( lb ), isfinite( ub )
+    fixed = lb == ub
+    st.cols = Bag(
+        fixed=int( fixed.sum() ),
+        boxed=int( (~ fixed & finlo & finhi).sum() ),
+        lower=int( (~ fixed & finlo & ~ finhi).sum() ),
+        upper=int( (~ fixed & ~ finlo & finhi).sum() ),
+        free=int( (~ fixed & ~ finlo & ~ finhi).sum() ),
+        )
+    st.ranges = Bag( (k, (float( lp[k].min() ), float( lp[k].max() )) if len(lp[k])  else (0., 0.))
+                    for k in _vecs )
+    st.c_nnz = int( np.count_nonzero( c ))
+    mipvars = lp.get( "mipvars" )
+    st.mip = None if mipvars is None  else Bag(
+        (k, int( (np.asarray( mipvars ) == k).sum() )) for k in "c i b".split() )
+    return st
+
+
+def sketch_quantiles( sketch, q=[0, 10, 25, 50, 75, 90, 100] ):
+    """ A_sketch, percents -> |a_ij| quantiles, each a power of 2, > the true one, <= 2 x """
+    cum = np.cumsum( sketch )
+    if cum[-1] == 0:
+        return np.zeros( len(q) )
+    k = np.searchsorted( cum, np.maximum( np.asarray( q ) / 100 * cum[-1], 1 ))
+    return np.ldexp( 1., k - _E0 )
+
+
+def print_stats( st ):
+    """ print rows cols, row / col non0 histograms, |A| quantiles """
+    print( "rows: %s" % "  ".join( "%d %s" % (v, k) for k, v in st.rows.items() ))
+    print( "cols: %s" % "  ".join( "%d %s" % (v, k) for k, v in st.cols.items() ))
+    print( "row non0 2^k: %s  max %d  %d empty" % (
+            st.rownnz_hist, st.rownnz_max, st.emptyrows ))
+    print( "col non0 2^k: %s  max %d  %d empty" % (
+            st.colnnz_hist, st.colnnz_max, st.emptycols ))
+    print( "|A| quantiles 0 10 25 50 75 90 100 %%: %s" % sketch_quantiles( st.A_sketch ))
+
+
+#...............................................................................
+def _log2hist( counts ):
+    """ -> [k] = number of counts with 2^(k-1) <= count < 2^k, [0] = number of 0s """
+    return np.bincount( np.frexp( counts )[1] ) if len(counts)  else np.zeros( 1, dtype=int )
+
+
+def _key( lp ):
+    """ A shape nnz buffer addresses, crc32s of the vecs and mipvars """
+    A = lp.A
+    addrs = tuple( _addr( getattr( A, k, None )) for k in ("data", "indices", "indptr") )
+    crcs = tuple( _crc( lp[k] ) for k in _vecs )
+    mipvars = lp.get( "mipvars" )
+    mip = None if mipvars is None  else _crc( np.asarray( mipvars, dtype="U1" ))
+    return (A.shape, A.nnz) + addrs + crcs + (mip,)
+
+def _addr( x ):
+    return None if x is None  else (np.asarray( x ).__array_interface__["data"][0], len(x))
+
+def _crc( x ):
+    return zlib.crc32( np.ascontiguousarray( x ).view( np.uint8 ))
+
+
+def _Akind( A ):
+    """ "float64 int32" / "pattern int32" """
+    data = "pattern" if isinstance( A, PatternMatrix )  else A.dtype.name
+    indices = getattr( A, "indices", None )
+    return data if indices is None  else "%s %s" % (data, indices.dtype.name)
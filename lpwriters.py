@@ -0,0 +1,641 @@
+#!/usr/bin/env python
+""" lpwriters.py: LP( A b c ... ) -> CPLEX .lp, free MPS, numpy, no gnulp
+    save_lp( "my.lp", lp, engine="native" )  # or my.mps, .gz ok
+    lp_to_gnulp builds a second copy of the model in GLPK, element by element;
+    these write straight from the csr / csc arrays, a block of rows or columns
+    at a time, each block formatted at once with the string tables in save_lp.py.
+
+    GLPK reads the files back to the same model as from its own writers:
+    the same name fixes, ranged rows in .lp as a "- ~r_i" column, empty columns
+    as "+ 0 x" in .lp, free rows N in .mps.  Numbers are shortest-exact, repr,
+    not GLPK's 15 / 12 digits, so a round trip gives the same floats.
+"""
+    # CPLEX LP and MPS: glpk.pdf appendices B C, glpk src/glpcpx.c glpmps.c
+
+from __future__ import division, print_function
+import os
+import shutil
+import tempfile
+import numpy as np
+from scipy import sparse
+
+from glp.compact import PatternMatrix
+from glp.names import NameTable
+from glp.zutil import boundsvec
+from glp.save_lp import _strtable, _blobtable, _blocks, _catlines, _open_out
+
+_lpconsts = ["", " ", ":", "\n", " + 0 ", " - ", " = ", " <= ", " >= ",
+        " obj:", " 0 <= ", "-Inf", " free", " RHS1", " RNG1", " BND1 ",
+        "N", "L", "G", "E", "FR", "MI", "UP", "LO", "PL", "FX",
+        "\n ", " M0000001 'MARKER' 'INTORG'\n", " M0000002 'MARKER' 'INTEND'\n"]
+(_e, _sp, _colon, _nl, _zero, _minus, _eq, _le, _ge,
+    _obj, _zle, _minf, _free, _rhs1, _rng1, _bnd1,
+    _N, _L, _G, _E, _FR, _MI, _UP, _LO, _PL, _FX,
+    _nlsp, _intorg, _intend) = range( len(_lpconsts) )
+_consts = _strtable( _lpconsts )
+_C, _COEF, _COL, _ROW, _NUM, _NUM2, _ART = range( 7 )  # table numbers in _catlines
+
+    # GLPK glpcpx.c adjust_name valid_name
+_lpmap = np.arange( 256, dtype=np.uint8 )
+for _a, _b in zip( " -[]", "_~()" ):
+    _lpmap[ord(_a)] = ord(_b)
+_lpvalid = np.zeros( 256, dtype=bool )
+for _ch in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" \
+        "!\"#$%&()/,.;?@_`'{}|~":
+    _lpvalid[ord(_ch)] = True
+
+#...............................................................................
+def write_cpxlp( outfile, lp, block=1 << 18, gzlevel=6, gzworkers=None, verbose=1 ):
+    """ LP( A b c ... ) -> CPLEX .lp [.gz], like GLPK's lpx_write_cpxlp
+        row blocks of ~ `block` nonzeros; free rows are not written, as in GLPK
+    """
+    A = lp.A.tocsr()
+    m, n = A.shape
+    b, blo, c = _floats( lp.b ), _floats( lp.blo ), _floats( lp.c )
+    if verbose:
+        print( "write_cpxlp: %s  A %s  %d non0" % (outfile, A.shape, A.nnz) )
+    rownames = _lpnames( lp.get( "rowname" ), m, "r_%d" )
+    colnames = _lpnames( lp.get( "colname" ), n, "x_%d" )
+    free = ~ np.isfinite( b ) & ~ np.isfinite( blo )
+    ranged = np.isfinite( b ) & np.isfinite( blo ) & (b != blo)
+    ir = np.flatnonzero( ranged )  # row - ~r_i = blo,  0 <= ~r_i <= b - blo
+    artnames = _blobtable( np.char.add( "~r_", (ir + 1).astype( str )))
+    artix = np.full( m, -1 )
+    artix[ir] = np.arange( len(ir) )
+
+        # columns in no constraint go in the objective, + 0 x
+    nz = A.data != 0
+    if free.any():
+        nz &= np.repeat( ~ free, np.diff( A.indptr ))
+    used = np.zeros( n, dtype=bool )
+    used[ A.indices[nz] ] = True
+
+    with _open_out( outfile, gzlevel, gzworkers ) as f:
+        f.write( ("\\* Problem: %s *\\\n\n%s\n" % (lp.problemname or "Unknown",
+                "Maximize" if lp.maximize  else "Minimize")).encode( "utf-8" ))
+        jobj = np.flatnonzero( (c != 0) | ~ used )
+        if len(jobj) == 0 and n > 0:
+            jobj = np.array([ 0 ])  # obj: + 0 x_1
+        coeftab, coefix = _lpcoefs( c[jobj] )
+        f.write( _catlines( [_consts, coeftab, colnames],
+                ([_C], [[ _obj ]]), [len(jobj)],
+                ([_COEF, _COL], np.c_[ coefix, jobj ]),
+                ([_C], [[ _nl ]]) ))
+
+        f.write( b"\nSubject To\n" )
+        for r0, r1 in _blocks( A.indptr, block ):
+            f.write( _lprows( A, b, blo, r0, r1, free, artix,
+                    [_consts, None, colnames, rownames, None, None, artnames] ))
+
+            # Bounds: ranges first, then columns
+        lines = [_lpranges( b[ir] - blo[ir], artnames )]
+        for j0 in range( 0, n, block ):
+            lines.append( _lpbounds( lp.lb, lp.ub, j0, min( j0 + block, n ), colnames ))
+        if any( lines ):
+            f.write( b"\nBounds\n" )
+            for s in lines:
+                f.write( s )
+
+        f.write( _lpints( lp.get( "mipvars" ), colnames ))
+        f.write( b"\nEnd\n" )
+    return lp
+
+
+def _lprows( A, b, blo, r0, r1, free, artix, tables ):
+    """ rows r0 .. r1, not free -> " name: + 2 x - y ... <= 4" lines """
+    rows = np.flatnonzero( ~ free[r0:r1] )
+    lo, hi = A.indptr[r0], A.indptr[r1]
+    rowid = np.repeat( np.arange( r1 - r0 ), np.diff( A.indptr[r0:r1+1] ))
+    keep = (A.data[lo:hi] != 0) & ~ free[r0:r1][rowid]
+    cnt = np.bincount( rowid[keep], minlength=r1 - r0 )[rows]
+    coeftab, coefix = _lpcoefs( A.data[lo:hi][keep], cnt )
+
+    i = rows + r0
+    art = artix[i] >= 0
+    eq = (b[i] == blo[i]) | art
+    le = np.isfinite( b[i] ) & ~ eq
+    op = np.where( eq, _eq, np.where( le, _le, _ge ))
+    rhs = np.where( art | ~ le, blo[i], b[i] )
+    rhstab, rhsix = _numtab( rhs )
+    k = len(rows)
+    fill = (cnt == 0) & ~ art  # empty row: r: + 0 x_1 <= 4
+    which = np.tile( [_C, _ROW, _C, _C, _C, _C, _C, _C, _NUM, _C], (k, 1) )
+    which[:, 4] = np.where( fill, _COL, _C )
+    which[:, 6] = np.where( art, _ART, _C )
+    idx = np.c_[ np.full( k, _sp ), i, np.full( k, _colon ),
+        np.where( fill, _zero, _e ), np.where( fill, 0, _e ),
+        np.where( art, _minus, _e ), np.where( art, artix[i], _e ),
+        op, rhsix, np.full( k, _nl ) ]
+    tables = list( tables )
+    tables[_COEF], tables[_NUM] = coeftab, rhstab
+    return _catlines( tables, (which[:, :3], idx[:, :3]), cnt,
+            ([_COEF, _COL], np.c_[ coefix, A.indices[lo:hi][keep] ]),
+            (which[:, 3:], idx[:, 3:]) )
+
+
+def _lpranges( rng, artnames ):
+    """ " 0 <= ~r_i <= b - blo" lines """
+    if len(rng) == 0:
+        return b""
+    numtab, numix = _numtab( rng )
+    k = len(rng)
+    return _catlines( [_consts, None, None, None, numtab, None, artnames],
+            ([_C, _ART, _C, _NUM, _C], np.c_[ np.full( k, _zle ), np.arange( k ),
+                np.full( k, _le ), numix, np.full( k, _nl ) ]),
+            np.zeros( k, dtype=np.int64 ))
+
+
+def _lpbounds( lbvec, ubvec, j0, j1, colnames ):
+    """ columns j0 .. j1 -> " x free", " x >= lb", " -Inf <= x <= ub",
+        " lb <= x <= ub", " x = lb"; nothing for 0 <= x
+    """
+    lb, ub = _floats( lbvec[j0:j1] ), _floats( ubvec[j0:j1] )
+    lofin, hifin = np.isfinite( lb ), np.isfinite( ub )
+    fx = lofin & (lb == ub)
+    fr = ~ lofin & ~ hifin
+    lo = lofin & ~ hifin & (lb != 0)
+    db = lofin & hifin & ~ fx
+    up = ~ lofin & hifin
+    j = np.flatnonzero( fx | fr | lo | db | up )
+    if len(j) == 0:
+        return b""
+    fx, fr, lo, db, up = fx[j], fr[j], lo[j], db[j], up[j]
+    lotab, loix = _numtab( lb[j] )
+    hitab, hiix = _numtab( np.where( lo | fx, lb[j], ub[j] ))
+    k = len(j)
+    which = np.tile( [_C, _C, _C, _COL, _C, _NUM2, _C], (k, 1) )
+    which[:, 1] = np.where( db, _NUM, _C )
+    which[:, 5] = np.where( fr, _C, _NUM2 )
+    idx = np.c_[ np.full( k, _sp ),
+        np.where( db, loix, np.where( up, _minf, _e )),
+        np.where( db | up, _le, _e ),
+        j + j0,
+        np.where( fr, _free, np.where( fx, _eq, np.where( lo, _ge, _le ))),
+        np.where( fr, _e, hiix ),
+        np.full( k, _nl ) ]
+    return _catlines( [_consts, None, colnames, None, lotab, hitab],
+            (which, idx), np.zeros( k, dtype=np.int64 ))
+
+
+def _lpints( mipvars, colnames ):
+    """ mipvars "i" "b" -> General Binary sections """
+    if mipvars is None:
+        return b""
+    mipvars = np.asarray( mipvars )
+    out = []
+    for section, kind in (("General", "i"), ("Binary", "b")):
+        j = np.flatnonzero( mipvars == kind )
+        if len(j):
+            out.append( ("\n%s\n" % section).encode( "utf-8" ))
+            out.append( _catlines( [_consts, None, colnames],
+                    ([_C, _COL, _C], np.c_[ np.full( len(j), _sp ), j, np.full( len(j), _nl ) ]),
+                    np.zeros( len(j), dtype=np.int64 )))
+    return b"".join( out )
+
+
+#...............................................................................
+def write_freemps( outfile, lp, block=1 << 18, gzlevel=6, gzworkers=None, verbose=1 ):
+    """ LP( A b c ... ) -> free MPS [.gz], like GLPK's lpx_write_freemps
+        COLUMNS from csc, column blocks of ~ `block` nonzeros, 2 pairs a line;
+        ranged rows E with RANGES, free rows N
+    """
+    A = lp.A.tocsc()  # the one copy, COLUMNS go column by column
+    m, n = A.shape
+    b, blo, c = _floats( lp.b ), _floats( lp.blo ), _floats( lp.c )
+    if verbose:
+        print( "write_freemps: %s  A %s  %d non0" % (outfile, A.shape, A.nnz) )
+    rownames = _mpsnames( lp.get( "rowname" ), m, "R%07d" )
+    colnames = _mpsnames( lp.get( "colname" ), n, "C%07d" )
+    objname = _strtable([ "R0000000" ])
+    mipvars = lp.get( "mipvars" )
+    isint = np.zeros( n, dtype=bool ) if mipvars is None \
+        else np.isin( np.asarray( mipvars ), ["i", "b"] )
+
+    typ, rhs, rng = _mpsrhs( b, blo )
+    problemname = (lp.problemname or "").replace( " ", "_" )
+
+    with _open_out( outfile, gzlevel, gzworkers ) as f:
+        f.write( ("* Problem:    %s\n* Class:      %s\n* Rows:       %d\n"
+                "* Columns:    %d\n* Non-zeros:  %d\n* Format:     Free MPS\n*\n"
+                "NAME%s\nROWS\n N R0000000\n" % (
+                lp.problemname or "", "MIP" if isint.any()  else "LP", m, n,
+                np.count_nonzero( A.data ), " " + problemname if problemname  else ""
+                )).encode( "utf-8" ))
+        f.write( _mpsrows( typ, rownames ))
+
+        f.write( b"COLUMNS\n" )
+        for j0, j1 in _blocks( A.indptr, block ):
+            lo, hi = A.indptr[j0], A.indptr[j1]
+            f.write( _mpscolumns( A.indptr[j0:j1+1] - lo, A.indices[lo:hi], A.data[lo:hi],
+                    c[j0:j1], isint[j0:j1], j0 > 0 and isint[j0 - 1], j0,
+                    colnames, rownames, objname ))
+        if isint[-1:].any():
+            f.write( _lpconsts[_intend].encode( "utf-8" ))
+
+        jr = np.flatnonzero( rhs != 0 )
+        if len(jr):
+            f.write( b"RHS\n" + _mpspairs( _rhs1, jr, rhs[jr], rownames ))
+        jr = np.flatnonzero( rng != 0 )
+        if len(jr):
+            f.write( b"RANGES\n" + _mpspairs( _rng1, jr, rng[jr], rownames ))
+        bounds = _mpsbounds( _floats( lp.lb ), _floats( lp.ub ), isint, colnames )
+        if bounds:
+            f.write( b"BOUNDS\n" + bounds )
+        f.write( b"ENDATA\n" )
+    return lp
+
+
+def _mpsrhs( b, blo ):
+    """ -> row types N L G E, RHS, RANGES -- ranged rows E, blo <= row <= blo + R """
+    lofin, hifin = np.isfinite( blo ), np.isfinite( b )
+    eq = lofin & hifin  # ranged too
+    typ = np.where( eq, _E, np.where( hifin, _L, np.where( lofin, _G, _N )))
+    rhs = np.where( lofin, blo, np.where( hifin, b, 0 ))
+    rng = np.where( eq, b - np.where( eq, blo, 0 ), 0 )
+    return typ, rhs, rng
+
+
+def _mpsrows( typ, rownames ):
+    """ ROWS lines " L r1" """
+    m = len(typ)
+    return _catlines( [_consts, None, None, rownames],
+            ([_C, _C, _C, _ROW, _C], np.c_[ np.full( m, _sp ), typ, np.full( m, _sp ),
+                np.arange( m ), np.full( m, _nl ) ]),
+            np.zeros( m, dtype=np.int64 ))
+
+
+def _mpscolumns( indptr, indices, data, cj, isint, prevint, j0, colnames, rownames, objname ):
+    """ csc columns j0 .. j0 + k, indptr from 0 -> " x R0000000 1 r4 1\\n x r3 3" lines,
+        the objective first, + 0 for empty columns, MARKER lines around integer runs
+    """
+    k = len(indptr) - 1
+    colid = np.repeat( np.arange( k ), np.diff( indptr ))
+    keep = data != 0
+    cnt = np.bincount( colid[keep], minlength=k )
+    obj = (cj != 0) | (cnt == 0)
+        # pairs: obj then rows, column by column
+    npair = cnt + obj
+    ntot = npair.sum()
+    first = np.cumsum( npair ) - npair
+    isobj = np.zeros( ntot, dtype=bool )
+    isobj[ first[obj] ] = True
+    rowix = np.zeros( ntot, dtype=np.int64 )
+    rowix[~ isobj] = indices[keep]
+    val = np.empty( ntot )
+    val[isobj] = cj[obj]
+    val[~ isobj] = data[keep]
+    numtab, numix = _numtab( val )
+    col = np.repeat( np.arange( j0, j0 + k ), npair )
+    p = np.arange( ntot ) - np.repeat( first, npair )
+    wrap = (p > 0) & (p % 2 == 0)  # 2 pairs a line, then "\n name"
+    which = np.tile( [_C, _C, _C, _ROW, _C, _NUM], (ntot, 1) )
+    which[:, 1] = np.where( wrap, _COL, _C )
+    which[:, 3] = np.where( isobj, _ART, _ROW )  # _ART table: objname
+    idx = np.c_[ np.where( wrap, _nlsp, _e ), np.where( wrap, col, _e ),
+        np.full( ntot, _sp ), rowix, np.full( ntot, _sp ), numix ]
+
+    prev = np.r_[ bool( prevint ), isint[:-1] ]
+    mark = np.where( isint & ~ prev, _intorg, np.where( prev & ~ isint, _intend, _e ))
+    return _catlines( [_consts, None, colnames, rownames, numtab, None, objname],
+            ([_C, _C, _COL], np.c_[ mark, np.full( k, _sp ), np.arange( j0, j0 + k ) ]),
+            npair, (which, idx), ([_C], np.full( (k, 1), _nl )) )
+
+
+def _mpspairs( setname, jr, val, rownames ):
+    """ " RHS1 r1 4 r2 1" lines, 2 pairs a line """
+    nline = (len(jr) + 1) // 2
+    cnt = np.full( nline, 2 )
+    cnt[-1] = len(jr) - 2 * (nline - 1)
+    numtab, numix = _numtab( val )
+    return _catlines( [_consts, None, None, rownames, numtab],
+            ([_C], np.full( (nline, 1), setname )), cnt,
+            ([_C, _ROW, _C, _NUM], np.c_[ np.full( len(jr), _sp ), jr,
+                np.full( len(jr), _sp ), numix ]),
+            ([_C], np.full( (nline, 1), _nl )) )
+
+
+def _mpsbounds( lb, ub, isint, colnames, j0=0 ):
+    """ columns j0 .. -> " UP BND1 x 5" ... lines, as GLPK reads them:
+        MI and integer columns, default 0 .. 1, need an explicit UP or PL
+    """
+    lofin, hifin = np.isfinite( lb ), np.isfinite( ub )
+    fx = lofin & hifin & (lb == ub)
+    fr = ~ lofin & ~ hifin
+    entries = [  # (kind, col mask, value or None), in line order per column
+        (_FX, fx, lb),
+        (_FR, fr, None),
+        (_MI, ~ lofin & hifin, None),
+        (_LO, lofin & ~ fx & (lb != 0), lb),
+        (_UP, hifin & ~ fx, ub),
+        (_PL, lofin & ~ hifin & isint, None),
+        ]
+    cols, kinds, vals, slots = [], [], [], []
+    for slot, (kind, mask, x) in enumerate( entries ):
+        j = np.flatnonzero( mask )
+        cols.append( j )
+        kinds.append( np.full( len(j), kind ))
+        vals.append( x[j] if x is not None  else np.full( len(j), np.nan ))
+        slots.append( np.full( len(j), slot ))
+    col, kind, val, slot = map( np.concatenate, (cols, kinds, vals, slots) )
+    if len(col) == 0:
+        return b""
+    order = np.lexsort( (slot, col) )
+    col, kind, val = col[order], kind[order], val[order]
+    hasval = ~ np.isnan( val )
+    numtab, numix = _numtab( np.where( hasval, val, 0 ))
+    k = len(col)
+    which = np.tile( [_C, _C, _C, _COL, _C, _NUM, _C], (k, 1) )
+    which[:, 5] = np.where( hasval, _NUM, _C )
+    idx = np.c_[ np.full( k, _sp ), kind, np.full( k, _bnd1 ), col + j0,
+        np.where( hasval, _sp, _e ), np.where( hasval, numix, _e ), np.full( k, _nl ) ]
+    return _catlines( [_consts, None, colnames, None, numtab],
+            (which, idx), np.zeros( k, dtype=np.int64 ))
+
+
+#...............................................................................
+class LPWriter( object ):
+    """ streaming .lp / .mps [.gz] writer: the columns up front, then rows a block at a time
+        with LPWriter( "big.mps.gz", c, lb=0, ub=inf ) as w:
+            for A, b, blo in rowblocks:  # csr, all n columns
+                w.add_rows( A, b, blo )
+        Memory: a block, and the column vectors c lb ub names -- never all the rows.
+        .lp: rows go straight out; every column is in the objective, "+ 0 x",
+            so load_lp gets them in order.
+        .mps: COLUMNS go column by column, so each block's nonzeros are spilled
+            to temp files by column range, `bucketcols` columns each; close()
+            sorts and writes a range at a time, then RHS RANGES from their spills.
+    """
+
+    def __init__( self, outfile, c, lb=0, ub=np.inf, colname=None, problemname=None,
+                maximize=False, mipvars=None, tmpdir=None, bucketcols=1 << 16,
+                gzlevel=6, gzworkers=None, verbose=1 ):
+        f = outfile.replace( ".gz", "" )
+        assert f.endswith( (".lp", ".mps") ), \
+            "LPWriter: %s should be .lp or .mps [.gz]" % outfile
+        self.outfile = outfile
+        self.mps = f.endswith( ".mps" )
+        self.c = _floats( c )
+        n = self.n = len(self.c)
+        self.lb = boundsvec( lb, n, 0 )
+        self.ub = boundsvec( ub, n, np.inf )
+        self.mipvars = mipvars
+        self.isint = np.zeros( n, dtype=bool ) if mipvars is None \
+            else np.isin( np.asarray( mipvars ), ["i", "b"] )
+        self.bucketcols = bucketcols
+        self.verbose = verbose
+        self.m = self.nnz = 0
+        self.tmpdir = tempfile.mkdtemp( prefix="lpwriter-", dir=tmpdir )
+        self.f = _open_out( outfile, gzlevel, gzworkers )
+        if self.mps:
+            self._mps_open( colname, problemname )
+        else:
+            self._lp_open( colname, problemname, maximize )
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, *exc ):
+        if exc[0] is None:
+            self.close()
+        else:
+            self.f.close()
+            shutil.rmtree( self.tmpdir, ignore_errors=True )
+
+    def add_rows( self, A, b, blo=- np.inf, rowname=None ):
+        """ blo <= A x <= b, A csr k x n, b blo k-vecs or scalars, rowname k or None """
+        A = A.tocsr() if isinstance( A, PatternMatrix )  else sparse.csr_matrix( A )
+        k = A.shape[0]
+        assert A.shape[1] == self.n, [A.shape, self.n]
+        b = boundsvec( b, k, np.inf )
+        blo = boundsvec( blo, k, - np.inf )
+        if self.mps:
+            self._mps_rows( A, b, blo, rowname )
+        else:
+            self._lp_rows( A, b, blo, rowname )
+        self.m += k
+        self.nnz += A.nnz
+
+    def close( self ):
+        if self.mps:
+            self._mps_close()
+        else:
+            self._lp_close()
+        self.f.close()
+        shutil.rmtree( self.tmpdir, ignore_errors=True )
+        if self.verbose:
+            print( "LPWriter: %s  A %d x %d  %d non0" % (self.outfile, self.m, self.n, self.nnz) )
+
+    #...........................................................................
+    def _lp_open( self, colname, problemname, maximize ):
+        n, c = self.n, self.c
+        self.colnames = _lpnames( colname, n, "x_%d" )
+        open( self._tmp( "ranges" ), "wb" ).close()  # " 0 <= ~r_i <= R" for Bounds
+        self.f.write( ("\\* Problem: %s *\\\n\n%s\n" % (problemname or "Unknown",
+                "Maximize" if maximize  else "Minimize")).encode( "utf-8" ))
+        for j0 in range( 0, n, self.bucketcols ):
+            j = np.arange( j0, min( j0 + self.bucketcols, n ))
+            coeftab, coefix = _lpcoefs( c[j] )
+            self.f.write( _catlines( [_consts, coeftab, self.colnames],
+                    ([_C], [[ _obj if j0 == 0  else _e ]]), [len(j)],
+                    ([_COEF, _COL], np.c_[ coefix, j ]),
+                    ([_C], [[ _nl ]]) ))
+        self.f.write( b"\nSubject To\n" )
+
+    def _lp_rows( self, A, b, blo, rowname ):
+        k, i0 = A.shape[0], self.m
+        free = ~ np.isfinite( b ) & ~ np.isfinite( blo )
+        ir = np.flatnonzero( np.isfinite( b ) & np.isfinite( blo ) & (b != blo) )
+        artnames = _blobtable( np.char.add( "~r_", (i0 + ir + 1).astype( str )))
+        artix = np.full( k, -1 )
+        artix[ir] = np.arange( len(ir) )
+        rownames = _lpnames( rowname, k, "r_%d", first=i0 + 1 )
+        self.f.write( _lprows( A, b, blo, 0, k, free, artix,
+                [_consts, None, self.colnames, rownames, None, None, artnames] ))
+        if len(ir):
+            with open( self._tmp( "ranges" ), "ab" ) as f:
+                f.write( _lpranges( b[ir] - blo[ir], artnames ))
+
+    def _lp_close( self ):
+        f = self.f
+        header = b"\nBounds\n"
+        if os.path.getsize( self._tmp( "ranges" )) > 0:
+            f.write( header )
+            header = b""
+            with open( self._tmp( "ranges" ), "rb" ) as g:
+                shutil.copyfileobj( g, f, 1 << 20 )
+        for j0 in range( 0, self.n, self.bucketcols ):
+            bounds = _lpbounds( self.lb, self.ub, j0,
+                    min( j0 + self.bucketcols, self.n ), self.colnames )
+            if bounds:
+                f.write( header + bounds )
+                header = b""
+        f.write( _lpints( self.mipvars, self.colnames ))
+        f.write( b"\nEnd\n" )
+
+    #...........................................................................
+    def _mps_open( self, colname, problemname ):
+        self.colnames = _mpsnames( colname, self.n, "C%07d" )
+        name = (problemname or "").replace( " ", "_" )
+        self.f.write( ("* Problem:    %s\n* Class:      %s\n* Format:     Free MPS\n*\n"
+                "NAME%s\nROWS\n N R0000000\n" % (
+                problemname or "", "MIP" if self.isint.any()  else "LP",
+                " " + name if name  else "" )).encode( "utf-8" ))
+        self.nbucket = max( -(- self.n // self.bucketcols), 1 )
+        self.namebytes = 0
+        with open( self._tmp( "names.off" ), "wb" ) as f:
+            np.zeros( 1, dtype=np.int64 ).tofile( f )
+        for nm in ("names.blob", "rhs", "rng"):
+            open( self._tmp( nm ), "wb" ).close()
+
+    def _mps_rows( self, A, b, blo, rowname ):
+        k, i0 = A.shape[0], self.m
+        rownames = _mpsnames( rowname, k, "R%07d", first=i0 + 1 )
+        typ, rhs, rng = _mpsrhs( b, blo )
+        self.f.write( _mpsrows( typ, rownames ))
+        for nm, setname, x in (("rhs", _rhs1, rhs), ("rng", _rng1, rng)):
+            jr = np.flatnonzero( x != 0 )
+            if len(jr):
+                with open( self._tmp( nm ), "ab" ) as f:
+                    f.write( _mpspairs( setname, jr, x[jr], rownames ))
+
+            # row names for COLUMNS at close: blob + global offsets
+        blob, offsets = rownames
+        with open( self._tmp( "names.blob" ), "ab" ) as f:
+            f.write( memoryview( np.ascontiguousarray( blob )))
+        with open( self._tmp( "names.off" ), "ab" ) as f:
+            (offsets[1:] + self.namebytes).astype( np.int64 ).tofile( f )
+        self.namebytes += int( offsets[-1] )
+
+            # nonzeros -> bucket files by column range
+        keep = A.data != 0
+        rec = np.empty( np.count_nonzero( keep ), dtype=_spill )
+        rec["row"] = np.repeat( np.arange( i0, i0 + k ), np.diff( A.indptr ))[keep]
+        rec["col"] = A.indices[keep]
+        rec["val"] = A.data[keep]
+        bucket = rec["col"] // self.bucketcols
+        order = np.argsort( bucket, kind="stable" )
+        rec, bucket = rec[order], bucket[order]
+        cuts = np.searchsorted( bucket, np.arange( self.nbucket + 1 ))
+        for q in np.flatnonzero( np.diff( cuts )).tolist():
+            with open( self._tmp( "cols.%d" % q ), "ab" ) as f:
+                rec[ cuts[q] : cuts[q+1] ].tofile( f )
+
+    def _mps_close( self ):
+        f, n = self.f, self.n
+        names = NameTable( blob=_memmap( self._tmp( "names.blob" ), np.uint8 ),
+                offsets=_memmap( self._tmp( "names.off" ), np.int64 ))  # all rows, on disk
+        objname = _strtable([ "R0000000" ])
+        f.write( b"COLUMNS\n" )
+        for q in range( self.nbucket ):
+            j0, j1 = q * self.bucketcols, min( (q + 1) * self.bucketcols, n )
+            spill = self._tmp( "cols.%d" % q )
+            rec = np.fromfile( spill, dtype=_spill ) if os.path.exists( spill ) \
+                else np.zeros( 0, dtype=_spill )
+            rec = rec[ np.lexsort( (rec["row"], rec["col"]) )]
+            rows, rowix = np.unique( rec["row"], return_inverse=True )
+            indptr = np.r_[ 0, np.cumsum( np.bincount( rec["col"] - j0, minlength=j1 - j0 ))]
+            f.write( _mpscolumns( indptr, rowix.reshape( -1 ), rec["val"], self.c[j0:j1],
+                    self.isint[j0:j1], j0 > 0 and self.isint[j0 - 1], j0,
+                    self.colnames, _blobtable( names.take( rows )), objname ))
+            del rec
+            if os.path.exists( spill ):
+                os.remove( spill )
+        if self.isint[-1:].any():
+            f.write( _lpconsts[_intend].encode( "utf-8" ))
+        del names  # the memmaps
+
+        for nm, section in (("rhs", b"RHS\n"), ("rng", b"RANGES\n")):
+            if os.path.getsize( self._tmp( nm )) > 0:
+                f.write( section )
+                with open( self._tmp( nm ), "rb" ) as g:
+                    shutil.copyfileobj( g, f, 1 << 20 )
+        header = b"BOUNDS\n"
+        for j0 in range( 0, n, self.bucketcols ):
+            j1 = min( j0 + self.bucketcols, n )
+            bounds = _mpsbounds( self.lb[j0:j1], self.ub[j0:j1], self.isint[j0:j1],
+                    self.colnames, j0 )
+            if bounds:
+                f.write( header + bounds )
+                header = b""
+        f.write( b"ENDATA\n" )
+
+    def _tmp( self, name ):
+        return os.path.join( self.tmpdir, name )
+
+
+_spill = np.dtype([ ("col", "<i8"), ("row", "<i8"), ("val", "<f8") ])
+
+
+def _memmap( filename, dtype ):
+    """ np.memmap, or an empty array: memmap can't map 0 bytes """
+    if os.path.getsize( filename ) == 0:
+        return np.zeros( 0, dtype=dtype )
+    return np.memmap( filename, dtype=dtype, mode="r" )
+
+
+#...............................................................................
+def _num( x ):
+    """ shortest exact: 2.0 -> "2", 0.1 -> "0.1", 1e+20 """
+    s = repr( float( x ))
+    return s[:-2] if s.endswith( ".0" )  else s
+
+
+def _numtab( x, fmt="%s" ):
+    """ x -> (table of fmt % _num( unique values )), index of each x """
+    uniq, inv = np.unique( x, return_inverse=True )
+    return _strtable( [fmt % _num( u ) for u in uniq.tolist()] ), inv.reshape( -1 )
+
+
+def _lpcoefs( x, cnt=None, wrap=8 ):
+    """ -> (table " + " " - 2 " ..., index), once per unique value;
+        with cnt terms per line, every `wrap`-th term starts a new line
+    """
+    uniq, inv = np.unique( x, return_inverse=True )
+    strs = [(" - " if u < 0  else " + ") + ("" if abs(u) == 1  else _num( abs(u) ) + " ")
+            for u in uniq.tolist()]
+    inv = inv.reshape( -1 )
+    if cnt is None:
+        cnt = [len(x)]
+    cnt = np.asarray( cnt, dtype=np.int64 )
+    p = np.arange( len(x) ) - np.repeat( np.cumsum( cnt ) - cnt, cnt )
+    inv = inv + len(strs) * ((p > 0) & (p % wrap == 0))
+    return _strtable( strs + ["\n" + s for s in strs] ), inv
+
+
+def _lpnames( names, n, fake, first=1 ):
+    """ names -> (blob, offsets) as GLPK's .lp writer: " -[]" -> "_~()",
+        then names still not valid, or none -> fake % (i + first), r_1 x_1
+    """
+    if names is None:
+        return _blobtable( NameTable( fmt=fake, ix=np.arange( first, first + n )))
+    blob, offsets = _blobtable( names )
+    blob = _lpmap[blob]
+    lens = np.diff( offsets )
+    bad = (lens == 0) | (lens > 255)
+    nameid = np.repeat( np.arange( n ), lens )
+    bad |= np.bincount( nameid[ ~ _lpvalid[blob] ], minlength=n ) > 0
+    c0 = blob[ offsets[:-1][lens > 0] ]
+    bad[lens > 0] |= ((c0 >= ord("0")) & (c0 <= ord("9"))) | (c0 == ord("."))
+    if not bad.any():
+        return blob, offsets
+    strs = NameTable( blob=blob, offsets=offsets ).strings().astype( object )
+    strs[bad] = [fake % (i + first) for i in np.flatnonzero( bad ).tolist()]
+    return _blobtable( strs )
+
+
+def _mpsnames( names, n, fake, first=1 ):
+    """ names -> (blob, offsets), blanks -> _, none or "" -> fake % (i + first), R0000001 """
+    if names is None:
+        return _blobtable( NameTable( fmt=fake, ix=np.arange( first, first + n )))
+    blob, offsets = _blobtable( names )
+    blob = np.where( blob == ord(" "), np.uint8( ord("_") ), blob )
+    empty = np.diff( offsets ) == 0
+    if not empty.any():
+        return blob, offsets
+    strs = NameTable( blob=blob, offsets=offsets ).strings().astype( object )
+    strs[empty] = [fake % (i + first) for i in np.flatnonzero( empty ).tolist()]
+    return _blobtable( strs )
+
+
+def _floats( x ):
+    return np.asarray( x, dtype=float )
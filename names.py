@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+""" names.py: NameTable, compact row / col names for LP( rowname= colname= )
+    one utf-8 blob + int64 offsets, ~ 1 + 8 bytes per name plus the chars,
+    vs numpy unicode arrays, 4 bytes per char padded to the longest name.
+    NameTable.generated( "x%d", n ) allocates nothing.
+    names[j] -> str, names[mask or ix or slice] -> NameTable, names.index( "x3" ),
+    iter, len, np.asarray( names ) -> unicode array if you really want one.
+"""
+
+from __future__ import division, print_function
+import numpy as np
+from six import string_types
+
+_P = np.uint64( 1099511628211 )  # FNV prime, for the vectorized hash
+_raise = object()  # index() default: not found -> ValueError
+
+#...............................................................................
+class NameTable( object ):
+    """ names i = blob[ offsets[i] : offsets[i+1] ].decode( "utf-8" )
+        or generated: fmt % ix[i], ix None: fmt % i
+    """
+
+    def __init__( self, blob=None, offsets=None, fmt=None, n=0, ix=None ):
+        self.blob = blob  # uint8
+        self.offsets = offsets  # int64 n+1
+        self.fmt = fmt
+        self.ix = ix
+        self.n = len(offsets) - 1 if offsets is not None \
+            else len(ix) if ix is not None \
+            else n
+        self._hashes = None  # lazy, sorted, for index()
+
+    @classmethod
+    def generated( cls, fmt, n ):
+        """ fmt % 0 .. fmt % (n-1), nothing allocated """
+        return cls( fmt=fmt, n=n )
+
+    @classmethod
+    def from_names( cls, names ):
+        """ list or np.array of str, or a NameTable -> NameTable """
+        if isinstance( names, NameTable ):
+            return names
+        arr = np.asarray( names )
+        if arr.dtype.kind == "U" and arr.size > 0:  # vectorized
+            enc = np.char.encode( arr, "utf-8" )
+            lens = np.char.str_len( enc ).astype( np.int64 )
+            width = enc.dtype.itemsize
+            chars = enc.view( np.uint8 ).reshape( len(enc), width )
+            blob = chars[ np.arange( width ) < lens[:, None] ]
+        else:
+            enc = [_encode( nm ) for nm in names]
+            lens = np.array( [len(e) for e in enc], dtype=np.int64 )
+            blob = np.frombuffer( b"".join( enc ), dtype=np.uint8 )
+        return cls.from_bytes( blob, lens )
+
+    @classmethod
+    def from_bytes( cls, blob, lens ):
+        """ blob bytes or uint8, lens of each name """
+        if isinstance( blob, bytes ):
+            blob = np.frombuffer( blob, dtype=np.uint8 )
+        offsets = np.zeros( len(lens) + 1, dtype=np.int64 )
+        np.cumsum( lens, out=offsets[1:] )
+        return cls( blob=blob, offsets=offsets )
+
+    def __len__( self ):
+        return self.n
+
+    def __getitem__( self, j ):
+        if isinstance( j, (int, np.integer) ):
+            if j < 0:
+                j += self.n
+            if not 0 <= j < self.n:
+                raise IndexError( "NameTable index %d, len %d" % (j, self.n) )
+            if self.fmt is not None:
+                return self.fmt % (j if self.ix is None  else self.ix[j])
+            return self.blob[ self.offsets[j] : self.offsets[j+1] ].tobytes().decode( "utf-8" )
+        return self.take( j )
+
+    def take( self, j ):
+        """ slice, int array or bool mask -> NameTable """
+        if isinstance( j, slice ):
+            j = np.arange( self.n )[j]
+        j = np.asarray( j )
+        if j.dtype == bool:
+            assert len(j) == self.n, [len(j), self.n]
+            j = j.nonzero()[0]
+        elif j.size == 0:
+            j = j.astype( np.int64 )  # [] is float
+        if self.fmt is not None:
+            return NameTable( fmt=self.fmt, ix=j if self.ix is None  else self.ix[j] )
+        starts = self.offsets[j]
+        lens = self.offsets[j + 1] - starts
+        offsets = np.zeros( len(j) + 1, dtype=np.int64 )
+        np.cumsum( lens, out=offsets[1:] )
+        pos = np.repeat( starts - offsets[:-1], lens ) + np.arange( offsets[-1] )
+        return NameTable( blob=self.blob[pos], offsets=offsets )
+
+    def strings( self, j=None ):
+        """ -> np.array of str, all or [j] -- for the writers """
+        t = self if j is None  else self.take( j )
+        if t.fmt is not None:
+            ix = np.arange( t.n ) if t.ix is None  else t.ix
+            if t.fmt.count( "%" ) == 1 and t.fmt.endswith( "%d" ):  # "x%d" fast
+                return np.char.add( t.fmt[:-2], ix.astype( str ))
+            return np.array([ t.fmt % i for i in ix.tolist() ], dtype=str )
+        s = t.blob.tobytes()
+        return np.array([ s[i:k].decode( "utf-8" )
+                for i, k in zip( t.offsets[:-1].tolist(), t.offsets[1:].tolist() )],
+                dtype=str )
+
+    def tolist( self ):
+        return self.strings().tolist()
+
+    def __iter__( self ):
+        return iter( self.tolist() )
+
+    def __array__( self, dtype=None, copy=None ):
+        a = self.strings()
+        return a if dtype is None  else a.astype( dtype )
+
+    def __contains__( self, name ):
+        return self.index( name, default=None ) is not None
+
+    def index( self, name, default=_raise ):
+        """ name -> j;  not found: ValueError, like list.index, or default if given,
+            e.g. -1 as indices();  lazy hash index
+        """
+        j = self.indices( [name] )[0]
+        if j >= 0:
+            return j
+        if default is _raise:
+            raise ValueError( "%r not in NameTable" % name )
+        return default
+
+    def indices( self, names ):
+        """ list of names -> int array, -1 if not found, vectorized """
+        if self.fmt is not None:
+            return self._indices_generated( names )
+        if self._hashes is None:
+            h = _hash( self.blob, self.offsets )
+            order = np.argsort( h, kind="stable" )
+            self._hashes = (h[order], order)
+        hsorted, order = self._hashes
+        q = NameTable.from_names( names )
+        qh = _hash( q.blob, q.offsets )
+        lo = np.searchsorted( hsorted, qh, side="left" )
+        hi = np.searchsorted( hsorted, qh, side="right" )
+        out = np.full( len(q), -1, dtype=np.int64 )
+        for k in range( len(q) ):  # verify, collisions are rare
+            for j in order[ lo[k] : hi[k] ].tolist():
+                if self[j] == q[k]:
+                    out[k] = j
+                    break
+        return out
+
+    def _indices_generated( self, names ):
+        out = np.full( len(names), -1, dtype=np.int64 )
+        pre, post = self.fmt.split( "%d" ) if self.fmt.count( "%" ) == 1 \
+            and "%d" in self.fmt  else (None, None)
+        for k, nm in enumerate( names ):
+            if pre is None or not (nm.startswith( pre ) and nm.endswith( post )):
+                continue
+            num = nm[ len(pre) : len(nm) - len(post) ]
+            if not num.isdigit() or self.fmt % int(num) != nm:
+                continue
+            i = int(num)
+            if self.ix is None:
+                out[k] = i if i < self.n  else -1
+            else:
+                hit = np.flatnonzero( self.ix == i )
+                out[k] = hit[0] if len(hit)  else -1
+        return out
+
+    @property
+    def nbytes( self ):
+        if self.fmt is not None:
+            return 0 if self.ix is None  else self.ix.nbytes
+        return self.blob.nbytes + self.offsets.nbytes
+
+    def __repr__( self ):
+        head = ", ".join( repr( self[j] ) for j in range( min( self.n, 3 )))
+        return "NameTable( %d names: %s%s )" % (self.n, head, " ..." if self.n > 3  else "")
+
+
+def nametable( names ):
+    """ None | list | np.array | NameTable -> NameTable or None """
+    if names is None:
+        return None
+    return NameTable.from_names( names )
+
+
+#...............................................................................
+def _encode( name ):
+    if not isinstance( name, string_types ):
+        name = "" if name is None  else str( name )
+    return name.encode( "utf-8" )
+
+
+def _hash( blob, offsets ):
+    """ 64-bit polynomial hash of each name, vectorized over the blob """
+    lens = np.diff( offsets )
+    pos = np.arange( len(blob) ) - np.repeat( offsets[:-1], lens )
+    with np.errstate( over="ignore" ):
+        terms = (blob.astype( np.uint64 ) + np.uint64( 1 )) * np.power( _P, pos.astype( np.uint64 ))
+        h = np.zeros( len(lens), dtype=np.uint64 )
+        nonempty = lens > 0
+        if len(blob) > 0:
+            h[nonempty] = np.add.reduceat( terms, offsets[:-1][nonempty] )
+        h += lens.astype( np.uint64 ) * np.uint64( 0x9E3779B97F4A7C15 )
+    return h
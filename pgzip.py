@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+""" pgzip.py: parallel gzip, pigz-style -- blocks compressed on a thread pool,
+    written in order as a multi-member gzip stream that gunzip, zcat, GLPK read
+    with PGzipWriter( "big.lp.gz", level=6, workers=4 ) as f:
+        f.write( bytes ) ...
+    pgzip_file( "big.lp", "big.lp.gz" )  # e.g. after GLPK's lp.write
+    zlib releases the GIL, so threads compress in parallel.
+    Each block is a separate member, ~ 0.5 % bigger than one stream for 1M blocks.
+"""
+
+from __future__ import division, print_function
+from concurrent.futures import ThreadPoolExecutor
+import collections
+import gzip
+import os
+import shutil
+
+#...............................................................................
+class PGzipWriter( object ):
+    """ binary file-like: write() buffers `blocksize` bytes, then a worker compresses
+        the block to a gzip member; at most 2 * workers blocks in flight
+        workers None: os.cpu_count()
+    """
+
+    def __init__( self, outfile, level=6, workers=None, blocksize=1 << 20 ):
+        self.name = outfile
+        self.level = level
+        self.workers = workers or os.cpu_count() or 1
+        self.blocksize = blocksize
+        self.f = open( outfile, "wb" )
+        self.pool = ThreadPoolExecutor( self.workers )
+        self.pending = collections.deque()  # futures, in file order
+        self.buf = []
+        self.nbuf = 0
+        self.nin = self.nout = 0
+
+    def write( self, data ):
+        self.buf.append( bytes( data ))
+        self.nbuf += len(data)
+        self.nin += len(data)
+        if self.nbuf >= self.blocksize:
+            self._submit()
+        return len(data)
+
+    def close( self ):
+        if self.f.closed:
+            return
+        try:
+            if self.nbuf or self.nin == 0:  # gzip of b"" is a header, not 0 bytes
+                self._submit()
+            while self.pending:
+                self._put( self.pending.popleft().result() )
+        finally:
+            self.pool.shutdown()
+            self.f.close()
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, *exc ):
+        self.close()
+
+    def _submit( self ):
+        block = b"".join( self.buf )
+        self.buf, self.nbuf = [], 0
+        self.pending.append( self.pool.submit( gzip.compress, block, self.level ))
+        while len(self.pending) > 2 * self.workers:
+            self._put( self.pending.popleft().result() )
+
+    def _put( self, member ):
+        self.f.write( member )
+        self.nout += len(member)
+
+    @property
+    def closed( self ):
+        return self.f.closed
+
+
+def pgzip_file( infile, outfile, level=6, workers=None, blocksize=1 << 20, remove=False ):
+    """ infile -> outfile .gz, parallel; remove: delete infile after """
+    with open( infile, "rb" ) as f, \
+            PGzipWriter( outfile, level=level, workers=workers, blocksize=blocksize ) as g:
+        shutil.copyfileobj( f, g, blocksize )
+    if remove:
+        os.remove( infile )
+    return outfile
+
+
+def open_gz( outfile, level=6, workers=None ):
+    """ .gz -> PGzipWriter, workers 0: gzip.open, one thread; else plain, binary """
+    if not outfile.endswith( ".gz" ):
+        return open( outfile, "wb" )
+    if workers == 0:
+        return gzip.open( outfile, "wb", compresslevel=level )
+    return PGzipWriter( outfile, level=level, workers=workers )
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+""" portfolio.py: solve_portfolio( lp ), several solvers at once in processes, the first optimal wins
+    sol = solve_portfolio( lp, methods=["glpk-simplex", "glpk-interior", "highs-ds"] )
+    sol.method  # the winner, sol.obj sol.x sol.y sol.status sol.time
+    sol.results  # Bag( method status time ) of each, "killed" for the losers
+
+    The LP goes to a .glpz in a temp dir once; each worker memory-maps it, read_glpz,
+    so they share its pages -- no pickled copy per method.
+    The first result with status "opt" wins, the other workers are terminated (SIGTERM,
+    then SIGKILL), with GLPK or HiGHS deep in C there's no polite way.
+    A method that fails, "nofeas" "unbnd" or an exception, doesn't stop the others;
+    if none is optimal, sol.method is None and sol.status the last one's.
+    logfile=: append a line "problemname winner sec  method status sec ...",
+    to see which method wins on which models.
+
+    methods:
+        glpk-simplex glpk-interior: gnulp_solve( solver= )
+        glpk-dual: Solver( lp ).solve( meth="dualp" )
+        highs highs-ds highs-ipm: scipy linprog( method= ), y None
+    netlib: which wins varies by 10x model to model, see test/glpk-netlib.log
+"""
+
+from __future__ import division, print_function
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import traceback
+from queue import Empty
+
+import glp
+from glp.zutil import Bag
+
+methods_all = "glpk-simplex glpk-interior glpk-dual highs highs-ds highs-ipm".split()
+
+#...............................................................................
+def solve_portfolio( lp, methods=("glpk-simplex", "glpk-interior", "highs-ds", "highs-ipm"),
+                    workers=None, timeout=None, logfile=None, verbose=1 ):
+    """ LP -> Bag( obj x y status method time results ), the first optimal of methods, see above
+        workers: at most this many at once, default all methods
+        timeout: sec, then kill all, status "timeout"
+    """
+    for method in methods:
+        assert method in methods_all, method
+    workers = workers or len(methods)
+    tmpdir = tempfile.mkdtemp( prefix="portfolio" )
+    glpzfile = os.path.join( tmpdir, "lp.glpz" )
+    glp.write_glpz( glpzfile, lp, verbose=0 )  # once, each worker maps it
+    queue = multiprocessing.Queue()
+    todo = list( reversed( methods ))
+    running = dict()  # method -> Process
+    results = []
+    win = last = None
+    t0 = time.time()
+    try:
+        while (todo or running) and win is None:
+            while todo and len(running) < workers:
+                method = todo.pop()
+                p = multiprocessing.Process( target=_solve1, args=(glpzfile, method, queue),
+                        name="portfolio " + method, daemon=True )
+                p.start()
+                running[method] = p
+            try:
+                res = queue.get( timeout=.1 )
+            except Empty:
+                res = None
+            if res is None:
+                for method, p in list( running.items() ):  # died without a result, GLPK abort()
+                    if not p.is_alive() and queue.empty():
+                        p.join()
+                        running.pop( method )
+                        last = Bag( method=method, status="died", time=time.time() - t0,
+                                error="exitcode %s" % p.exitcode )
+                        results.append( last )
+                if timeout is not None and time.time() - t0 > timeout:
+                    break
+                continue
+            running.pop( res.method ).join()
+            res.time = time.time() - t0
+            results.append( Bag( method=res.method, status=res.status, time=res.time,
+                                error=res.error ))
+            if verbose:
+                print( "solve_portfolio %s: %s %s  %.2f sec" % (
+                        lp.problemname, res.method, res.status, res.time ))
+            last = res
+            if res.status == "opt":
+                win = res
+    finally:
+        for method, p in running.items():
+            _kill( p )
+            results.append( Bag( method=method, status="killed", time=time.time() - t0, error=None ))
+        for method in reversed( todo ):
+            results.append( Bag( method=method, status="not run", time=0, error=None ))
+        queue.close()
+        shutil.rmtree( tmpdir, ignore_errors=True )
+
+    secs = time.time() - t0
+    if win is not None:
+        sol = Bag( win, time=secs, results=results )
+    else:
+        status = "timeout" if running  else last.status if last is not None  else "none"
+        sol = Bag( obj=None, x=None, y=None, status=status, method=None,
+                time=secs, results=results )
+    if verbose:
+        print( "solve_portfolio %s: %s won, %s  %.2f sec  %s" % (
+                lp.problemname, sol.method, sol.status, secs,
+                "  ".join( "%s %s %.2f" % (r.method, r.status, r.time) for r in results )))
+    if logfile:
+        with open( logfile, "a" ) as f:
+            f.write( "%s\t%s %.3f\t%s\n" % (lp.problemname, sol.method, secs,
+                    "  ".join( "%s %s %.3f" % (r.method, r.status, r.time) for r in results )))
+    return sol
+
+
+#...............................................................................
+def _solve1( glpzfile, method, queue ):
+    """ in a worker: read_glpz, solve -> queue Bag( method obj x y status error ) """
+    res = Bag( method=method, obj=None, x=None, y=None, status="error", error=None )
+    try:
+        lp = glp.read_glpz( glpzfile, verbose=0 )
+        if method.startswith( "glpk" ):
+            if method == "glpk-dual":
+                sol = glp.Solver( lp, verbose=0 ).solve( meth="dualp" )
+            else:
+                gnulp = glp.lp_to_gnulp( lp, verbose=0 )
+                sol = glp.gnulp_solve( gnulp, solver=method.split( "-" )[1], verbose=0 )
+            res.update( obj=sol.obj, x=sol.x, y=sol.y, status=sol.status )
+        else:
+            from scipy.optimize import linprog
+            _, linrec = glp.lp_to_linprog( lp, verbose=0 )
+            r = linprog( method=method, **linrec )
+            sign = -1 if lp.maximize  else 1
+            res.update( obj=None if r.x is None  else sign * r.fun, x=r.x,
+                    status=_linprog_status.get( r.status, "fail" ))
+    except Exception:
+        res.error = traceback.format_exc()
+    queue.put( res )
+
+_linprog_status = {0: "opt", 1: "itlim", 2: "nofeas", 3: "unbnd"}  # scipy linprog .status
+
+
+def _kill( p, wait=1 ):
+    """ SIGTERM, then SIGKILL if still there """
+    p.terminate()
+    p.join( wait )
+    if p.is_alive():
+        p.kill()
+        p.join()
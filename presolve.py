@@ -0,0 +1,238 @@
+#!/usr/bin/env python
+""" presolve.py: LP -> a smaller LP, and back
+    lpr, post = presolve( lp )
+    sol = gnulp_solve( lp_to_gnulp( lpr ))  # or lp_to_linprog( lpr ) -> linprog
+    full = postsolve( post, sol.x, sol.y )  # -> Bag( x y obj ) of the original lp
+
+    Reductions, repeated until none apply, each pass whole-array numpy / scipy.sparse:
+        empty and free rows: dropped, after a feasibility check
+        fixed columns lb == ub: x = lb, b blo -= A x, dropped
+        empty columns: x = the bound that c likes, dropped
+        singleton rows blo <= a x_j <= b: -> bounds on x_j, dropped
+        redundant rows: the activity range from lb ub is inside blo .. b, dropped
+        forcing rows: activity range min == b or max == blo: every x_j at a bound, dropped
+    post.reductions counts them; post.status "ok" "infeasible" "unbounded";
+    post.objoffset is c x of the columns dropped, obj = lpr's obj + objoffset.
+
+    Duals: y here are as in gnulp_solve, reduced costs d = c - A'y.
+    postsolve puts y = 0 on dropped rows, then, newest reduction first,
+    gives a singleton row the d_j of its column if the bound it made is the active one,
+    and a forcing row the y that keeps the signs of its columns' d_j right
+    (Andersen + Andersen, "Presolving in linear programming", 1995).
+"""
+
+from __future__ import division, print_function
+import numpy as np
+from numpy import inf
+
+import glp
+from glp.compact import scipy_A
+from glp.names import nametable
+from glp.zutil import Bag
+
+_kinds = "emptyrows freerows fixedcols emptycols singletonrows tightened " \
+        "redundantrows forcingrows".split()
+
+#...............................................................................
+def presolve( lp, maxpass=100, tol=1e-9, verbose=1 ):
+    """ LP -> lpr, post: a smaller LP, the record for postsolve, see above """
+    A = scipy_A( lp.A ).tocsr()
+    m, n = A.shape
+    if not A.has_canonical_format or np.count_nonzero( A.data ) < A.nnz:
+        A = A.copy()  # not the caller's
+        A.sum_duplicates()
+        A.eliminate_zeros()
+    C = A.tocsc()
+    P = A.copy()  # pattern, for the counts
+    P.data[:] = 1
+    sign = -1 if lp.maximize  else 1
+    c = sign * np.asarray( lp.c, dtype=float )  # minimize inside
+    b = np.array( lp.b, dtype=float )
+    blo = np.array( lp.blo, dtype=float )
+    lb = np.array( lp.lb, dtype=float )
+    ub = np.array( lp.ub, dtype=float )
+    rowlive = np.ones( m, dtype=bool )
+    collive = np.ones( n, dtype=bool )
+    xfix = np.zeros( n )
+    stack = []  # ("single", rows cols a lbset ubset) ("forcing", rows k cols a up) ...
+    count = Bag( (k, 0) for k in _kinds )
+    status = "ok"
+
+    def bad( what, ix ):
+        if verbose:
+            print( "presolve %s: %s %s" % (lp.problemname, what, ix[:10] ))
+        return what.split()[0]
+
+    for npass in range( 1, maxpass + 1 ):
+        nred = sum( count.values() )
+        rowcount = P.dot( collive.astype( float )) * rowlive
+        colcount = P.T.dot( rowlive.astype( float )) * collive
+
+            # empty rows, free rows
+        empty = rowlive & (rowcount == 0)
+        if empty.any():
+            i = (empty & ((blo > tol) | (b < - tol))).nonzero()[0]
+            if len(i):
+                status = bad( "infeasible empty rows", i )
+                break
+            rowlive[empty] = False
+            count.emptyrows += empty.sum()
+        free = rowlive & (blo == - inf) & (b == inf)
+        if free.any():
+            rowlive[free] = False
+            count.freerows += free.sum()
+
+            # fixed columns: x = lb, b blo -= A x
+        fixed = collive & (lb == ub)
+        if fixed.any():
+            j = fixed.nonzero()[0]
+            xfix[j] = lb[j]
+            Ax = C[:, j].dot( lb[j] )
+            b -= Ax
+            blo -= Ax
+            collive[j] = False
+            count.fixedcols += len(j)
+
+            # empty columns: x = the bound c likes
+        empty = collive & (colcount == 0)
+        if empty.any():
+            j = empty.nonzero()[0]
+            x = np.where( c[j] > 0, lb[j], np.where( c[j] < 0, ub[j],
+                    np.where( np.isfinite( lb[j] ), lb[j], np.where( np.isfinite( ub[j] ), ub[j], 0 ))))
+            if not np.isfinite( x ).all():
+                status = bad( "unbounded empty columns", j[ ~ np.isfinite( x )] )
+                break
+            xfix[j] = x
+            collive[j] = False
+            count.emptycols += len(j)
+
+        if status == "ok" and sum( count.values() ) > nred:
+            continue  # recount before the rows
+
+            # singleton rows: blo <= a x_j <= b -> bounds on x_j
+        single = rowlive & (rowcount == 1)
+        if single.any():
+            rows = single.nonzero()[0]
+            S = A[rows].tocoo()
+            live = collive[S.col]
+            r, j, a = rows[S.row[live]], S.col[live], S.data[live]
+            lo = np.where( a > 0, blo[r], b[r] ) / a
+            hi = np.where( a > 0, b[r], blo[r] ) / a
+            lbset = _tighten( j, lo, lb, +1 )  # the row that sets each new lb
+            ubset = _tighten( j, hi, ub, -1 )
+            infeas = (lb[j] > ub[j] + tol * (1 + abs( ub[j] )))
+            if infeas.any():
+                status = bad( "infeasible singleton rows", r[infeas] )
+                break
+            near = lb > ub  # within tol
+            lb[near] = ub[near]
+            stack.append( ("single", r, j, a, lbset, ubset) )
+            rowlive[r] = False
+            count.singletonrows += len(r)
+            count.tightened += lbset.sum() + ubset.sum()
+            continue
+
+            # activity ranges from lb ub: redundant rows, forcing rows
+        live = collive.astype( float )
+        Apos = A.multiply( A > 0 ).tocsr()
+        Aneg = A.multiply( A < 0 ).tocsr()
+        lbz = np.where( collive, lb, 0 )
+        ubz = np.where( collive, ub, 0 )
+        with np.errstate( invalid="ignore" ):
+            actmin = Apos.dot( lbz ) + Aneg.dot( ubz )
+            actmax = Apos.dot( ubz ) + Aneg.dot( lbz )
+        actmin[ np.isnan( actmin )] = - inf  # 0 * inf
+        actmax[ np.isnan( actmax )] = inf
+        rtol = tol * (1 + np.abs( np.where( np.isfinite( b ), b, 0 )))
+        rtollo = tol * (1 + np.abs( np.where( np.isfinite( blo ), blo, 0 )))
+        infeas = rowlive & ((actmin > b + rtol) | (actmax < blo - rtollo))
+        if infeas.any():
+            status = bad( "infeasible rows", infeas.nonzero()[0] )
+            break
+        redundant = rowlive & (actmin >= blo - rtollo) & (actmax <= b + rtol)
+        rowlive[redundant] = False
+        count.redundantrows += redundant.sum()
+        up = rowlive & np.isfinite( actmin ) & (actmin >= b - rtol)  # all at the min
+        down = rowlive & ~ up & np.isfinite( actmax ) & (actmax <= blo + rtollo)
+        forcing = up | down
+        if forcing.any():
+            rows = forcing.nonzero()[0]
+            S = A[rows].tocoo()
+            live = collive[S.col]
+            k, j, a = S.row[live], S.col[live], S.data[live]  # k: index in rows
+            x = np.where( (a > 0) == up[rows][k], lb[j], ub[j] )
+            lb[j] = ub[j] = x  # fixed next pass
+            if (lb[j] != x).any():  # 2 forcing rows, one col at both bounds
+                status = bad( "infeasible forcing rows", rows[ np.unique( k[lb[j] != x] )] )
+                break
+            stack.append( ("forcing", rows, k, j, a, up[rows]) )
+            rowlive[rows] = False
+            count.forcingrows += len(rows)
+        if sum( count.values() ) == nred:
+            break
+
+        # the reduced LP
+    rows, cols = rowlive.nonzero()[0], collive.nonzero()[0]
+    objoffset = sign * c.dot( xfix )
+    lpr = glp.LP( A=A[rows][:, cols], b=b[rows], blo=blo[rows], c=lp.c[cols],
+            lb=lb[cols], ub=ub[cols], problemname=lp.problemname + "-presolved",
+            maximize=lp.maximize,
+            rowname=_take( lp.get( "rowname" ), rows ), colname=_take( lp.get( "colname" ), cols ),
+            mipvars=None if lp.get( "mipvars" ) is None  else np.asarray( lp.mipvars )[cols],
+            verbose=0 )
+    post = Bag( A=A, C=C, c=c, sign=sign, rows=rows, cols=cols, xfix=xfix, stack=stack,
+                objoffset=objoffset, status=status, reductions=count, npass=npass,
+                shape=(m, n) )
+    if verbose:
+        print( "presolve %s: %s -> %s  %s  %d passes  %s" % (
+                lp.problemname, A.shape, lpr.A.shape, status, npass,
+                "  ".join( "%d %s" % (v, k) for k, v in count.items() if v )))
+    return lpr, post
+
+
+def postsolve( post, x, y=None ):
+    """ post from presolve, x y of the reduced LP -> Bag( x y obj ) of the original """
+    m, n = post.shape
+    xfull = post.xfix.copy()
+    xfull[post.cols] = x
+    obj = post.sign * post.c.dot( xfull )
+    if y is None:
+        return Bag( x=xfull, y=None, obj=obj )
+    yfull = np.zeros( m )
+    yfull[post.rows] = post.sign * np.asarray( y )  # minimize inside
+    C, c = post.C, post.c
+    for red in reversed( post.stack ):
+        if red[0] == "single":
+            _, r, j, a, lbset, ubset = red
+            d = c[j] - C[:, j].T.dot( yfull )  # without these rows, y 0
+            give = (lbset & (d > 0)) | (ubset & (d < 0))
+            yfull[r[give]] = d[give] / a[give]
+        else:
+            _, rows, k, j, a, up = red
+            d = c[j] - C[:, j].T.dot( yfull )
+            dmin = np.full( len(rows), inf )
+            dmax = np.full( len(rows), - inf )
+            np.minimum.at( dmin, k, d / a )
+            np.maximum.at( dmax, k, d / a )
+            yfull[rows] = np.where( up, np.minimum( 0, dmin ), np.maximum( 0, dmax ))
+    return Bag( x=xfull, y=post.sign * yfull, obj=obj )
+
+
+#...............................................................................
+def _tighten( j, bound, lbub, more ):
+    """ col j <- bound if tighter, in place; -> bool, this row set the col's new bound
+        several rows on one col: the tightest wins
+    """
+    order = np.lexsort(( more * bound, j ))  # each col's tightest last
+    last = np.r_[ j[order][1:] != j[order][:-1], True ]
+    win = np.zeros( len(j), dtype=bool )
+    best = order[last]
+    tighter = more * bound[best] > more * lbub[j[best]]
+    win[ best[tighter] ] = True
+    lbub[ j[win] ] = bound[win]
+    return win
+
+
+def _take( names, ix ):
+    names = nametable( names )
+    return None if names is None  else names.take( ix )
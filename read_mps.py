@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+""" read_mps.py: free MPS file -> LP( A b c ... ) without GLPK, numpy all the way
+    lp = load_lp( "my.mps.gz", engine="native" )
+    same LP as glpk.LPX( freemps= ) -> gnulp_to_lp, a lot faster on big files
+"""
+    # MPS format: glpk.pdf appendix B, http://lpsolve.sourceforge.net/5.5/mps-format.htm
+
+from __future__ import division, print_function
+import gzip
+import numpy as np
+from scipy import sparse
+
+import glp
+from glp.names import nametable
+from glp.tracing import traced
+from numpy import inf
+
+#...............................................................................
+@traced
+def read_mps( mpsfile, drop_uncon=True, chunk=1 << 16, verbose=1 ):
+    """ free MPS file [.gz] -> LP( A b c blo lb ub rowname colname ), like gnulp_to_lp
+        COLUMNS are parsed in chunks of `chunk` lines, vectorized:
+            row names -> indices with searchsorted, values with one astype(float),
+            straight into preallocated index / value buffers -> csc -> csr.
+        As in GLPK: the first N row is the objective, other N rows are dropped,
+        an RHS on the objective row is ignored,
+        integer columns (MARKER INTORG .. INTEND) default to 0 <= x <= 1.
+    """
+    name = None
+    rownames, rowtypes = [], []
+    rows = cols = None  # _Rows _Columns after ROWS
+    section = None
+    lines = []  # COLUMNS chunk
+
+    with _open_text( mpsfile ) as f:
+        for line in f:
+            if not line.strip() or line.startswith( "*" ):
+                continue
+            if " $" in line:  # GLPK: " x r1 0 $ empty column"
+                line = line[ : line.index( " $" )] + "\n"
+            if line[0] not in " \t":  # section header
+                if lines:
+                    cols.add( lines )
+                    lines = []
+                words = line.split()
+                section = words[0]
+                if section == "NAME":
+                    name = words[1] if len(words) > 1  else None
+                elif section == "COLUMNS":
+                    rows = _Rows( rownames, rowtypes )
+                    cols = _Columns( rows )
+                elif section == "ENDATA":
+                    break
+                else:
+                    assert section in ("ROWS", "RHS", "RANGES", "BOUNDS"), \
+                        "%s: unknown MPS section %r" % (mpsfile, line)
+                continue
+
+            if section == "COLUMNS":
+                if "'MARKER'" in line:  # 'INTORG' 'INTEND'
+                    if lines:
+                        cols.add( lines )
+                        lines = []
+                    cols.intvar = "'INTORG'" in line
+                    continue
+                lines.append( line )
+                if len(lines) >= chunk:
+                    cols.add( lines )
+                    lines = []
+            elif section == "ROWS":
+                rowtype, rowname = line.split()
+                rowtypes.append( rowtype )
+                rownames.append( rowname )
+            elif section in ("RHS", "RANGES"):
+                rows.rhs_ranges( section, line.split() )
+            elif section == "BOUNDS":
+                cols.bound( line.split() )
+            else:
+                assert 0, "%s: data before section header: %r" % (mpsfile, line)
+
+    if lines:
+        cols.add( lines )
+    assert cols is not None, "%s: no COLUMNS section" % mpsfile
+
+    A, c, colname = cols.matrix()
+    b, blo, rowname = rows.bounds()
+    if drop_uncon:
+        A, b, blo, rowname = glp.lp_gnu.drop_unconstrained_rows(
+                A, b, blo, rowname, name, verbose=verbose )
+
+    return glp.LP( A=A, b=b, c=c, blo=blo, lb=cols.lb, ub=cols.ub,
+            problemname=name, rowname=nametable( rowname ), colname=nametable( colname ),
+            maximize=False,  # MPS has no sense, as in GLPK
+            verbose=verbose )
+
+
+#...............................................................................
+class _Rows( object ):
+    """ ROWS RHS RANGES: names, types -> b blo, free rows dropped """
+
+    def __init__( self, rownames, rowtypes ):
+        self.names = np.array( rownames )
+        self.types = np.array( rowtypes )
+        nrow = len(rownames)
+        jN = (self.types == "N").nonzero()[0]
+        self.objrow = jN[0] if len(jN) > 0  else -1
+        keep = self.types != "N"
+        self.rowmap = np.full( nrow, -1, dtype=np.int32 )  # ROWS index -> A row
+        self.rowmap[keep] = np.arange( keep.sum() )
+        self.keep = keep
+        self.sorter = np.argsort( self.names )
+        self.sorted = self.names[self.sorter]
+        self.index = None  # name -> ROWS index, for RHS RANGES
+        self.rhs = np.zeros( nrow )
+        self.range = np.full( nrow, np.nan )
+        self.setname = dict()  # first RHS / RANGES vector only
+
+    def lookup( self, names ):
+        """ array of row names -> ROWS indices, vectorized """
+        j = np.searchsorted( self.sorted, names )
+        j[j == len(self.sorted)] = 0
+        bad = self.sorted[j] != names
+        assert not bad.any(), "MPS: row %r not found" % names[bad][0]
+        return self.sorter[j]
+
+    def rhs_ranges( self, section, words ):
+        """ RHS / RANGES line: setname row val [row val] ... """
+        setname = self.setname.setdefault( section, words[0] )
+        if words[0] != setname:
+            return
+        if self.index is None:
+            self.index = dict( zip( self.names.tolist(), range( len(self.names) )))
+        x = self.rhs if section == "RHS"  else self.range
+        for rowname, val in zip( words[1::2], words[2::2] ):
+            x[ self.index[rowname] ] = float( val )
+
+    def bounds( self ):
+        """ -> b blo rowname, N rows dropped """
+        types, rhs, rng = self.types, self.rhs, self.range
+        b = np.where( types == "G", inf, rhs )
+        blo = np.where( types == "L", - inf, rhs )
+        jr = ~ np.isnan( rng )
+        absr = np.abs( rng )
+        jl = jr & (types == "L")
+        blo[jl] = rhs[jl] - absr[jl]
+        jg = jr & ((types == "G") | ((types == "E") & (rng > 0)))
+        b[jg] = rhs[jg] + absr[jg]
+        je = jr & (types == "E") & (rng < 0)
+        blo[je] = rhs[je] - absr[je]
+        keep = self.keep
+        return b[keep], blo[keep], self.names[keep]
+
+
+class _Columns( object ):
+    """ COLUMNS BOUNDS -> growing row-index / col-index / value buffers -> A c lb ub """
+
+    def __init__( self, rows, nnz=1 << 16 ):
+        self.rows = rows
+        self.intvar = False
+        self.names = []  # chunk arrays
+        self.intcols = []
+        self.ncol = 0
+        self.lastname = None
+        self.nnz = 0
+        self.rowind = np.empty( nnz, dtype=np.int32 )
+        self.colind = np.empty( nnz, dtype=np.int32 )
+        self.data = np.empty( nnz )
+        self.cj = []  # objective (colind, val) chunks
+        self.lb = self.ub = self.index = None
+
+    def add( self, lines ):
+        """ a chunk of COLUMNS lines: colname row val [row val] ... """
+        words = [line.split() for line in lines]
+        nword = np.fromiter( map( len, words ), dtype=np.int64, count=len(words) )
+        flat = np.array( [w for line in words for w in line] )
+        start = np.cumsum( nword ) - nword
+        colname = flat[start]
+        npair = (nword - 1) // 2
+        assert (nword == 2 * npair + 1).all(), \
+            "MPS COLUMNS: odd line %r" % lines[ (nword != 2 * npair + 1).argmax() ]
+
+            # new column where the name changes, continue the last chunk's
+        new = np.r_[ colname[0] != self.lastname, colname[1:] != colname[:-1] ]
+        newnames = colname[new]
+        linecol = self.ncol - 1 + np.cumsum( new )
+        self.names.append( newnames )
+        self.intcols.append( np.full( len(newnames), self.intvar ))
+        self.ncol += len(newnames)
+        self.lastname = colname[-1]
+
+            # pairs -> ROWS index, val
+        line = np.repeat( np.arange( len(words) ), npair )
+        k = np.arange( len(line) ) - np.repeat( np.cumsum( npair ) - npair, npair )
+        jrow = start[line] + 1 + 2 * k
+        row = self.rows.lookup( flat[jrow] )
+        val = flat[jrow + 1].astype( float )
+        col = linecol[line]
+
+        jobj = row == self.rows.objrow
+        if jobj.any():
+            self.cj.append( (col[jobj], val[jobj]) )
+        arow = self.rows.rowmap[row]
+        keep = (arow >= 0) & (val != 0)
+        self._append( arow[keep], col[keep], val[keep] )
+
+    def _append( self, row, col, val ):
+        n = self.nnz + len(row)
+        if n > len(self.data):  # grow x2, amortized
+            size = max( n, 2 * len(self.data) )
+            self.rowind = _grow( self.rowind, size )
+            self.colind = _grow( self.colind, size )
+            self.data = _grow( self.data, size )
+        self.rowind[self.nnz:n] = row
+        self.colind[self.nnz:n] = col
+        self.data[self.nnz:n] = val
+        self.nnz = n
+
+    def _init_bounds( self ):
+        if self.lb is None:
+            self.colname = np.concatenate( self.names )
+            intcol = np.concatenate( self.intcols )
+            self.lb = np.zeros( self.ncol )
+            self.ub = np.where( intcol, 1., inf )  # GLPK: int 0 .. 1
+            assert len( np.unique( self.colname )) == self.ncol, \
+                "MPS COLUMNS: a column is split, not contiguous"
+
+    def bound( self, words ):
+        """ BOUNDS line: type setname colname [val] """
+        self._init_bounds()
+        if self.index is None:
+            self.index = dict( zip( self.colname.tolist(), range( self.ncol )))
+            self.setname = words[1]
+        if words[1] != self.setname:
+            return
+        typ = words[0]
+        j = self.index[ words[2] ]
+        val = float( words[3] ) if len(words) > 3  else None
+        if typ in ("UP", "UI", "SC"):   self.ub[j] = val
+        elif typ in ("LO", "LI"):       self.lb[j] = val
+        elif typ == "FX":               self.lb[j] = self.ub[j] = val
+        elif typ == "FR":               self.lb[j], self.ub[j] = - inf, inf
+        elif typ == "MI":               self.lb[j] = - inf
+        elif typ == "PL":               self.ub[j] = inf
+        elif typ == "BV":               self.lb[j], self.ub[j] = 0, 1
+        else:
+            assert 0, "MPS BOUNDS: unknown type %r" % typ
+
+    def matrix( self ):
+        """ -> A csr, c, colname """
+        self._init_bounds()
+        n = self.nnz
+        counts = np.bincount( self.colind[:n], minlength=self.ncol )
+        indptr = np.r_[ 0, np.cumsum( counts ) ]
+        nrow = self.rows.keep.sum()
+        A = sparse.csc_matrix(  # columns are contiguous in MPS
+                (self.data[:n], self.rowind[:n], indptr), shape=(nrow, self.ncol) )
+        c = np.zeros( self.ncol )
+        for col, val in self.cj:
+            c += np.bincount( col, weights=val, minlength=self.ncol )
+        return A.tocsr(), c, self.colname
+
+
+def _grow( x, size ):
+    y = np.empty( size, dtype=x.dtype )
+    y[:len(x)] = x
+    return y
+
+
+def _open_text( filename ):
+    """ .gz streams through gzip """
+    if filename.endswith( ".gz" ):
+        return gzip.open( filename, "rt" )
+    return open( filename )
@@ -2,92 +2,255 @@
 """ save_lp.py  28oct 2019 _write_amplmod """
 
 from __future__ import division, print_function
+import os
 import numpy as np
-from scipy import sparse as sp
 
 import glp
+from glp.names import NameTable, nametable
 from glp.zutil import Bag
 from glp.load_lp import _gnufiletype
+from glp.pgzip import open_gz, pgzip_file
 
 #...............................................................................
-def save_lp( outfile, lp, verbose=1 ):
-    """ LP() or gnulp -> outfile .lp .mps ... """
-    if outfile.endswith( ".mod" ):
-        return _write_amplmod( outfile, lp, verbose=verbose )
+def save_lp( outfile, lp, engine="glpk", gzlevel=6, gzworkers=None, verbose=1 ):
+    """ LP() or gnulp -> outfile .lp .mps ...
+        .glpz: raw arrays, memory-mapped by load_lp, see glpz.py
+        .mod [.gz]: ampl / gmpl, numpy row blocks, no gnulp
+        engine="native", LP() -> .lp .mps [.gz]: numpy writers, no gnulp,
+            see lpwriters.py; .glp and gnulps go through GLPK
+        .gz: parallel gzip, gzworkers threads (None: all cores), see pgzip.py;
+            GLPK writes a plain temp file first.
+            gzworkers=0: one thread, as before -- gzip.open, GLPK's own gzip
+    """
+    assert engine in "glpk native ".split(), engine
+    gz = dict( gzlevel=gzlevel, gzworkers=gzworkers )
+    if outfile.endswith( ".glpz" ):
+        return glp.write_glpz( outfile, lp, verbose=verbose )
+    if outfile.endswith( (".mod", ".mod.gz") ):
+        return _write_amplmod( outfile, lp, verbose=verbose, **gz )
+    if engine == "native" and isinstance( lp, Bag ):
+        f = outfile.replace( ".gz", "" )
+        if f.endswith( ".lp" ):
+            return glp.write_cpxlp( outfile, lp, verbose=verbose, **gz )
+        if f.endswith( ".mps" ):
+            return glp.write_freemps( outfile, lp, verbose=verbose, **gz )
     if isinstance( lp, Bag ):  # lprec
         lp = glp.lp_to_gnulp( lp )
     # assert isinstance( lp, glpk.LPX )
+    if outfile.endswith( ".gz" ) and gzworkers != 0:
+        plain = outfile[:-3] + ".tmp%d" % os.getpid()  # no .gz: GLPK writes it plain
+        kind, _ = _gnufiletype( outfile ).popitem()
+        try:
+            lp.write( **{kind: plain} )
+            pgzip_file( plain, outfile, level=gzlevel, workers=gzworkers )
+        finally:
+            if os.path.exists( plain ):
+                os.remove( plain )
+        return lp
     lp.write( **_gnufiletype( outfile ))  # .lp .mps .glp
     return lp
 
 
-def _write_amplmod( outfile, lp, header="", footer="end;", verbose=1 ):
-    """ LP( A b c ... ) -> ampl .mod, v similar to .lp cplex """
+def _write_amplmod( outfile, lp, header="", footer="end;", block=1 << 18,
+                    near0=1e-10, gzlevel=6, gzworkers=None, verbose=1 ):
+    """ LP( A b c ... ) -> ampl .mod [.gz], v similar to .lp cplex
+        vectorized: each block of rows, ~ `block` nonzeros, is formatted at once --
+        coefficients once per unique value, names gathered from a NameTable blob --
+        into one bytes buffer, written sequentially
+    """
         # a tiny subset of .mod, can ampl read .lp ?
     assert lp.rowname is not None
     assert lp.colname is not None
-    f = open( outfile, "w" )
+    A = lp.A.tocsr()
     if verbose:
         print( "write_modfile: %s  A %s nnz %d" % (
-                outfile, lp.A.shape, lp.A.nnz) )
-
-    def pr( *args ):
-        print( *args, end="", file=f )
-
-    if header:
-        pr( header + "\n" )
-    pr( "# problem %s;\n" % lp.problemname )  # not glpsol
-    for varname, lb, ub in zip( lp.colname, lp.lb, lp.ub ):
-        pr( "var %s >= %g" % (varname, lb) )  # "varname" ?
-        if ub != np.inf:
-            pr( ", <= %g" %  ub )
-        pr( ";\n" )
-    pr( "maximize" if lp.maximize else "minimize", " obj:" )  # lp.objectivename ?
-    pr( _sumstr( lp.c, names=lp.colname ))  # sum c_j * x_j
-    pr( " ;\n" )
-    pr( "subject to \n" )
-    A = lp.A.tocsr()
+                outfile, A.shape, A.nnz) )
+    colnames = _blobtable( lp.colname )
+    rownames = _blobtable( lp.rowname )
+    m, n = A.shape
 
-    for Arow, rowname, b, blo in zip(
-            A, lp.rowname, lp.b, lp.blo ):
-        pr( "%s: " % rowname )
-        rowsum = _sumstr( Arow, names=lp.colname )  # sum Aij * xj
-        if b == blo:
-            pr( "%s = %g ;\n" % (rowsum, b) )
-            continue
-        if np.isfinite( b ):
-            pr( "%s <= %g ;\n" % (rowsum, b) )
-        if np.isfinite( blo ):
-            if np.isfinite( b ):
-                pr( "%s_: " % rowname )  # both: row <=  row_ >=
-            pr( "%s >= %g ;\n" % (rowsum, blo) )
-    if footer:
-        pr( footer + "\n" )
-    f.close()
-
-
-def _sumstr( x, ix=None, names=None, near0=1e-10, fmt=" %+.6g*" ):
-    """ [2, -3, 1, -1]
-    -> " +2*x0 -3*x1 +x2 -x3"
-    ix=[1, 3]: " -3*x1 -x3"
+    with _open_out( outfile, gzlevel, gzworkers ) as f:
+        if header:
+            f.write( (header + "\n").encode( "utf-8" ))
+        f.write( ("# problem %s;\n" % lp.problemname).encode( "utf-8" ))  # not glpsol
+
+            # var name >= lb[, <= ub];
+        for j0 in range( 0, n, block ):
+            j = np.arange( j0, min( j0 + block, n ))
+            lbtab, lbix = _numtable( lp.lb[j0 : j0 + block] )
+            ub = lp.ub[j0 : j0 + block]
+            ubtab, ubix = _numtable( ub, fmt=", <= %g" )
+            ubix[ ub == np.inf ] = len(ubtab[1]) - 2  # the "" at the end
+            k = len(j)
+            pre = (np.array([ _CONST, _COL, _CONST, _NUM, _NUM2, _CONST ]),
+                    np.c_[ np.full( k, _c_var ), j, np.full( k, _c_ge ), lbix, ubix,
+                            np.full( k, _c_semi ) ])
+            f.write( _catlines( [_consts, None, colnames, None, lbtab, ubtab],
+                    pre, np.zeros( k, dtype=np.int64 )))
+
+            # minimize  obj: +2*x0 -3*x1 ... ;
+        c = np.asarray( lp.c, dtype=float )
+        keep = np.flatnonzero( np.abs( c ) > near0 )
+        coeftab, coefix = _coeftable( c[keep] )
+        pre = ([_CONST], [[ _c_max if lp.maximize  else _c_min ]])
+        f.write( _catlines( [_consts, coeftab, colnames],
+                pre, [len(keep)], ([_COEF, _COL], np.c_[ coefix, keep ]),
+                ([_CONST], [[ _c_end ]]) ))
+        f.write( b"subject to \n" )
+
+            # row: sum Aij * xj = b ;  <= b ;  >= blo ;  both: row <=  row_ >=
+        for r0, r1 in _blocks( A.indptr, block ):
+            f.write( _rowblock( A, lp.b, lp.blo, r0, r1, colnames, rownames, near0 ))
+
+        if footer:
+            f.write( (footer + "\n").encode( "utf-8" ))
+
+
+def _rowblock( A, bvec, blovec, r0, r1, colnames, rownames, near0 ):
+    """ rows r0 .. r1 -> bytes, a line per = <= >=, 2 lines for two-sided rows """
+    b = np.asarray( bvec[r0:r1], dtype=float )
+    blo = np.asarray( blovec[r0:r1], dtype=float )
+    eq = b == blo
+    le = np.isfinite( b ) & ~ eq
+    ge = np.isfinite( blo ) & ~ eq
+        # free rows, neither: nothing, drop_unconstrained_rows drops them anyway
+    nline = eq.astype( np.int64 ) + le + ge
+    row = np.repeat( np.arange( r1 - r0 ), nline )
+    second = np.zeros( len(row), dtype=bool )  # row_ >=
+    second[ np.cumsum( nline )[ nline == 2 ] - 1 ] = True
+    op = np.where( eq[row], _c_eq, np.where( le[row] & ~ second, _c_le, _c_ge ))
+    rhs = np.where( op == _c_ge, blo[row], b[row] )
+
+        # nonzeros of the block, near0 dropped
+    lo, hi = A.indptr[r0], A.indptr[r1]
+    data = A.data[lo:hi]
+    keep = np.abs( data ) > near0
+    cols = A.indices[lo:hi][keep]
+    rowid = np.repeat( np.arange( r1 - r0 ), np.diff( A.indptr[r0:r1+1] ))
+    rowcnt = np.bincount( rowid[keep], minlength=r1 - r0 )
+    rowstart = np.cumsum( rowcnt ) - rowcnt
+    coeftab, coefix = _coeftable( data[keep] )
+
+        # each line repeats its row's terms
+    cnt = rowcnt[row]
+    t = np.repeat( rowstart[row] - (np.cumsum( cnt ) - cnt), cnt ) + np.arange( cnt.sum() )
+    rhstab, rhsix = _numtable( rhs )
+    k = len(row)
+    pre = ([_ROW, _CONST, _CONST],
+            np.c_[ row + r0, np.where( second, _c_under, _c_empty ), np.full( k, _c_colon ) ])
+    post = ([_CONST, _NUM, _CONST], np.c_[ op, rhsix, np.full( k, _c_end ) ])
+    return _catlines( [_consts, coeftab, colnames, rownames, rhstab],
+            pre, cnt, ([_COEF, _COL], np.c_[ coefix[t], cols[t] ]), post )
+
+
+#...............................................................................
+    # string tables: (blob uint8, offsets int64 n+1), entry i = blob[ o[i] : o[i+1] ]
+_CONST, _COEF, _COL, _ROW, _NUM, _NUM2 = range( 6 )  # table numbers in _catlines
+_constlist = ["", "_", ": ", "var ", " >= ", ";\n", " ;\n", " = ", " <= ",
+                "minimize  obj:", "maximize  obj:"]
+(_c_empty, _c_under, _c_colon, _c_var, _c_ge, _c_semi, _c_end, _c_eq, _c_le,
+    _c_min, _c_max) = range( len(_constlist) )
+
+def _strtable( strs ):
+    """ list of str -> (blob, offsets) """
+    enc = [s.encode( "utf-8" ) for s in strs]
+    offsets = np.zeros( len(enc) + 1, dtype=np.int64 )
+    np.cumsum( [len(e) for e in enc], out=offsets[1:] )
+    return np.frombuffer( b"".join( enc ), dtype=np.uint8 ), offsets
+
+_consts = _strtable( _constlist )
+
+
+def _blobtable( names ):
+    """ names, generated too -> (blob, offsets) """
+    names = nametable( names )
+    if names.fmt is not None:
+        names = NameTable.from_names( names.strings() )
+    return names.blob, names.offsets
+
+
+def _numtable( x, fmt="%g" ):
+    """ x -> (table of fmt % unique values, "" last), index of each x
+        unique bit patterns: -0. prints "-0", as % does
+    """
+    bits, inv = np.unique( np.ascontiguousarray( x, dtype=np.float64 ).view( np.int64 ),
+            return_inverse=True )
+    uniq = bits.view( np.float64 )
+    return _strtable( [fmt % u for u in uniq.tolist()] + [""] ), inv.reshape( -1 )
+
+
+def _coeftable( x, fmt=" %+.6g*" ):
+    """ coefficients -> (table " +2*" " -" ..., index), once per unique value """
+    uniq, inv = np.unique( x, return_inverse=True )
+    strs = [" +" if u == 1  else " -" if u == -1  else fmt % u for u in uniq.tolist()]
+    return _strtable( strs ), inv.reshape( -1 )
+
+
+def _catlines( tables, pre, cnt, terms=None, post=None ):
+    """ -> bytes, line i = pre[i] segments, cnt[i] terms, post[i] segments
+        pre terms post: (which, idx), idx (nline or nterm, k), which the same or (k,);
+        a segment is entry idx of tables[which], a (blob, offsets) pair
+        all numpy: segments -> byte positions -> one gather per table
     """
-    if sp.issparse( x ):
-        x = x.tocsr()
-        x, ix = x.data, x.indices
-    if ix is None:
-        ix = range( len(x) )
-    terms = []
-    for j, val in zip( ix, x ):
-        if abs(val) <= near0:
+    cnt = np.asarray( cnt, dtype=np.int64 )
+    pre, terms, post = [(np.asarray( w ), np.asarray( ix, dtype=np.int64 ))
+            if ix is not None  else None for w, ix in (pre, terms or (0, None), post or (0, None))]
+    npre = pre[1].shape[1]
+    nterm = terms[1].shape[1] if terms is not None  else 0
+    npost = post[1].shape[1] if post is not None  else 0
+    nseg = npre + nterm * cnt + npost
+    start = np.cumsum( nseg ) - nseg
+    which = np.empty( nseg.sum(), dtype=np.int64 )
+    idx = np.empty( nseg.sum(), dtype=np.int64 )
+    pos = start[:, None] + np.arange( npre )
+    which[pos], idx[pos] = pre
+    if npost:
+        pos = (start + npre + nterm * cnt)[:, None] + np.arange( npost )
+        which[pos], idx[pos] = post
+    if nterm and cnt.sum() > 0:
+        p = np.arange( cnt.sum() ) - np.repeat( np.cumsum( cnt ) - cnt, cnt )
+        pos = (np.repeat( start + npre, cnt ) + nterm * p)[:, None] + np.arange( nterm )
+        which[pos], idx[pos] = terms
+    return _gather( tables, which, idx )
+
+
+def _gather( tables, which, idx ):
+    """ segments k = tables[which[k]] entry idx[k], end to end -> bytes """
+    starts = np.zeros( len(idx), dtype=np.int64 )
+    lens = np.zeros( len(idx), dtype=np.int64 )
+    jt = [np.flatnonzero( which == t ) for t in range( len(tables) )]
+    for t, (tab, j) in enumerate( zip( tables, jt )):
+        if len(j) == 0:
             continue
-        s = (" +" if val == 1 else
-            " -" if val == -1 else
-            fmt % val)  # +-val*name
-        name = (names[j] if names is not None
-            else "x%d" % j)
-        terms.append( s + name)
-
-    return "".join( terms )
+        off = tab[1]
+        starts[j] = off[ idx[j] ]
+        lens[j] = off[ idx[j] + 1 ] - starts[j]
+    outoff = np.cumsum( lens ) - lens
+    out = np.empty( lens.sum(), dtype=np.uint8 )
+    for tab, j in zip( tables, jt ):
+        if len(j) == 0:
+            continue
+        L = lens[j]
+        within = np.arange( L.sum() ) - np.repeat( np.cumsum( L ) - L, L )
+        out[ np.repeat( outoff[j], L ) + within ] = tab[0][ np.repeat( starts[j], L ) + within ]
+    return out.tobytes()
+
+
+def _blocks( indptr, block ):
+    """ csr / csc indptr -> (i0, i1) ranges of ~ `block` nonzeros """
+    n = len(indptr) - 1
+    i0 = 0
+    while i0 < n:
+        i1 = np.searchsorted( indptr, indptr[i0] + block, side="right" ) - 1
+        i1 = min( max( i1, i0 + 1 ), n )
+        yield i0, i1
+        i0 = i1
+
+
+def _open_out( outfile, gzlevel=6, gzworkers=None ):
+    """ .gz -> parallel gzip stream, gzworkers 0: gzip.open; else plain, binary """
+    return open_gz( outfile, level=gzlevel, workers=gzworkers )
+
 
 #...............................................................................
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+""" scaling.py: row and column scale factors for A, numpy, the same for every solver
+    lps, fac = scale( lp, method="gm", passes=4 )  # lps: A' = R A S, a new LP
+    sol = gnulp_solve( lp_to_gnulp( lps ))  # or linprog, any solver
+    sol = unscale_solution( fac, sol.x, sol.y, sol.dj )  # -> Bag( x y dj ) of lp
+
+    x = S x', c' = S c, b' = R b, lb' = lb / s, y = R y', dj = dj' / s;  obj is the same.
+    methods, each pass rows then columns:
+        "gm": geometric mean, 1 / sqrt( min |a| max |a| ) -- GLPK's default, glpk.pdf
+        "eq": equilibration, 1 / max |a|, max |a| 1 in every row and column
+        "ruiz": 1 / sqrt( max |a| ), converges to max |a| 1 (Ruiz 2001)
+    Factors are powers of 2 (pow2=True), so scaling adds no roundoff.
+    The row / col max and min are reduceat over A.data in csr and csc order,
+    no per-row loops.
+"""
+
+from __future__ import division, print_function
+import numpy as np
+
+import glp
+from glp.compact import scipy_A
+from glp.zutil import Bag
+
+#...............................................................................
+def scale( lp, method="gm", passes=4, pow2=True, verbose=1 ):
+    """ LP -> lps, fac: a scaled LP, Bag( r s method ) row and col factors """
+    assert method in ("gm", "eq", "ruiz"), method
+    A = scipy_A( lp.A ).tocsr()
+    if not A.has_canonical_format:
+        A = A.copy()
+        A.sum_duplicates()
+    m, n = A.shape
+    absa = np.abs( A.data )
+    absa[ absa == 0 ] = np.nan  # fmin fmax skip them
+    rowof = np.repeat( np.arange( m ), np.diff( A.indptr ))
+    bycol = np.argsort( A.indices, kind="stable" )  # csr -> csc order
+    colptr = np.r_[ 0, np.cumsum( np.bincount( A.indices, minlength=n )) ]
+    r, s = np.ones( m ), np.ones( n )
+    ratio0 = _ratio( absa )
+    for _ in range( passes ):
+        a = absa * r[rowof] * s[A.indices]
+        r *= _factor( a, A.indptr, method )
+        a = (absa * r[rowof] * s[A.indices])[bycol]
+        s *= _factor( a, colptr, method )
+    if pow2:
+        r, s = _pow2( r ), _pow2( s )
+
+    As = A.copy()
+    As.data = A.data * r[rowof] * s[A.indices]
+    lps = glp.LP( A=As, b=lp.b * r, blo=lp.blo * r, c=lp.c * s, lb=lp.lb / s, ub=lp.ub / s,
+            problemname=lp.problemname, maximize=lp.maximize,
+            rowname=lp.get( "rowname" ), colname=lp.get( "colname" ),
+            mipvars=lp.get( "mipvars" ), verbose=0 )
+    if verbose:
+        print( "scale %s %s %d passes: max |a| / min |a| %.3g -> %.3g  r %.3g .. %.3g  s %.3g .. %.3g" % (
+                lp.problemname, method, passes, ratio0, _ratio( absa * r[rowof] * s[A.indices] ),
+                r.min( initial=1 ), r.max( initial=1 ), s.min( initial=1 ), s.max( initial=1 )))
+    return lps, Bag( r=r, s=s, method=method )
+
+
+def unscale_solution( fac, x, y=None, dj=None ):
+    """ x y dj of the scaled LP -> Bag( x y dj ) of the original """
+    return Bag( x=np.asarray( x ) * fac.s,
+                y=None if y is None  else np.asarray( y ) * fac.r,
+                dj=None if dj is None  else np.asarray( dj ) / fac.s )
+
+
+#...............................................................................
+def _factor( a, ptr, method ):
+    """ |a| in csr or csc order, ptr -> 1 / ( the scale of each row or col ), empty 1 """
+    k = len(ptr) - 1
+    full = np.diff( ptr ) > 0
+    big = np.ones( k )
+    big[full] = np.fmax.reduceat( a, ptr[:-1][full] )
+    if method == "gm":
+        small = np.ones( k )
+        small[full] = np.fmin.reduceat( a, ptr[:-1][full] )
+        f = 1 / np.sqrt( small * big )
+    elif method == "eq":
+        f = 1 / big
+    else:
+        f = 1 / np.sqrt( big )  # ruiz
+    f[ np.isnan( f )] = 1  # all 0
+    return f
+
+
+def _pow2( f ):
+    """ -> the nearest powers of 2, exact in floating point """
+    return np.ldexp( 1., np.round( np.log2( f )).astype( int ))
+
+
+def _ratio( absa ):
+    absa = absa[ absa > 0 ]  # not nan
+    return absa.max() / absa.min() if len(absa)  else 1.
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+""" solvecache.py: cached_solve( lp ) -> gnulp_solve results, cached on disk by the LP's contents
+    sol = cached_solve( lp, solver="simplex" )  # a miss: lp_to_gnulp, gnulp_solve, save
+    sol = cached_solve( lp2 )  # the same A b c ... from another file: a hit, no GLPK
+    key = lp_hash( lp, options )  # sha1 hex
+
+    The key is a hash of the LP's contents, not its file or name:
+        A csr, canonical -- sorted indices, no duplicates, no explicit 0s --
+            indptr indices as int64, data float64, the same for csc, int32, PatternMatrix
+        b c blo lb ub float64, -0. == 0., maximize, the shape,
+        and the solver options, json sorted, but not cancel progress every subprocess
+        time_limit iter_limit: how a solve runs, not what it solves -- only final
+        results are saved, the same with or without a limit.
+    Names, problemname, mipvars are not in it.
+    Only final results are saved, status "opt" "nofeas" "unbnd" with an x:
+    not "timeout" "itlim" "cancelled" "died" ..., which another run may finish.
+    Arrays go through sha1 in blocks of ~ 16 MB, converted a block at a time,
+    so hashing a big A is one pass, no copies: ~ 2 GB/sec, far less than a solve.
+
+    cachedir/<key>/ x.npy y.npy dj.npy Ax.npy meta.json, like lpcache.py;
+    a hit loads memory-mapped, size-bounded: least-recently-used entries are dropped
+    beyond maxbytes, lpcache.evict( cachedir, 0 ) clears it.
+    cachedir: GLP_SOLVECACHE in the environment, default ~/.cache/glp-solves
+"""
+
+from __future__ import division, print_function
+import hashlib
+import json
+import os
+import shutil
+import time
+import numpy as np
+
+import glp
+from glp.compact import PatternMatrix
+from glp.lpcache import evict, _npload, _meta
+from glp.zutil import Bag
+
+CACHEDIR = os.environ.get( "GLP_SOLVECACHE", "~/.cache/glp-solves" )
+MAXBYTES = float( os.environ.get( "GLP_SOLVECACHE_MAXBYTES", 1e9 ))
+_vecs = "b c blo lb ub".split()
+_solvecs = "x y dj Ax".split()
+_runopts = "cancel progress every subprocess time_limit iter_limit".split()  # not in the key
+FINAL = ("opt", "nofeas", "unbnd")  # saved, the rest not
+
+#...............................................................................
+def cached_solve( lp, solver="simplex", cache=True, maxbytes=None, verbose=1, **options ):
+    """ LP -> gnulp_solve( lp_to_gnulp( lp ), solver, **options ) through the cache:
+        Bag( obj x y dj Ax status status_dual info ), + key, hit
+        cache: True, or a cachedir;  status not in FINAL: solved, not saved
+    """
+    options = dict( options, solver=solver )
+    keyopts = dict( (k, v) for k, v in options.items() if k not in _runopts )
+    cachedir = os.path.expanduser( CACHEDIR if cache is True  else cache )
+    t0 = time.time()
+    key = lp_hash( lp, keyopts )
+    hashtime = time.time() - t0
+    entry = os.path.join( cachedir, key )
+    if os.path.isdir( entry ):
+        sol = _load_entry( entry )
+        if sol is not None:
+            os.utime( entry, None )  # lru
+            if verbose:
+                print( "cached_solve %s: cache hit %s  hash %.3f sec" % (
+                        lp.problemname, entry, hashtime ))
+            return sol
+
+    gnulp = glp.lp_to_gnulp( lp, verbose=verbose )
+    sol = glp.gnulp_solve( gnulp, solver=solver, verbose=verbose,
+            **dict( (k, v) for k, v in options.items() if k != "solver" ))
+    solvetime = time.time() - t0 - hashtime
+    final = sol.status in FINAL and sol.x is not None
+    if final:
+        _save_entry( entry, sol, keyopts, solvetime=solvetime )
+        evict( cachedir, MAXBYTES if maxbytes is None  else maxbytes )
+    if verbose:
+        print( "cached_solve %s: %s %s  hash %.3f sec  solve %.3f sec" % (
+                lp.problemname, "saved" if final  else "status %s, not saved" % sol.status,
+                entry, hashtime, solvetime ))
+    return Bag( sol, key=key, hit=False )
+
+
+def lp_hash( lp, options=None, block=1 << 21 ):
+    """ LP, options dict -> sha1 hex of the contents, see above;  block: elements """
+    A = lp.A
+    if isinstance( A, PatternMatrix ):
+        A = A.tocsr()  # rows as stored
+        data = None
+    else:
+        A = glp.scipy_A( A ).tocsr()
+        if not A.has_canonical_format or np.count_nonzero( A.data ) < A.nnz:
+            A = A.copy()
+            A.sum_duplicates()
+            A.eliminate_zeros()
+        data = A.data
+    h = hashlib.sha1()
+    h.update( json.dumps( dict( shape=list( A.shape ), nnz=int( A.nnz ),
+            maximize=bool( lp.maximize ), options=options or {} ),
+            sort_keys=True, default=str ).encode() )
+    _update( h, A.indptr, np.int64, block )
+    _update( h, A.indices, np.int64, block )
+    if data is not None:
+        _update( h, data, np.float64, block )
+    else:  # PatternMatrix: its value, nnz times
+        const = np.full( min( A.nnz, block ), A.value, dtype=np.float64 )
+        for k in range( 0, A.nnz, block ):
+            h.update( const[: min( block, A.nnz - k )] )
+    for k in _vecs:
+        h.update( k.encode() )
+        _update( h, np.asarray( lp[k] ), np.float64, block )
+    return h.hexdigest()
+
+
+#...............................................................................
+def _update( h, arr, dtype, block ):
+    """ h.update( arr as dtype, little-endian ), a block at a time, -0. -> 0. """
+    arr = np.ravel( arr )
+    dt = np.dtype( dtype ).newbyteorder( "<" )
+    for k in range( 0, len(arr), block ):
+        chunk = np.ascontiguousarray( arr[k : k + block], dtype=dt )
+        if dt.kind == "f":
+            chunk = chunk + 0.  # -0. + 0. == +0., a new buffer
+        h.update( chunk )
+
+
+def _save_entry( entry, sol, options, solvetime ):
+    """ sol -> entry/ x.npy ... meta.json, atomic rename """
+    meta = dict( obj=sol.obj, status=sol.status, status_dual=sol.status_dual,
+            status_primal=sol.get( "status_primal" ), iters=sol.get( "iters" ),
+            info=sol.info, options=options, solvetime=solvetime )
+    tmp = "%s.tmp%d" % (entry, os.getpid())
+    os.makedirs( tmp )
+    for k in _solvecs:
+        np.save( os.path.join( tmp, k + ".npy" ), np.asarray( sol[k], dtype=float ))
+    with open( os.path.join( tmp, "meta.json" ), "w" ) as f:
+        json.dump( meta, f, default=str )
+    try:
+        os.rename( tmp, entry )
+    except OSError:  # another process got there first
+        shutil.rmtree( tmp, ignore_errors=True )
+
+
+def _load_entry( entry ):
+    """ -> Bag( obj x y dj Ax status status_dual status_primal iters info key hit ),
+        the gnulp_solve fields, or None if half there
+    """
+    meta = _meta( entry )
+    if meta is None:
+        return None
+    try:
+        arrays = dict( (k, _npload( os.path.join( entry, k + ".npy" ))) for k in _solvecs )
+    except (IOError, ValueError):
+        return None
+    return Bag( obj=meta["obj"], status=meta["status"], status_dual=meta["status_dual"],
+            status_primal=meta.get( "status_primal" ), iters=meta.get( "iters" ),
+            info=meta["info"], key=os.path.basename( entry ), hit=True, **arrays )
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+""" solver.py: Solver, one GLPK LPX kept alive for re-solves, warm from the last basis
+    s = Solver( lp )  # lp_to_gnulp, scale() once
+    sol = s.solve()  # -> Bag( obj x y dj Ax status status_dual info meth iters time )
+    s.set_obj( cnew )  # all of c, or s.set_obj( cj, j ) some
+    s.set_row_bounds( blo, b, i )  # i None: all rows
+    s.set_col_bounds( lb, ub, j )
+    s.set_coefs( i, j, aij )  # A[i, j] = aij, 0 removes
+    sol = s.solve()  # a few pivots, not a full solve
+    basis = s.get_basis() ... s.set_basis( basis )
+
+    solve() picks the simplex method from what changed since the last solve:
+        only b blo lb ub: the old basis is still dual feasible -> dual simplex
+        c or A: primal simplex, phase 1 if need be
+    GLPK keeps the basis in the LPX; updates go in unscaled, GLPK keeps its scale factors.
+    Updates go through glpkc C calls, else pyglpk one element at a time;
+    iters, the simplex iterations of this solve, is None without glp_get_it_cnt.
+"""
+
+from __future__ import division, print_function
+import time
+import numpy as np
+
+import glpk  # https://github.com/bradfordboyle/pyglpk
+
+from glp import glpkc
+from glp.lp_gnu import lp_to_gnulp, gnulp_solution, gnulp_basis, set_gnulp_basis, bounds_pair
+from glp.tracing import span
+from glp.zutil import Bag
+
+#...............................................................................
+class Solver( object ):
+    """ s = Solver( lp ): an LPX built and scaled once, re-solved warm, see above """
+
+    def __init__( self, lp, verbose=1 ):
+        self.gnulp = lp_to_gnulp( lp, verbose=verbose )
+        self.P = glpkc.prob_ptr( self.gnulp )
+        self.shape = lp.A.shape
+        self.name = lp.problemname
+        self.verbose = verbose
+        glpk.env.term_on = verbose >= 2
+        self.gnulp.scale()
+        self.changed = set()  # "obj" "bounds" "A" since the last solve
+        self.nsolve = 0
+
+    def set_obj( self, c, j=None ):
+        """ c -> obj coefs of cols j, all if None """
+        c, j = self._ix( c, j, self.shape[1] )
+        if self.P is not None:
+            glpkc.set_obj( self.P, c, maximize=None, ix=j )
+        else:
+            for jj, cj in zip( j.tolist(), c.tolist() ):
+                self.gnulp.obj[jj] = cj
+        self.changed.add( "obj" )
+
+    def set_row_bounds( self, blo, b, i=None ):
+        """ blo <= A x <= b of rows i, all if None """
+        self._set_bounds( blo, b, i, rows=True )
+
+    def set_col_bounds( self, lb, ub, j=None ):
+        """ lb <= x <= ub of cols j, all if None """
+        self._set_bounds( lb, ub, j, rows=False )
+
+    def set_coefs( self, i, j, v ):
+        """ A[i, j] = v, 0 removes """
+        i, j = np.atleast_1d( i ), np.atleast_1d( j )
+        v = np.broadcast_to( np.asarray( v, dtype=float ), i.shape )
+        if self.P is not None:
+            glpkc.set_coefs( self.P, i, j, v )
+        else:
+            for r in np.unique( i ).tolist():
+                row = self.gnulp.rows[r]
+                new = dict( row.matrix )
+                new.update( zip( j[i == r].tolist(), v[i == r].tolist() ))
+                row.matrix = [(jj, a) for jj, a in new.items() if a != 0]
+        self.changed.add( "A" )
+
+    def solve( self, meth=None, tm_lim=None, it_lim=None ):
+        """ -> Bag( obj x y dj Ax status status_dual info meth iters time )
+            meth "primal" "dual" "dualp", default from what changed, see above
+            tm_lim msec, it_lim: GLPK's limits, status "tmlim" "itlim"
+        """
+        gnulp = self.gnulp
+        if meth is None:
+            meth = "dualp" if self.changed == {"bounds"}  else "primal"
+        kw = dict( meth=meth )
+        if tm_lim is not None:
+            kw["tm_lim"] = int( tm_lim )
+        if it_lim is not None:
+            kw["it_lim"] = int( it_lim )
+        glpk.env.term_on = self.verbose >= 2
+        it0 = self._iters()
+        t0 = time.time()
+        with span( "Solver.solve", meth=meth, nsolve=self.nsolve + 1 ):
+            ret = gnulp.simplex( **kw )
+        if ret is not None and ret not in ("tmlim", "itlim"):  # singular basis after set_coefs ...
+            if self.verbose:
+                print( "Solver %s: simplex %s %s, again from an advanced basis" % (
+                        self.name, meth, ret ))
+            gnulp.adv_basis()
+            ret = gnulp.simplex( **dict( kw, meth="primal" ))
+        secs = time.time() - t0
+        it1 = self._iters()
+        self.changed = set()
+        self.nsolve += 1
+        x, y, dj, Ax = gnulp_solution( gnulp )
+        status = ret if ret in ("tmlim", "itlim")  else gnulp.status_s
+        sol = Bag( obj=gnulp.obj.value, x=x, y=y, dj=dj, Ax=Ax,
+                status=status, status_dual=gnulp.status_dual,
+                info="%s solve %d" % (self.name, self.nsolve), meth=meth,
+                iters=None if it0 is None  else it1 - it0, time=secs )
+        if self.verbose:
+            print( "Solver %s: obj %.8g  %s  %s  %s iters  %.3f sec" % (
+                    sol.info, sol.obj, status, meth, sol.iters, secs ))
+        return sol
+
+    def get_basis( self ):
+        """ -> Bag( rows cols ) of GLP_BS NL NU NF NS, 1 .. 5 """
+        return gnulp_basis( self.gnulp )
+
+    def set_basis( self, basis ):
+        """ basis from get_basis(), e.g. of a solve before -> the next solve starts there """
+        set_gnulp_basis( self.gnulp, basis )
+        self.changed.add( "basis" )
+
+    #...........................................................................
+    def _set_bounds( self, lo, hi, ix, rows ):
+        lo, ix = self._ix( lo, ix, self.shape[0] if rows  else self.shape[1] )
+        hi = np.broadcast_to( np.asarray( hi, dtype=float ), lo.shape )
+        if self.P is not None:
+            glpkc.set_bounds( self.P, lo, hi, rows=rows, ix=ix )
+        else:
+            bars = self.gnulp.rows if rows  else self.gnulp.cols
+            for k, l, u in zip( ix.tolist(), lo.tolist(), hi.tolist() ):
+                bars[k].bounds = bounds_pair( l, u )
+        self.changed.add( "bounds" )
+
+    def _ix( self, vals, ix, n ):
+        """ -> float vals, int ix;  ix None: all n """
+        ix = np.arange( n ) if ix is None  else np.atleast_1d( ix )
+        vals = np.broadcast_to( np.asarray( vals, dtype=float ), ix.shape )
+        return vals, ix
+
+    def _iters( self ):
+        return None if self.P is None  else glpkc.iter_count( self.P )
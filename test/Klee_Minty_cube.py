@@ -8,7 +8,8 @@
 
 from __future__ import division, print_function
 import numpy as np
-from scipy import sparse as sp
+
+from glp import generators  # https://github.com/denis-bz/glp
 
 #...............................................................................
 def Klee_Minty_cube( d, inc=1, verbose=1 ):
@@ -19,26 +20,20 @@ def Klee_Minty_cube( d, inc=1, verbose=1 ):
         # ill-conditioned:
         #   inc=0 d=20: sing 1.4e6 .. 7e-7
         #   inc=0 d=200: 2e60 .. 1.5e-16
-        # todo: scale
-    A = sp.eye( d, format="coo" )
-    for k in range( 1, d ):
-        A.setdiag( 2 ** (k + 1), k=- k )
-    A = A.toarray()
-    if inc:
-        A += inc
-    dpow = np.arange( d )
-    b = 5. ** (dpow + 1)    # 5 25 .. 5^d
-    c = - (2. ** dpow)[::-1]  # 2^(d-1) 2^(d-2) .. 1  minimize
+        # glp.scale( lp, "gm" ): max / min |a_ij| 1e6 -> 2, test/test-scaling.py
+        # sparse, 2 nonzeros a row: generators.klee_minty_sparse
+    lp = generators.klee_minty( d, inc=inc, verbose=0 )
+    A, b, c = lp.A.toarray(), lp.b, lp.c
     if verbose:
-        sing = np.linalg.svd( A, compute_uv=False )
         print( """
 Klee_Minty_cube( d=%d, inc=%g )
 A:
 %s
 b: %s
-c: %s
-singular values: %s
-""" % (d, inc, A, b, c, sing ))
+c: %s""" % (d, inc, A, b, c ))
+        if verbose >= 2 and d <= 1000:
+            print( "singular values: %s" % np.linalg.svd( A, compute_uv=False ))
+        print( "" )
 
     return A, b, c
 
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+""" bench-gzip.py: save_lp .lp.gz .mps.gz, one-thread gzip vs pgzip threads
+    gzworkers=0 is the old path: GLPK's own gzip, gzip.open in the native writers
+"""
+
+from __future__ import division, print_function
+import os
+import sys
+import tempfile
+import time
+
+import glp
+from glp.zutil import scan_args, globs, ptime
+
+print( "\n" + 80 * "=" )
+print( "from", " ".join( sys.argv ), " ", time.strftime( "%c" ), " cores", os.cpu_count() )
+
+#...............................................................................
+lpfiles = []  # default lpgen34 n d
+n = 40
+d = 3
+suffixes = [".lp.gz", ".mps.gz"]
+engines = ["glpk", "native"]
+workerlist = [0, 1, 2, 4, None]  # None: all cores
+gzlevel = 6
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+print( "params: n %d  d %d  gzlevel %d  workers %s" % (n, d, gzlevel, workerlist) )
+
+if fileargs or lpfiles:
+    lps = [(f, glp.load_lp( f, verbose=0 )) for f in fileargs or globs( lpfiles )]
+else:
+    sys.path.insert( 0, os.path.dirname( os.path.abspath( __file__ )))
+    from lpgen34 import lpgen34
+    A, b, c = lpgen34( n, d=d, verbose=0 )
+    lps = [("lpgen34 n %d d %d" % (n, d), glp.LP( A=A, b=b, blo=b, c=c, verbose=0 ))]
+
+tmpdir = tempfile.mkdtemp()
+for name, lp in lps:
+    print( "\n--", name, lp.A.shape, lp.A.nnz, "non0" )
+    for engine in engines:
+        for suffix in suffixes:
+            out = os.path.join( tmpdir, "bench" + suffix )
+            for workers in workerlist:
+                ptime()
+                glp.save_lp( out, lp, engine=engine, gzlevel=gzlevel, gzworkers=workers,
+                        verbose=0 )
+                wall, cpu = ptime()
+                print( "%-6s %-8s gzworkers %-4s  %5.2f sec wall  %5.2f cpu  %6.0f kbytes" % (
+                        engine, suffix, workers, wall, cpu, os.path.getsize( out ) / 1e3 ))
+            os.remove( out )
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+""" bench-linprog.py: lp_to_linprog, peak memory / A bytes, tracemalloc
+    vs the old rows_le + split_Ab: A[jflip] *= -1, vstack(( A, - A[jboth] )), A[jne] A[jeq]
+    and check that both give the same A_ub b_ub A_eq b_eq, the LP unchanged
+"""
+
+from __future__ import division, print_function
+import sys
+import time
+import tracemalloc
+import numpy as np
+from numpy import inf, isfinite
+from scipy import sparse
+
+import glp
+from glp.zutil import Bag, Checks, nbytes, scan_args
+
+print( 80 * "=" )
+print( "from", " ".join( sys.argv ), " ", time.strftime( "%c" ))
+
+#...............................................................................
+def old_linprog_rows( A, b, blo ):
+    """ the old rows_le + split_Ab, on copies;
+        A[jflip] *= -1 as diags( +-1 ) * A -- in scipy 1.17, that setitem on csr
+        makes an index array jflip.sum() x n, 45 gbytes here
+    """
+    A, b, blo = A.tocsr().copy(), b.copy(), blo.copy()
+    jcon = ~ ((blo == -inf) & (b == inf))
+    A, b, blo = A[jcon], b[jcon], blo[jcon]
+    jflip = isfinite( blo ) & (b == inf)
+    A = sparse.diags( np.where( jflip, -1., 1. )).dot( A ).tocsr()  # A[jflip] *= -1
+    b[jflip] = - blo[jflip]
+    blo[jflip] = - inf
+    jboth = isfinite( blo ) & (blo < b) & isfinite( b )
+    A = sparse.vstack(( A, - A[jboth] )).tocsr()
+    b = np.hstack(( b, - blo[jboth] ))
+    blo[jboth] = - inf
+    blo = np.hstack(( blo, - inf * np.ones( jboth.sum() )))
+    jeq = (b == blo)
+    return Bag( A_ub=A[~ jeq], b_ub=b[~ jeq], A_eq=A[jeq], b_eq=b[jeq] )
+
+
+def peak( f, *args ):
+    """ -> f( *args ), peak bytes traced, secs untraced """
+    tracemalloc.start()
+    out = f( *args )
+    _, peakbytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t0 = time.time()
+    f( *args )
+    return out, peakbytes, time.time() - t0
+
+
+m = 200000
+n = 300000
+k = 20  # nonzeros a row
+seed = 0
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+
+rng = np.random.RandomState( seed )
+A = sparse.csr_matrix( (rng.randn( m * k ), rng.randint( 0, n, size=m * k ),
+        np.arange( 0, m * k + 1, k )), shape=(m, n) )
+A.sum_duplicates()
+kind = rng.randint( 0, 5, size=m )  # le ge eq 2-sided free
+b = np.where( (kind == 1) | (kind == 4), inf, rng.rand( m ) * 10 )
+blo = np.select( [kind == 1, kind == 2, kind == 3], [-1, b, b - 1], -inf )
+lp = glp.LP( A=A, b=b, blo=blo, c=rng.randn( n ), maximize=True, verbose=0 )
+Adata, bcopy, ccopy = A.data.copy(), b.copy(), lp.c.copy()
+Abytes = nbytes( A )
+print( "A %s  %d non0  %.0f mbytes, rows le ge eq 2-sided free: %s" % (
+        A.shape, A.nnz, Abytes / 1e6, np.bincount( kind )))
+
+old, oldpeak, oldsecs = peak( old_linprog_rows, A, b, blo )
+(lpmin, new), newpeak, newsecs = peak( glp.lp_to_linprog, lp, 0 )
+print( "old rows_le + split_Ab: peak %.2f x A  %.2f sec" % (oldpeak / Abytes, oldsecs) )
+print( "lp_to_linprog:          peak %.2f x A  %.2f sec" % (newpeak / Abytes, newsecs) )
+
+check = Checks()
+for nm in "A_ub A_eq".split():
+    check( "%s %s == old" % (nm, new[nm].shape), (abs( old[nm] - new[nm] ) > 0).nnz == 0
+            and np.array_equal( old["b" + nm[1:]], new["b" + nm[1:]] ))
+check( "lp unchanged,  lpmin.c == - c: %s" % np.array_equal( lpmin.c, - ccopy ),
+        np.array_equal( A.data, Adata ) and np.array_equal( lp.b, bcopy )
+        and np.array_equal( lp.c, ccopy ) and lp.maximize and lp.A is A )
+
+print( "\nbench-linprog: %d differ" % check.nbad )
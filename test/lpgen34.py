@@ -11,7 +11,9 @@
 
 from __future__ import division, print_function  
 import numpy as np
-from scipy import sparse as sp
+
+import glp  # numpy/scipy arrays <-> glpk
+from glp import generators  # closed-form csr, see generators.py
 
 __version__ = "2019.10.08"  # 8 oct
 __author_email__ = "denis-bz-py t-online.de"
@@ -27,75 +29,54 @@ def lpgen34( n, d=3, cint=9, seed=0, verbose=2 ):
     A = Agen( n )
     nr, nc = A.shape
     b = np.ones( nr )
-    random = seed if isinstance(seed, np.random.RandomState) \
-            else np.random.RandomState( seed=seed )
-    if cint > 0:
-        c = random.randint( 0, cint+1, size=nc ).astype(float)  # 0 .. cint inclusive
-    else:
-        c = random.uniform( size=nc )
+    c = cvec( nc, cint=cint, seed=seed )
     if verbose:
         print( "\nlpgen34: n %d  d %d  A %s %s %d non0  seed %d  c %s ..." % (
                 n, d, A.shape, type(A).__name__, A.nnz, seed, c[:10] ))
         if verbose >= 2:
             for j in range( 0, nr, nr // d ):
-                print( A[j:j+5] .A )  # caller's printoptions
+                print( A[j:j+5] .toarray() )  # caller's printoptions
                 print( " ..." )
     return A, b, c
 
 
-def A2( n ):
-    """ -> A 2n x n^2, 2 1s in each column  sparse csr """
-        # ~ lpgen_2d 2014
-    square = np.arange( n**2 ).reshape( n, n )
-    line = np.arange( n )
+def cvec( nc, cint=9, seed=0 ):
+    """ -> c randint 0 .. cint inclusive, cint <= 0: uniform """
+    return generators.randc( nc, cint=cint, seed=seed )
 
-    def row01( *ix ):
-        row = sp.lil_matrix( (1, n**2) )
-        row[0, square[ix]] = 1
-        return row.tocsr()
 
-    return sp.vstack(  # csr* -> csr, else coo
-            #   i  j
-        [row01( i, line ) for i in line] +
-        [row01( line, j ) for j in line]
-        )
+def A2( n ):
+    """ -> A 2n x n^2, 2 1s in each column  sparse csr
+        rows: square[i, :], square[:, j]
+    """
+        # ~ lpgen_2d 2014
+    return generators.latin_square_A( n, d=2 )
 
 def A3( n ):
-    """ -> A 3n^2 x n^3, 3 1s in each column  sparse csr """
-    cube = np.arange( n**3 ).reshape( n, n, n )
-    line = np.arange( n )
-    pairs = np.array([ [i, j] for i in line  for j in line ])
-
-    def row01( *ix ):
-        row = sp.lil_matrix( (1, n**3) )
-        row[0, cube[ix]] = 1
-        return row.tocsr()
-
-    return sp.vstack(
-            #   i  j  k
-        [row01( i, j, line ) for i, j in pairs] +
-        [row01( i, line, k ) for i, k in pairs] +
-        [row01( line, j, k ) for j, k in pairs]
-        )
+    """ -> A 3n^2 x n^3, 3 1s in each column  sparse csr
+        rows: cube[i, j, :] for i, j;  cube[i, :, k];  cube[:, j, k]
+    """
+    return generators.latin_square_A( n, d=3 )
 
 def A4( n ):
-    """ -> A 4n^3 x n^4, 4 1s in each column  sparse csr """
-    cube = np.arange( n**4 ).reshape( n, n, n, n )
-    line = np.arange( n )
-    triples = np.array([ [i, j, k] for i in line  for j in line  for k in line ])
-
-    def row01( *ix ):
-        row = sp.lil_matrix( (1, n**4) )
-        row[0, cube[ix]] = 1
-        return row.tocsr()
-
-    return sp.vstack(
-            #   i  j  k, l
-        [row01( i, j, k, line ) for i, j, k in triples] +
-        [row01( i, j, line, l ) for i, j, l in triples] +
-        [row01( i, line, k, l ) for i, k, l in triples] +
-        [row01( line, j, k, l ) for j, k, l in triples]
-        )
+    """ -> A 4n^3 x n^4, 4 1s in each column  sparse csr
+        rows: cube[i, j, k, :];  cube[i, j, :, l];  cube[i, :, k, l];  cube[:, j, k, l]
+    """
+    return generators.latin_square_A( n, d=4 )
+
+def rowblocks( n, d=3, block=1 << 14 ):
+    """ -> PatternMatrix blocks of `block` rows, the same rows as A2 A3 A4, for LPWriter """
+    return generators.latin_rowblocks( n, d=d, block=block )
+
+
+def save34( outfile, n, d=3, cint=9, seed=0, bmul=1, block=1 << 14, verbose=1 ):
+    """ lpgen34 Ax = b, 0 <= x -> outfile .lp .mps [.gz], row blocks through LPWriter """
+    c = cvec( n**d, cint=cint, seed=seed )
+    with glp.LPWriter( outfile, c, problemname="lpgen34 n%d d%d" % (n, d),
+            verbose=verbose ) as w:
+        for A in rowblocks( n, d=d, block=block ):
+            w.add_rows( A, b=bmul, blo=bmul )
+    return outfile
 
 #...............................................................................
 if __name__ == "__main__":
@@ -108,7 +89,8 @@ if __name__ == "__main__":
     n = 16
     cint = 9  # c randint 0 .. cint+1 / uniform
     bmul = 1
-    save = ""  # > save.lp
+    save = ""  # > save + suffix, streamed: no A
+    suffix = ".lp.gz"  # .lp / .mps [.gz]
     seed = 0
 
     # to change these params, run this.py  a=1  b=None  c='expr' ...
@@ -116,12 +98,8 @@ if __name__ == "__main__":
     for arg in sys.argv[1:]:
         exec( arg )
 
-    A, b, c = lpgen34( n, d=d, cint=cint, seed=seed )
-
     if save:
-        import glp  # numpy/scipy arrays <-> glpk
-
-        b *= bmul
-        lp = glp.LP( A=A, b=b, blo=b, c=c, problemname=save )  # Ax = b, 0 <= x
-        glp.save_lp( save + ".lp.gz", lp )  # .glp / .lp cplex / .mod gmpl / .mps
+        save34( save + suffix, n, d=d, cint=cint, seed=seed, bmul=bmul )
+    else:
+        A, b, c = lpgen34( n, d=d, cint=cint, seed=seed )
 
@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+""" test-batch.py: batch_solve a few random_feasible .glpz files:
+    obj == fopt, the summary .jsonl a line each;
+    time_limit kills a big one, also while tiny ones finish < .1 sec apart,
+    mem_limit stops another, the rest run on
+"""
+
+from __future__ import division, print_function
+import json
+import os
+import sys
+import tempfile
+import numpy as np
+
+import glp
+from glp import generators as gen
+from glp.batch import batch_solve
+from glp.zutil import Checks, scan_args
+
+nfile = 6
+m = 200
+bigm = 4000
+ntiny = 400
+workers = 3
+verbose = 1
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+tmpdir = tempfile.mkdtemp( prefix="test-batch" )
+fopt = dict()
+for seed in range( nfile ):
+    lp = gen.random_feasible( m + 50 * seed, 4 * (m + 50 * seed) // 3, seed=seed, verbose=0 )
+    lpfile = os.path.join( tmpdir, "rf%d.glpz" % seed )
+    glp.save_lp( lpfile, lp, verbose=0 )
+    fopt[lpfile] = lp.fopt
+summary = os.path.join( tmpdir, "batch.jsonl" )
+
+results = list( batch_solve( tmpdir + "/rf*.glpz", workers=workers, summary=summary,
+        verbose=verbose ))
+ok = [r.status == "opt" and np.isclose( r.obj, fopt[r.lpfile], rtol=1e-9 ) for r in results]
+check( "%d files: %d opt, obj == fopt" % (nfile, sum( ok )), len(results) == nfile and all( ok ))
+lines = [json.loads( line ) for line in open( summary )]
+check( "summary: %d lines, keys %s ..." % (len(lines), sorted( lines[0] )[:4] ),
+        len(lines) == nfile and set( r["lpfile"] for r in lines ) == set( fopt ))
+
+    # limits: a big one killed on time, one out of memory, the small ones fine
+big = os.path.join( tmpdir, "big.glpz" )
+glp.save_lp( big, gen.random_feasible( bigm, 4 * bigm // 3, verbose=0 ), verbose=0 )
+results = dict( (os.path.basename( r.lpfile ), r)
+        for r in batch_solve( [big, tmpdir + "/rf[01].glpz"], workers=workers,
+                time_limit=2, verbose=verbose ))
+check( "time_limit 2: big %s  %.1f sec" % (results["big.glpz"].status, results["big.glpz"].wall),
+        results["big.glpz"].status == "timeout" and results["big.glpz"].wall < 4
+        and results["rf0.glpz"].status == results["rf1.glpz"].status == "opt" )
+
+    # a steady stream of small results does not keep the big one past time_limit
+for k in range( ntiny ):
+    glp.save_lp( os.path.join( tmpdir, "tiny%03d.glpz" % k ),
+            gen.random_feasible( 20, 30, seed=k, verbose=0 ), verbose=0 )
+results = dict( (os.path.basename( r.lpfile ), r)
+        for r in batch_solve( [big, tmpdir + "/tiny*.glpz"], workers=workers,
+                time_limit=1, verbose=0 ))
+r = results["big.glpz"]
+check( "time_limit 1 among %d tiny: big %s  %.1f sec" % (ntiny, r.status, r.wall),
+        r.status == "timeout" and r.wall < 2 and len(results) == ntiny + 1 )
+
+vm = [int( line.split()[1] ) * 1024 for line in open( "/proc/self/status" )
+        if line.startswith( "VmSize" )][0]
+r = list( batch_solve( big, mem_limit=vm + 20e6, verbose=verbose ))[0]
+check( "mem_limit VmSize + 20 MB: big %s" % r.status, r.status in ("memlimit", "died") )
+r = list( batch_solve( big, cpu_limit=1, verbose=verbose ))[0]
+check( "cpu_limit 1: big %s" % r.status, r.status == "cpulimit" )
+
+print( "\ntest-batch: %d differ" % check.nbad )
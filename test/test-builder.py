@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+""" test-builder.py: LPBuilder add_row / add_rows / add_coo == LP( A ... ) built at once
+    and time it against a lil_matrix row + vstack per row, as lpgen34 used to
+"""
+
+from __future__ import division, print_function
+import sys
+import time
+import numpy as np
+from numpy import inf
+from scipy import sparse
+
+import glp
+from glp.zutil import Checks, scan_args
+
+#...............................................................................
+m = 2000
+n = 3000
+density = .005
+seed = 0
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+
+rng = np.random.RandomState( seed )
+A = sparse.random( m, n, density=density, random_state=rng, format="csr" )
+b = rng.rand( m ) * 10
+blo = np.where( rng.rand( m ) < .3, b - 1, - inf )
+c = np.round( rng.randn( n ), 2 )
+ub = np.where( rng.rand( n ) < .5, inf, 3 )
+kind = np.where( rng.rand( n ) < .1, "i", "c" )
+rowname = np.array([ "row%d" % i for i in range( m )])
+lp = glp.LP( A=A, b=b, blo=blo, c=c, ub=ub, rowname=rowname, mipvars=kind, verbose=0 )
+check = Checks()
+
+def same( what, B, secs ):
+    lpb = B.to_lp( verbose=0 )
+    diff = [k for k in "b blo c lb ub".split() if not np.array_equal( lp[k], lpb[k] )]
+    if (abs( lpb.A - A ) > 0).nnz:
+        diff.append( "A" )
+    if list( lpb.rowname ) != list( rowname ) or list( lpb.mipvars ) != list( kind ):
+        diff.append( "names" )
+    check( "%-32s %.3f sec  %s" % (what, secs, " ".join( diff )), not diff )
+
+    # one row at a time, columns in 2 chunks
+t0 = time.time()
+B = glp.LPBuilder( nnz=16, verbose=0 )  # grow from 16
+B.add_cols( n // 2, c=c[: n // 2], ub=ub[: n // 2], kind=kind[: n // 2] )
+B.add_cols( n - n // 2, c=c[n // 2 :], ub=ub[n // 2 :], kind=kind[n // 2 :] )
+for i in range( m ):
+    lo, hi = A.indptr[i], A.indptr[i+1]
+    B.add_row( A.indices[lo:hi], A.data[lo:hi], b=b[i], blo=blo[i], rowname=rowname[i] )
+same( "add_row x %d" % m, B, time.time() - t0 )
+
+    # all rows at once from coo, shuffled
+t0 = time.time()
+B = glp.LPBuilder( verbose=0 )
+B.add_cols( n, c=c, ub=ub, kind=kind )
+S = A.tocoo()
+p = rng.permutation( S.nnz )
+B.add_coo( m, S.row[p], S.col[p], S.data[p], b=b, blo=blo, rowname=rowname )
+same( "add_coo", B, time.time() - t0 )
+
+    # rows of the first half, then the second half of the columns one at a time
+t0 = time.time()
+B = glp.LPBuilder( verbose=0 )
+h = n // 2
+B.add_cols( h, c=c[:h], ub=ub[:h], kind=kind[:h] )
+L = A[:, :h].tocsr()
+for i in range( m ):
+    lo, hi = L.indptr[i], L.indptr[i+1]
+    B.add_row( L.indices[lo:hi], L.data[lo:hi], b=b[i], blo=blo[i], rowname=rowname[i] )
+R = A[:, h:].tocsc()
+for j in range( n - h ):
+    lo, hi = R.indptr[j], R.indptr[j+1]
+    B.add_col( R.indices[lo:hi], R.data[lo:hi], c=c[h+j], ub=ub[h+j], kind=kind[h+j] )
+same( "add_row x %d, add_col x %d" % (m, n - h), B, time.time() - t0 )
+
+    # fixed-width rows: lpgen34 d=3
+from lpgen34 import rowblocks  # test/
+k = 30
+L = sparse.vstack([ glp.scipy_A( blk ) for blk in rowblocks( k, d=3 ) ])
+t0 = time.time()
+B = glp.LPBuilder( verbose=0 )
+B.add_cols( k**3 )
+for blk in rowblocks( k, d=3, block=k ):
+    B.add_rows( blk.indices.reshape( -1, k ))
+t1 = time.time()
+check( "%-32s %.3f sec" % ("add_rows lpgen34 n %d" % k, t1 - t0), (B.tocsr() != L).nnz == 0 )
+
+    # vs a lil row + vstack per row
+t0 = time.time()
+rows = []
+for i in range( m ):
+    row = sparse.lil_matrix( (1, n) )
+    lo, hi = A.indptr[i], A.indptr[i+1]
+    row[0, A.indices[lo:hi]] = A.data[lo:hi]
+    rows.append( row.tocsr() )
+V = sparse.vstack( rows )
+print( "%-32s %.3f sec" % ("lil + vstack x %d" % m, time.time() - t0 ))
+
+print( "\ntest-builder: %d differ" % check.nbad )
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+""" test-check-many.py: check_many( lp, X ) == a plain dense check of each column of X,
+    row blocks of a few rows too, PatternMatrix A;  time a big X
+"""
+
+from __future__ import division, print_function
+import sys
+import time
+import numpy as np
+
+import glp
+from glp import generators as gen
+from glp.zutil import Checks, scan_args
+
+#...............................................................................
+def check_dense( lp, x ):
+    """ -> max relative row violation, bound violation, as check_many """
+    Ax = glp.scipy_A( lp.A ).dot( x )
+    def viol( y, lo, hi ):
+        with np.errstate( invalid="ignore" ):
+            v = np.fmax( np.fmax( lo - y, y - hi ), 0 ) \
+                / np.maximum( 1, np.where( y > hi, abs( hi ), abs( lo )))
+        return np.nan_to_num( v ).max( initial=0 )
+    return viol( Ax, lp.blo, lp.b ), viol( x, lp.lb, lp.ub )
+
+
+m = 3000
+n = 5000
+k = 20
+bigm = 10**6
+bigk = 8
+verbose = 0
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks( width=50 )
+
+rng = np.random.RandomState( 0 )
+lp = gen.random_feasible( m, n, seed=0, verbose=verbose )
+X = lp.xopt[:, None] + np.where( rng.rand( n, k ) < .001, rng.randn( n, k ), 0 )
+X[:, 0] = lp.xopt
+
+for blockbytes in (1 << 26, 8 * k * 7):  # 1 block, 7-row blocks
+    t0 = time.time()
+    chk = glp.check_many( lp, X, blockbytes=blockbytes )
+    secs = time.time() - t0
+    same = True
+    for j in range( k ):
+        rowviol, boundviol = check_dense( lp, X[:, j] )
+        same &= np.isclose( chk.rowviol[j], rowviol ) and np.isclose( chk.boundviol[j], boundviol )
+    check( "random_feasible %d x %d, X %d, blockbytes %d: %.2f sec" % (
+            m, n, k, blockbytes, secs), same
+            and np.allclose( chk.obj, lp.c.dot( X ))
+            and chk.ok[0] and not chk.ok[1:].all() )
+
+    # the worst row is a real one
+j = chk.rowviol.argmax()
+i = chk.rowworst[j]
+Ax = lp.A[i].dot( X[:, j] )[0]
+check( "rowworst %d: Ax %.6g  b %.6g  blo %.6g" % (i, Ax, lp.b[i], lp.blo[i]),
+        Ax > lp.b[i] + 1e-6 or Ax < lp.blo[i] - 1e-6 )
+
+lp = gen.transportation( 30, 40, compact=True, verbose=verbose )
+sol = glp.gnulp_solve( glp.lp_to_gnulp( lp, verbose=0 ), verbose=0 )
+X = np.c_[ sol.x, sol.x * 2, sol.x - 1 ]
+chk = glp.check_many( lp, X, blockbytes=8 * 3 * 10 )
+check( "transportation PatternMatrix: ok %s" % chk.ok, list( chk.ok ) == [True, False, False]
+        and chk.boundworst[2] >= 0 and np.isclose( chk.obj[0], sol.obj ))
+
+t0 = time.time()
+lp = gen.random_feasible( bigm, bigm, k=10, verbose=verbose )
+X = np.repeat( lp.xopt[:, None], bigk, axis=1 )
+t1 = time.time()
+chk = glp.check_many( lp, X )
+print( "check_many %d x %d, X %d: %.1f sec  max rowviol %.2g" % (
+        bigm, bigm, bigk, time.time() - t1, chk.rowviol.max() ))
+
+print( "\ntest-check-many: %d differ" % check.nbad )
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+""" test-compact.py: compact_A, PatternMatrix == the float64 csr it came from
+    A * x, A[rows], tocsc, nbytes, save_lp .lp .mps .glpz, lp_to_gnulp, lp_to_linprog
+"""
+
+from __future__ import division, print_function
+import os
+import sys
+import tempfile
+import numpy as np
+from scipy import sparse
+
+import glp
+from glp.zutil import Checks, nbytes, scan_args
+
+sys.path.insert( 0, os.path.dirname( os.path.abspath( __file__ )))
+from lpgen34 import lpgen34
+
+np.set_printoptions( threshold=20, edgeitems=5, linewidth=140 )
+
+#...............................................................................
+n = 8
+d = 3
+seed = 0
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+
+A, b, c = lpgen34( n, d=d, seed=seed, verbose=0 )
+A = A.tocsr()
+A.indices = A.indices.astype( np.int64 )  # as on 64-bit builds
+A.indptr = A.indptr.astype( np.int64 )
+P = glp.compact_A( A )
+rng = np.random.RandomState( seed )
+B = sparse.random( 50, 70, density=.1, random_state=rng, format="csr" )
+B32 = glp.compact_A( B, dtype=np.float32 )
+x = rng.rand( A.shape[1] )
+rows = rng.rand( A.shape[0] ) < .5
+tmpdir = tempfile.mkdtemp()
+check = Checks( width=40 )
+
+check( "pattern: %s" % P, isinstance( P, glp.PatternMatrix ))
+check( "nbytes %d -> %d" % (nbytes( A ), nbytes( P )), nbytes( P ) * 3 < nbytes( A ))
+check( "float32: %s %s" % (B32.dtype, B32.indices.dtype),
+        B32.dtype == np.float32 and B32.indices.dtype == np.int32
+        and np.allclose( B32.toarray(), B.toarray(), rtol=1e-7 ))
+check( "A * x", np.allclose( P * x, A * x, rtol=1e-14 ))
+check( "csc A * x", np.allclose( P.tocsc() * x, A * x, rtol=1e-14 ))
+check( "A[rows]", (P[rows].toarray() == A[rows].toarray()).all() )
+check( "A.T.T, tocsc", (P.T.T.toarray() == A.toarray()).all()
+        and (P.tocsc().tocsr().toarray() == A.toarray()).all() )
+
+names = dict( rowname=glp.NameTable( fmt="r%d", n=A.shape[0] ),
+              colname=glp.NameTable( fmt="x%d", n=A.shape[1] ))
+lp = glp.LP( A=A, b=b, blo=b, c=c, problemname="lpgen34", verbose=0, **names )
+lpp = glp.LP( A=P, b=b, blo=b, c=c, problemname="lpgen34", verbose=1, **names )
+for suffix, engine in ((".lp", "native"), (".mps", "native"), (".mps.gz", "native"),
+                        (".mod", "glpk"), (".lp", "glpk")):
+    f1 = os.path.join( tmpdir, "float64" + suffix )
+    f2 = os.path.join( tmpdir, "pattern" + suffix )
+    glp.save_lp( f1, lp, engine=engine, verbose=0 )
+    glp.save_lp( f2, lpp, engine=engine, verbose=0 )
+    same = open( f1, "rb" ).read() == open( f2, "rb" ).read() if not suffix.endswith( ".gz" ) \
+        else (glp.load_lp( f1, verbose=0 ).A != glp.load_lp( f2, verbose=0 ).A).nnz == 0
+    check( "save_lp %s %s" % (engine, suffix), same )
+
+glpz, glpz64 = os.path.join( tmpdir, "pattern.glpz" ), os.path.join( tmpdir, "float64.glpz" )
+glp.save_lp( glpz, lpp, verbose=0 )
+glp.save_lp( glpz64, lp, verbose=0 )
+G = glp.load_lp( glpz, verbose=0 ).A
+check( "glpz: %s" % G, isinstance( G, glp.PatternMatrix ) and (G.toarray() == A.toarray()).all()
+        and os.path.getsize( glpz ) <= os.path.getsize( glpz64 ) - 8 * A.nnz )
+
+gnulp = glp.lp_to_gnulp( lpp, verbose=0 )
+check( "lp_to_gnulp", (glp.gnulp_to_lp( gnulp, verbose=0 ).A != A).nnz == 0 )
+_, linrec = glp.lp_to_linprog( glp.LP( A=P, b=b, blo=b, c=c, verbose=0 ), verbose=0 )
+check( "lp_to_linprog: A_eq %s" % linrec.A_eq.dtype, (linrec.A_eq != A).nnz == 0 )
+
+print( "\ntest-compact: %d differ" % check.nbad )
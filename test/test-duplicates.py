@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+""" test-duplicates.py: random_feasible + parallel rows (scaled, some < 0) + identical columns
+    merge_duplicates -> gnulp_solve -> unmerge_solution ==
+    gnulp_solve of the whole LP: the same obj, x feasible, y with the right signs, maximize too;
+    time a 10^6-row LP, half its rows copies
+"""
+
+from __future__ import division, print_function
+import sys
+import time
+import numpy as np
+from numpy import inf
+from scipy import sparse
+
+import glp
+from glp import generators as gen
+from glp.zutil import Checks, scan_args
+
+#...............................................................................
+def with_duplicates( m, n, ndup=100, k=8, seed=0, maximize=False ):
+    """ random_feasible, + ndup rows f * a_i with looser / tighter bounds, + ndup copies of columns
+        maximize: max - c x, the same x
+    """
+    lp = gen.random_feasible( m, n, k=k, seed=seed, verbose=0 )
+    rng = np.random.RandomState( seed )
+    A, b, blo, c, x = lp.A, lp.b, lp.blo, lp.c, lp.xopt
+    i = rng.randint( 0, m, size=ndup )
+    f = rng.choice( [-3, -1, .5, 2], size=ndup )
+    Ax = A.dot( x )[i]
+    hi = np.where( rng.rand( ndup ) < .5, Ax + rng.rand( ndup ), b[i] )  # still feasible
+    lo = np.where( rng.rand( ndup ) < .5, Ax - rng.rand( ndup ), -inf )
+    D = sparse.diags( f ).dot( A[i] )
+    A = sparse.vstack(( A, D )).tocsr()
+    b = np.r_[ b, np.where( f > 0, hi * f, lo * f ) ]
+    blo = np.r_[ blo, np.where( f > 0, lo * f, hi * f ) ]
+    j = rng.randint( 0, n, size=ndup )
+    A = sparse.hstack(( A, A[:, j] )).tocsr()
+    ub = np.r_[ np.where( rng.rand( n ) < .5, inf, 20 ), rng.uniform( 0, 5, size=ndup ) ]
+    sign = -1 if maximize  else 1
+    lp = glp.LP( A=A, b=b, blo=blo, c=sign * np.r_[ c, c[j] ], ub=ub, maximize=maximize,
+            problemname="duplicates %d x %d seed %d%s" % (m, n, seed, " max" if maximize  else ""),
+            verbose=0 )
+    return lp
+
+
+def solve( lp ):
+    return glp.gnulp_solve( glp.lp_to_gnulp( lp, verbose=0 ), verbose=0 )
+
+
+m = 300
+n = 400
+bigm = 10**6
+verbose = 1
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+for seed, maximize in ((0, False), (1, False), (2, False), (3, True)):
+    lp = with_duplicates( m, n, seed=seed, maximize=maximize )
+    full = solve( lp )
+    lpr, post = glp.merge_duplicates( lp, verbose=verbose )
+    sol = solve( lpr )
+    back = glp.unmerge_solution( post, sol.x, sol.y )
+    chk = glp.check_many( lp, back.x, tol=1e-8 )
+    Ax = lp.A.dot( back.x )
+    y = back.y * (-1 if maximize  else 1)
+    ysign = np.r_[ y[ Ax > lp.blo + 1e-7 ].clip( 0 ),  # y > 0 needs Ax at blo, min
+                 - y[ Ax < lp.b - 1e-7 ].clip( None, 0 ) ]
+    d = lp.c - lp.A.T.dot( back.y )
+    check( "%s: obj %.8g  full %.8g" % (lp.problemname, chk.obj[0], full.obj),
+            np.isclose( chk.obj[0], full.obj, rtol=1e-9 ) and chk.ok[0]
+            and post.nrows >= 90 and post.ncols >= 90 )
+    check( "  y signs %.2g, d == dj %s" % (ysign.max( initial=0 ),
+            np.allclose( d[post.keepcols], sol.dj, atol=1e-8 )),
+            ysign.max( initial=0 ) < 1e-8 and np.allclose( d[post.keepcols], sol.dj, atol=1e-8 ))
+
+lp = glp.LP( A=sparse.csr_matrix( np.array([[1., 2], [-2, -4]] )), b=[1, -4], c=[1, 1], verbose=0 )
+check( "infeasible: x + 2y <= 1, -2x - 4y <= -4",
+        glp.merge_duplicates( lp, verbose=0 )[1].status == "infeasible" )
+
+    # the caller's A is not changed: explicit 0s
+A = sparse.csr_matrix( (np.array([1., 2, 0, 2, 4]), np.array([0, 1, 2, 0, 1]), np.array([0, 3, 5]) ),
+        shape=(2, 3) )  # canonical, a 0
+data = A.data.copy()
+lp = glp.LP( A=A, b=[1, 2], c=[1, 1, 1], verbose=0 )
+lpr, post = glp.merge_duplicates( lp, verbose=0 )
+check( "caller's A unchanged, %d rows merged" % post.nrows,
+        lp.A is A and A.nnz == 5 and np.array_equal( A.data, data ) and post.nrows == 1 )
+
+lp = gen.random_feasible( bigm // 2, bigm, k=10, verbose=0 )
+A = sparse.vstack(( lp.A, 3 * lp.A )).tocsr()
+lp = glp.LP( A=A, b=np.r_[ lp.b, 3 * lp.b ], blo=np.r_[ lp.blo, 3 * lp.blo ], c=lp.c, verbose=0 )
+t0 = time.time()
+lpr, post = glp.merge_duplicates( lp, verbose=verbose )
+print( "merge_duplicates %d non0: %.1f sec" % (A.nnz, time.time() - t0 ))
+check( "big: %d of %d rows merged" % (post.nrows, bigm), post.nrows == bigm // 2 )
+
+print( "\ntest-duplicates: %d differ" % check.nbad )
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+""" test-generators.py: glp.generators
+    latin_square_A == the old lil_matrix + vstack A2 A3 A4, row for row
+    GLPK simplex reaches the known optima of klee_minty_sparse, random_feasible
+    the same seed -> the same LP;  time a ~ 10^7-nonzero latin_square
+"""
+
+from __future__ import division, print_function
+import sys
+import time
+import numpy as np
+from scipy import sparse
+
+import glp
+from glp import generators as gen
+from glp.zutil import Checks, scan_args
+
+#...............................................................................
+def latin_lil( n, d ):
+    """ the old lpgen34 A2 A3 A4: a lil_matrix row per line of the cube, vstack """
+    cube = np.arange( n**d ).reshape( (n,) * d )
+    line = np.arange( n )
+    rows = []
+    for axis in range( d-1, -1, -1 ):
+        for ix in np.ndindex( *(n,) * (d-1) ):
+            ix = list( ix )
+            ix.insert( axis, line )
+            row = sparse.lil_matrix( (1, n**d) )
+            row[0, cube[tuple( ix )]] = 1
+            rows.append( row.tocsr() )
+    return sparse.vstack( rows ).tocsr()
+
+
+def solve( lp ):
+    return glp.gnulp_solve( glp.lp_to_gnulp( lp, verbose=0 ), verbose=0 )
+
+
+#...............................................................................
+bign = 150  # latin_square d=3: 3 n^3 nonzeros, 150: 10^7
+verbose = 0
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks( width=50 )
+
+for d, n in ((2, 7), (3, 5), (4, 3)):
+    check( "latin_square_A d %d n %d" % (d, n),
+            (gen.latin_square_A( n, d ) != latin_lil( n, d )).nnz == 0 )
+
+for d in (5, 12):
+    lp = gen.klee_minty_sparse( d, verbose=verbose )
+    sol = solve( lp )
+    check( "klee_minty_sparse d %d: max %g" % (d, sol.obj), np.isclose( sol.obj, lp.fopt ))
+lp = gen.klee_minty( 10, inc=0, verbose=verbose )
+check( "klee_minty d 10 inc 0: min %g" % solve( lp ).obj, np.isclose( solve( lp ).obj, - 5.**10 ))
+
+for seed in range( 3 ):
+    lp = gen.random_feasible( 300, 500, k=8, seed=seed, verbose=verbose )
+    sol = solve( lp )
+    check( "random_feasible seed %d: %.6g  known %.6g" % (seed, sol.obj, lp.fopt),
+            np.isclose( sol.obj, lp.fopt, rtol=1e-8 ))
+    lp2 = gen.random_feasible( 300, 500, k=8, seed=seed, verbose=verbose )
+    check( "  same seed, same LP", all( np.array_equal( lp[k], lp2[k] ) for k in "b blo c".split() )
+            and (lp.A != lp2.A).nnz == 0 )
+
+lp = gen.transportation( 20, 30, verbose=verbose )
+sol = solve( lp )
+Ax = lp.A.dot( sol.x )
+check( "transportation 20 x 30: %s  %.6g" % (sol.status, sol.obj),
+        sol.status == "opt" and (Ax[:20] <= lp.b[:20] + 1e-6).all()
+        and (Ax[20:] >= lp.blo[20:] - 1e-6).all() )
+
+t0 = time.time()
+lp = gen.latin_square( bign, d=3, compact=True, verbose=verbose )
+print( "latin_square n %d d 3 compact: A %s  %d non0  %.1f sec" % (
+        bign, lp.A.shape, lp.A.nnz, time.time() - t0 ))
+t0 = time.time()
+lp = gen.random_feasible( 10**6, 10**6, k=10, verbose=verbose )
+print( "random_feasible 10^6 x 10^6 k 10: %d non0  %.1f sec" % (lp.A.nnz, time.time() - t0 ))
+
+print( "\ntest-generators: %d differ" % check.nbad )
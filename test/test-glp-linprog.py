@@ -58,7 +58,7 @@ for lpfile in fileargs \
     print( "--", lpfile )
 
     lp, linrec = glp.load_lp( lpfile, to="linprog" )
-        # lp: Bag( A b c blo lb ub ) after rows_le
+        # lp: Bag( A b c blo lb ub ), minimize
         # linrec: Bag( A_ub b_ub A_eq b_eq bounds c ), [A_ub A_eq] x <= [b_ub b_eq]
     ptime()
 
@@ -72,7 +72,7 @@ for lpfile in fileargs \
             f, lpfile, method, niter ))
     print( "x:", x )  # print_options
     print( "c:", lp.c )
-    glp.lp_check( lp, x )  # lp after rows_le
+    glp.lp_check( lp, x )
 
     if save:
         out = tag + ".npz"
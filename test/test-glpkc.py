@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+""" test-glpkc.py: glpkc C calls == pyglpk per-Bar, on the same LP
+    lp_to_gnulp bulk / per-Bar x gnulp_to_lp bulk / per-Bar -> the same A b c ... names,
+    solutions and basis the same;  time both.
+    The input checks, no GLPK: check_coo check_ix check_names raise ValueError.
+    glpkc is opt-in, glpkc.enable(); without a known pyglpk only the checks run.
+"""
+
+from __future__ import division, print_function
+import sys
+import time
+import numpy as np
+from scipy import sparse
+
+import glp
+from glp import glpkc
+from glp import generators as gen
+from glp.lp_gnu import gnulp_bounds, gnulp_solution
+from glp.names import NameTable
+from glp.zutil import Checks, scan_args
+
+def raises( f, *args ):
+    try:
+        f( *args )
+    except ValueError as e:
+        return str( e )
+    return False
+
+def to_gnulp( lp, bulk ):
+    glpkc.enable( bulk )
+    t0 = time.time()
+    gnulp = glp.lp_to_gnulp( lp, verbose=0 )
+    return gnulp, time.time() - t0
+
+def to_lp( gnulp, bulk ):
+    glpkc.enable( bulk )
+    return glp.gnulp_to_lp( gnulp, drop_uncon=False, verbose=0 )
+
+def lpdiff( lp1, lp2 ):
+    diff = []
+    if (abs( glp.scipy_A( lp1.A ) - glp.scipy_A( lp2.A )) > 0).nnz:
+        diff.append( "A" )
+    diff += [k for k in "b blo c lb ub".split() if not np.array_equal( lp1[k], lp2[k] )]
+    diff += [k for k in "rowname colname".split() if list( lp1[k] ) != list( lp2[k] )]
+    return diff
+
+
+#...............................................................................
+m = 1000
+n = 1500
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+    # the input checks, GLPK would abort()
+check( "check_coo: duplicate (i, j)",
+        "duplicate" in (raises( glpkc.check_coo, [0, 2, 0], [1, 1, 1], (3, 3) ) or "") )
+check( "check_coo: i out of range", raises( glpkc.check_coo, [0, 3], [1, 1], (3, 3) ))
+check( "check_coo: ok", not raises( glpkc.check_coo, [0, 2, 0], [1, 1, 2], (3, 3) ))
+check( "check_ix: -1", raises( glpkc.check_ix, [-1, 0], 3, "rows" ))
+check( "check_names: 256 bytes", raises( glpkc.check_names, [b"x", b"y" * 256] ))
+check( "check_names: tab", raises( glpkc.check_names, [b"x", b"a\tb"] ))
+nt = NameTable.from_names([ "a", u"é" * 128, "" ])  # 256 bytes
+check( "check_names NameTable: 128 x 2-byte utf-8", raises( glpkc.check_names, nt ))
+nt = NameTable.from_names([ "a", "b\x01", "", "c" ])
+check( "check_names NameTable: \\x01 in name 1",
+        "name 1 " in (raises( glpkc.check_names, nt ) or "") )
+check( "check_names NameTable: ok, empty names", not raises( glpkc.check_names,
+        NameTable.from_names([ "", "a", "", "bb", "" ])))
+
+glpkc.enable()
+have = glpkc.prob_ptr( glp.lp_to_gnulp( gen.klee_minty( 3, verbose=0 ), verbose=0 )) is not None
+print( "\nglpkc: pyglpk %s, %s" % (glpkc.pyglpk_version(),
+        "C calls" if have  else "not available here -- per-Bar only" ))
+check( "not a glpk.LPX: prob_ptr None", glpkc.prob_ptr( object() ) is None )
+glpkc.enable( False )
+check( "not enabled: prob_ptr None", glpkc.prob_ptr( glp.lp_to_gnulp(
+        gen.klee_minty( 3, verbose=0 ), verbose=0 )) is None )
+
+if have:
+    lp = gen.random_feasible( m, n, verbose=0 )
+    lp.rowname = ["r%d" % i for i in range( m )]
+    lp.colname = NameTable.from_names([ u"x_é%d" % j for j in range( n )])
+    ref = None
+    for bulk_in in (True, False):
+        gnulp, secs = to_gnulp( lp, bulk_in )
+        glp.gnulp_solve( gnulp, verbose=0 )
+        for bulk_out in (True, False):
+            back = to_lp( gnulp, bulk_out )
+            glpkc.enable( bulk_out )
+            x, y, dj, Ax = gnulp_solution( gnulp )
+            bounds = gnulp_bounds( gnulp )
+            basis = glp.gnulp_basis( gnulp )
+            diff = lpdiff( lp, back )
+            if ref is None:
+                ref = (x, y, dj, Ax, basis)
+            else:
+                if not all( np.allclose( u, v, rtol=1e-12, atol=1e-12 )
+                            for u, v in zip( (x, y, dj, Ax), ref[:4] )):
+                    diff.append( "solution" )
+                if not (np.array_equal( basis.rows, ref[4].rows )
+                        and np.array_equal( basis.cols, ref[4].cols )):
+                    diff.append( "basis" )
+            check( "lp_to_gnulp %s %.3f sec, gnulp_to_lp %s: %s" % (
+                    "bulk" if bulk_in  else "per-Bar", secs, "bulk" if bulk_out  else "per-Bar",
+                    " ".join( diff )), not diff )
+    glpkc.enable()
+    dup = glp.LP( A=sparse.csr_matrix( ([1., 2.], [1, 1], [0, 2, 2]), shape=(2, 3) ),
+            b=np.ones( 2 ), c=np.zeros( 3 ), verbose=0 )  # A[0, 1] twice
+    check( "lp_to_gnulp, duplicate A[0, 1]: ValueError, no abort()",
+            raises( glp.lp_to_gnulp, dup, 0 ))
+
+glpkc.enable( False )
+print( "\ntest-glpkc: %d differ" % check.nbad )
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+""" test-glpz.py: write_glpz -> read_glpz round trips, field for field, exact
+    csr float64 with names, mipvars, maximize;  PatternMatrix, generated names;
+    compact_A int32 / float32;  lazy fields, memmaps, mode "c" leaves the file alone,
+    pickle -> a plain Bag;  save_lp / load_lp .glpz;  time a load vs .mps
+"""
+
+from __future__ import division, print_function
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+from numpy import inf
+from scipy import sparse
+
+import glp
+from glp import generators as gen
+from glp.names import NameTable
+from glp.zutil import Bag, Checks, scan_args
+
+def lpdiff( lp1, lp2 ):
+    """ -> the fields that differ, A dtypes and class too """
+    A1, A2 = lp1.A, lp2.A
+    diff = []
+    if type(A1) is not type(A2) or A1.shape != A2.shape or A1.dtype != A2.dtype \
+    or not np.array_equal( A1.indptr, A2.indptr ) or not np.array_equal( A1.indices, A2.indices ) \
+    or not np.array_equal( A1.data, A2.data ):
+        diff.append( "A" )
+    diff += [k for k in "b blo c lb ub".split() if not np.array_equal( lp1[k], lp2[k] )]
+    for k in ("rowname", "colname", "mipvars"):
+        x1, x2 = lp1.get( k ), lp2.get( k )
+        if (x1 is None) != (x2 is None) or x1 is not None and list( x1 ) != list( x2 ):
+            diff.append( k )
+    diff += [k for k in ("problemname", "maximize") if lp1[k] != lp2[k]]
+    return diff
+
+def mapped( x ):
+    """ x a view of a np.memmap, no copy ? """
+    while x is not None and not isinstance( x, np.memmap ):
+        x = getattr( x, "base", None )
+    return x is not None
+
+def roundtrip( what, lp ):
+    glpzfile = os.path.join( tmpdir, "lp.glpz" )
+    glp.write_glpz( glpzfile, lp, verbose=0 )
+    back = glp.read_glpz( glpzfile, verbose=0 )
+    diff = lpdiff( lp, back )
+    check( "%s %s: %s" % (what, back.A.__class__.__name__, " ".join( diff )), not diff )
+    return glpzfile, back
+
+
+#...............................................................................
+m = 300
+n = 400
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+tmpdir = tempfile.mkdtemp( prefix="test-glpz" )
+
+rng = np.random.RandomState( 0 )
+A = sparse.random( m, n, density=.02, random_state=rng, format="csr" )
+b = rng.rand( m )
+blo = np.where( rng.rand( m ) < .3, b - 1, - inf )
+lb = np.where( rng.rand( n ) < .2, - inf, 0 )
+ub = np.where( rng.rand( n ) < .2, 3, inf )
+lp = glp.LP( A=A, b=b, blo=blo, c=rng.randn( n ), lb=lb, ub=ub, maximize=True,
+        problemname="rand", rowname=["r%d" % i for i in range( m )],
+        colname=[u"xé%d" % j for j in range( n )],  # utf-8, 2 bytes
+        mipvars=np.where( rng.rand( n ) < .1, "i", "c" ), verbose=0 )
+glpzfile, back = roundtrip( "csr, names, mipvars, maximize", lp )
+
+    # lazy: nothing mapped until asked for, memmaps
+back = glp.read_glpz( glpzfile, verbose=0 )
+check( "lazy: no fields before access", not set( dict.keys( back )) & {"A", "b", "colname"} )
+check( "b, A.data A.indices on memmaps",
+        mapped( back.b ) and mapped( back.A.data ) and mapped( back.A.indices ))
+    # mode "c": copy-on-write, the file unchanged
+back.b[:] = 0
+check( "mode c: lp.b = 0 leaves the file", np.array_equal( glp.read_glpz( glpzfile, verbose=0 ).b, b ))
+ro = glp.read_glpz( glpzfile, mode="r", verbose=0 )
+try:
+    ro.b[0] = 1
+    check( "mode r: read-only", False )
+except ValueError:
+    check( "mode r: read-only", True )
+    # pickle -> a plain Bag, all fields
+p = pickle.loads( pickle.dumps( glp.read_glpz( glpzfile, verbose=0 )))
+check( "pickle -> Bag, all fields", type(p) is Bag and not lpdiff( lp, p ))
+
+    # PatternMatrix, generated names
+lpt = gen.transportation( 20, 30, compact=True, verbose=0 )
+lpt.colname = NameTable.generated( "x%d", lpt.A.shape[1] )
+_, back = roundtrip( "transportation compact, x%d names", lpt )
+check( "  generated names stay generated", back.colname.fmt == "x%d" )
+    # int32 indices, float32 data
+lpc = glp.LP( A=glp.compact_A( A, dtype=np.float32, verbose=0 ), b=b, blo=blo, c=lp.c,
+        verbose=0 )
+roundtrip( "compact_A float32 int32", lpc )
+    # empty rows and columns, no names
+lpe = glp.LP( A=sparse.csr_matrix( (3, 4) ), b=np.ones( 3 ), c=np.zeros( 4 ), verbose=0 )
+roundtrip( "empty A 3 x 4", lpe )
+
+    # save_lp / load_lp .glpz vs .mps
+big = gen.random_feasible( 10 * m, 10 * n, verbose=0 )
+big.problemname = "rf"
+mpsfile = os.path.join( tmpdir, "rf.mps" )
+glpzfile = os.path.join( tmpdir, "rf.glpz" )
+glp.save_lp( mpsfile, big, verbose=0 )
+glp.save_lp( glpzfile, big, verbose=0 )
+t0 = time.time()
+lpm = glp.load_lp( mpsfile, verbose=0 )
+t1 = time.time()
+lpz = glp.load_lp( glpzfile, verbose=0 )
+lpz.A, lpz.b  # map
+t2 = time.time()
+diff = lpdiff( big, lpz )
+check( "save_lp load_lp .glpz %s: %.3f sec, .mps %.3f  %s" % (
+        lpz.A.shape, t2 - t1, t1 - t0, " ".join( diff )), not diff )
+
+shutil.rmtree( tmpdir, ignore_errors=True )
+print( "\ntest-glpz: %d differ" % check.nbad )
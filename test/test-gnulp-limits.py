@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+""" test-gnulp-limits.py: gnulp_solve time_limit iter_limit cancel progress subprocess
+    random_feasible big enough to take a few sec:
+    a time_limit returns soon, "timeout", with x from the last basis;
+    iter_limit, 50 iters counted with glpkc; cancel from a progress callback;
+    simplex in a subprocess, not killed while sending; interior in a subprocess, killed;
+    no limits == before
+"""
+
+from __future__ import division, print_function
+import sys
+import threading
+import time
+import numpy as np
+
+import glp
+from glp import generators as gen, glpkc
+from glp.zutil import Checks, scan_args
+
+m = 1500
+n = 2000
+time_limit = .5
+verbose = 1
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+def solve( **kw ):
+    gnulp = glp.lp_to_gnulp( lp, verbose=0 )
+    t0 = time.time()
+    sol = glp.gnulp_solve( gnulp, verbose=verbose, **kw )
+    return sol, time.time() - t0, gnulp
+
+lp = gen.random_feasible( m, n, verbose=0 )
+
+sol, secs, _ = solve()
+check( "no limits: obj %.8g  fopt %.8g  %s  %.1f sec" % (sol.obj, lp.fopt, sol.status, secs),
+        sol.status == "opt" and np.isclose( sol.obj, lp.fopt, rtol=1e-9 ))
+tfull = secs
+
+sol, secs, _ = solve( time_limit=time_limit )
+check( "time_limit %g: %s %s  %.2f sec, x %s" % (
+        time_limit, sol.status, sol.status_primal, secs, sol.x.shape ),
+        sol.status == "timeout" and secs < time_limit + .5 and len(sol.x) == n )
+
+sol, secs, gnulp = solve( iter_limit=50 )
+counted = glpkc.prob_ptr( gnulp ) is not None  # glp_get_it_cnt, else None
+check( "iter_limit 50: %s  %s iters" % (sol.status, sol.iters),
+        sol.status == "itlim" and sol.iters == (50 if counted  else None) )
+
+try:
+    solve( solver="interior", iter_limit=50 )
+    raised = False
+except ValueError:
+    raised = True
+check( "iter_limit interior: ValueError, not ignored", raised )
+
+    # progress every .2 sec, cancel after 3 calls
+cancel = threading.Event()
+calls = []
+def progress( pr ):
+    calls.append( pr )
+    if verbose:
+        print( "progress: %s iters  obj %.6g  infeas %.3g  %.2f sec" % (
+                pr.iters, pr.obj, pr.infeas, pr.time ))
+    if len(calls) >= 3:
+        cancel.set()
+sol, secs, _ = solve( cancel=cancel, progress=progress, every=.2 )
+check( "cancel after 3 progress calls: %s  %d calls  %.2f sec" % (sol.status, len(calls), secs),
+        sol.status == "cancelled" and len(calls) == 3
+        and all( c.infeas >= 0 and c.time > 0 for c in calls ))
+
+    # chunks with progress, no cancel, == the plain solve
+sol, secs, _ = solve( progress=lambda pr: None, every=.2 )
+check( "progress chunks to the end: obj %.8g  %s" % (sol.obj, sol.status),
+        sol.status == "opt" and np.isclose( sol.obj, lp.fopt, rtol=1e-9 ))
+
+    # simplex in a subprocess: stops itself, the parent gets its basis
+sol, secs, gnulp = solve( time_limit=time_limit, subprocess=True )
+basis = glp.gnulp_basis( gnulp )
+check( "simplex subprocess time_limit: %s  %.2f sec  %d basic" % (
+        sol.status, secs, (basis.rows == 1).sum() + (basis.cols == 1).sum() ),
+        sol.status == "timeout" and sol.x is not None
+        and (basis.rows == 1).sum() + (basis.cols == 1).sum() == m )
+sol2 = glp.gnulp_solve( gnulp, scale=False, verbose=0 )  # warm from that basis
+check( "  then on from that basis: obj %.8g  %s" % (sol2.obj, sol2.status),
+        sol2.status == "opt" and np.isclose( sol2.obj, lp.fopt, rtol=1e-9 ))
+
+    # a child slow to send, 2 sec in gnulp_basis, past time_limit + grace: not killed
+gnulp_basis = glp.lp_gnu.gnulp_basis
+def slow_basis( gnulp ):
+    time.sleep( 2 )
+    return gnulp_basis( gnulp )
+glp.lp_gnu.gnulp_basis = slow_basis  # the forked child has it
+try:
+    sol, secs, _ = solve( time_limit=time_limit, subprocess=True )
+finally:
+    glp.lp_gnu.gnulp_basis = gnulp_basis
+check( "  a slow send: %s  %.2f sec" % (sol.status, secs),
+        sol.status == "timeout" and sol.x is not None and secs > time_limit + 2 )
+
+    # interior has no tm_lim: a subprocess, killed
+ticks = []
+sol, secs, _ = solve( solver="interior", time_limit=time_limit, progress=ticks.append, every=.1 )
+check( "interior time_limit: %s  %.2f sec  %d ticks" % (sol.status, secs, len(ticks)),
+        sol.status == "timeout" and sol.x is None and secs < time_limit + 1 and ticks )
+ref, _, _ = solve( solver="interior" )  # status_i "infeas" on this one, GLPK 5.0
+sol, secs, _ = solve( solver="interior", time_limit=10 * tfull + 10 )
+check( "interior subprocess to the end: obj %.8g  %s  in-process %.8g  %s" % (
+        sol.obj, sol.status, ref.obj, ref.status ),
+        sol.status == ref.status and np.allclose( sol.x, ref.x ))
+
+print( "\ntest-gnulp-limits: %d differ" % check.nbad )
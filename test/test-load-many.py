@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+""" test-load-many.py: load_many == load_lp file by file, errors in .error, the rest run on
+    a garbage file -> its traceback;  a worker that dies, os._exit like a GLPK abort(),
+    breaks the pool: only that file gets "worker died", the others rerun;
+    to="linprog";  time load_many vs a loop
+"""
+
+from __future__ import division, print_function
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+
+import glp
+from glp import generators as gen
+from glp.zutil import Checks, scan_args
+
+def same( lp1, lp2 ):
+    return lp1.A.shape == lp2.A.shape and (abs( lp1.A - lp2.A ) > 0).nnz == 0 \
+        and all( np.array_equal( lp1[k], lp2[k] ) for k in "b blo c lb ub".split() )
+
+_load_lp = glp.load_lp
+
+def crashing_load_lp( lpfile, **kw ):
+    """ "crash" files kill the worker -- fork: the pool's workers see this glp.load_lp """
+    if "crash" in os.path.basename( lpfile ):
+        os._exit( 3 )
+    return _load_lp( lpfile, **kw )
+
+
+#...............................................................................
+nfile = 8
+m = 300
+n = 400
+workers = 3
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+tmpdir = tempfile.mkdtemp( prefix="test-load-many" )
+lpfiles = []
+for seed in range( nfile ):
+    lp = gen.random_feasible( m, n, seed=seed, verbose=0 )
+    lp.problemname = "rf%d" % seed
+    lpfiles.append( os.path.join( tmpdir, "rf%d.mps" % seed ))
+    glp.save_lp( lpfiles[-1], lp, verbose=0 )
+t0 = time.time()
+ref = dict( (f, glp.load_lp( f, verbose=0 )) for f in lpfiles )
+tloop = time.time() - t0
+
+t0 = time.time()
+res = dict( (r.lpfile, r) for r in glp.load_many( lpfiles, workers=workers ))
+tmany = time.time() - t0
+check( "load_many %d files == load_lp: %.2f sec, a loop %.2f" % (nfile, tmany, tloop),
+        sorted( res ) == sorted( lpfiles )
+        and all( r.error is None and same( r.lp, ref[f] ) for f, r in res.items() ))
+
+    # errors: garbage, a worker that dies
+badfile = os.path.join( tmpdir, "bad.mps" )
+with open( badfile, "w" ) as f:
+    f.write( "garbage\n" )
+crashfile = os.path.join( tmpdir, "crash.mps" )
+shutil.copy( lpfiles[0], crashfile )
+glp.load_lp = crashing_load_lp
+files = lpfiles[:3] + [badfile, crashfile] + lpfiles[3:]
+res = dict( (r.lpfile, r) for r in glp.load_many( files, workers=workers ))
+glp.load_lp = _load_lp
+check( "garbage file: its traceback in .error", res[badfile].lp is None
+        and "Error" in (res[badfile].error or "") )
+check( "crash: worker died, BrokenProcessPool",
+        "worker died" in (res[crashfile].error or "") )
+check( "  the other %d files rerun, all there" % nfile, sorted( res ) == sorted( files )
+        and all( res[f].error is None and same( res[f].lp, ref[f] ) for f in lpfiles ))
+
+    # to="linprog"
+res = list( glp.load_many( lpfiles[:2], to="linprog", workers=workers ))
+check( "to=linprog: lp and linrec", all( r.error is None and r.linrec is not None
+        and r.linrec.A_ub is not None for r in res ))
+
+shutil.rmtree( tmpdir, ignore_errors=True )
+print( "\ntest-load-many: %d differ" % check.nbad )
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+""" test-lpcache.py: load_lp( cache= ) hit miss invalidation eviction
+    miss -> load_lp, hit == the same LP without parsing, a touched file reuses its entry,
+    a copy gets its own entry, hard links, both paths keep stat hits,
+    changed contents -> a new entry, verify=True catches a change with the same size mtime,
+    cache_clear, evict to maxbytes;  time a hit vs a load
+"""
+
+from __future__ import division, print_function
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+
+import glp
+from glp import generators as gen
+from glp import lpcache
+from glp.zutil import Checks, scan_args
+
+def same( lp1, lp2 ):
+    return lp1.A.shape == lp2.A.shape and (abs( lp1.A - lp2.A ) > 0).nnz == 0 \
+        and all( np.array_equal( lp1[k], lp2[k] ) for k in "b blo c lb ub".split() ) \
+        and list( lp1.colname ) == list( lp2.colname )
+
+def nentries():
+    return len( lpcache._entries( cachedir ))
+
+def load( lpfile, **kw ):
+    t0 = time.time()
+    lp = lpcache.cached_load( lpfile, cache=cachedir, verbose=0, **kw )
+    return lp, time.time() - t0
+
+
+#...............................................................................
+m = 1000
+n = 1500
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+tmpdir = tempfile.mkdtemp( prefix="test-lpcache" )
+cachedir = os.path.join( tmpdir, "cache" )
+lpfile = os.path.join( tmpdir, "rf.mps" )
+lp = gen.random_feasible( m, n, verbose=0 )
+lp.problemname = "rf"
+glp.save_lp( lpfile, lp, verbose=0 )
+ref = glp.load_lp( lpfile, verbose=0 )
+
+lp1, tmiss = load( lpfile )
+check( "miss: load_lp %.3f sec, 1 entry" % tmiss, same( lp1, ref ) and nentries() == 1 )
+lp2, thit = load( lpfile )
+check( "hit: %.3f sec, the same LP" % thit, same( lp2, ref ) and nentries() == 1 )
+
+    # touch: a new key, the same sha1 -> the entry is reused
+st = os.stat( lpfile )
+os.utime( lpfile, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9) )
+key0 = lpcache.cache_key( lpfile )
+lp3, _ = load( lpfile )
+check( "touched: the same entry, rekeyed", same( lp3, ref ) and nentries() == 1
+        and os.path.isdir( os.path.join( cachedir, key0 )))
+
+    # a copy: its own entry, hard links, the original keeps its stat hit
+copyfile = os.path.join( tmpdir, "copy.mps" )
+shutil.copy( lpfile, copyfile )
+lpc, _ = load( copyfile )
+ckey = lpcache.cache_key( copyfile )
+nsha1 = [0]
+file_sha1 = lpcache.file_sha1
+def counted_sha1( f, *args ):
+    nsha1[0] += 1
+    return file_sha1( f, *args )
+lpcache.file_sha1 = counted_sha1
+load( lpfile )
+load( copyfile )
+lpcache.file_sha1 = file_sha1
+meta = lpcache._meta( os.path.join( cachedir, ckey ))
+check( "copy: 2 entries, its own lpfile, then plain hits, %d sha1s" % nsha1[0],
+        same( lpc, ref ) and nentries() == 2 and nsha1[0] == 0
+        and meta["lpfile"] == os.path.abspath( copyfile )
+        and os.path.isdir( os.path.join( cachedir, key0 )))
+check( "cache_clear copy: 1, the original stays",
+        glp.cache_clear( copyfile, cache=cachedir, verbose=0 ) == 1 and nentries() == 1
+        and same( load( lpfile )[0], ref ))
+
+    # changed contents -> a new entry
+lpb = gen.random_feasible( m, n, seed=1, verbose=0 )
+lpb.problemname = "rf"
+glp.save_lp( lpfile, lpb, verbose=0 )
+refb = glp.load_lp( lpfile, verbose=0 )
+lp4, _ = load( lpfile )
+check( "changed: a new entry", same( lp4, refb ) and nentries() == 2 )
+
+    # changed in place, the same size and mtime: a stale hit unless verify=True
+st = os.stat( lpfile )
+with open( lpfile, "r+b" ) as f:
+    data = bytearray( f.read() )
+    k = data.index( b"RHS" )
+    data[k - 2 : k - 1] = b"7" if data[k - 2 : k - 1] != b"7"  else b"3"  # a digit
+    f.seek( 0 )
+    f.write( data )
+os.utime( lpfile, ns=(st.st_atime_ns, st.st_mtime_ns) )
+refc = glp.load_lp( lpfile, verbose=0 )
+lp5, _ = load( lpfile )
+lp6, _ = load( lpfile, verify=True )
+check( "same size mtime: stale hit, verify=True reloads",
+        same( lp5, refb ) and not same( refc, refb ) and same( lp6, refc ))
+
+    # cache_clear, evict
+check( "cache_clear lpfile", glp.cache_clear( lpfile, cache=cachedir, verbose=0 ) == 2
+        and nentries() == 0 )
+for seed in range( 3 ):
+    other = os.path.join( tmpdir, "rf%d.mps" % seed )
+    shutil.copy( lpfile, other )
+    with open( other, "a" ) as f:
+        f.write( "* %d\n" % seed )  # different sha1s
+    load( other )
+    time.sleep( .01 )
+sizes = [lpcache._dirbytes( e ) for e in sorted( lpcache._entries( cachedir ),
+            key=os.path.getmtime )]
+total = lpcache.evict( cachedir, sum( sizes[1:] ))
+check( "evict to %d bytes: the oldest entry dropped" % total,
+        nentries() == 2 and total == sum( sizes[1:] ))
+check( "cache_clear all", glp.cache_clear( cache=cachedir, verbose=0 ) == 2 and nentries() == 0 )
+
+print( "load_lp %.3f sec  cache hit %.3f sec" % (tmiss, thit) )
+shutil.rmtree( tmpdir, ignore_errors=True )
+print( "\ntest-lpcache: %d differ" % check.nbad )
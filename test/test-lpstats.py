@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+""" test-lpstats.py: lp_stats( lp ) == plain numpy / scipy counts, small blocks too;
+    cached per A, recomputed after lp.b = ... or lp.c *= -1, dropped with A;  time print_lp on a big LP
+"""
+
+from __future__ import division, print_function
+import gc
+import sys
+import time
+import numpy as np
+from numpy import inf
+from scipy import sparse
+from scipy.sparse.linalg import norm
+
+import glp
+from glp import generators as gen, lpstats
+from glp.zutil import Checks, scan_args
+
+#...............................................................................
+m = 2000
+n = 3000
+density = .003
+bigm = 10**6
+seed = 0
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks( width=50 )
+
+rng = np.random.RandomState( seed )
+A = sparse.random( m, n, density=density, random_state=rng, format="csr" )
+A.data = rng.randn( A.nnz ) * 10. ** rng.randint( -3, 4, size=A.nnz )
+b = np.where( rng.rand( m ) < .2, inf, rng.rand( m ) * 10 )
+blo = np.where( rng.rand( m ) < .3, b, np.where( rng.rand( m ) < .5, -inf, -1 ))
+lb = np.where( rng.rand( n ) < .2, -inf, 0 )
+ub = np.where( rng.rand( n ) < .5, inf, np.where( rng.rand( n ) < .1, lb, 3 ))
+c = np.where( rng.rand( n ) < .6, 0, rng.randn( n ))
+lp = glp.LP( A=A, b=b, blo=blo, c=c, lb=lb, ub=ub, verbose=0 )
+
+absA = abs( A.data )
+rownorm = norm( A, axis=1, ord=inf )
+rownnz = np.diff( A.indptr )
+colnnz = np.diff( A.tocsc().indptr )
+for block in (1 << 22, 100):
+    st = glp.lp_stats( lp, cache=False, block=block )
+    q = glp.sketch_quantiles( st.A_sketch, [0, 50, 100] )
+    ptiles = np.percentile( absA, [0, 50, 100] )
+    check( "block %d: min max |a| rownorm" % block,
+            (st.A_min, st.A_max, st.A_absmin, st.A_absmax, st.rownorm_min)
+            == (A.data.min(), A.data.max(), absA.min(), absA.max(), rownorm.min())
+            and st.rownorm_near0 == (rownorm < 1e-8).sum() )
+    check( "  sketch quantiles %s" % q, ((ptiles <= q) & (q < 2 * ptiles)).all()
+            or np.allclose( q[[0, 2]], [2. ** np.ceil( np.log2( absA.min() )),
+                                        2. ** np.ceil( np.log2( absA.max() ))] ))
+check( "row col non0 hist",
+        st.rownnz_hist.sum() == m and st.colnnz_hist.sum() == n
+        and st.emptyrows == (rownnz == 0).sum() and st.emptycols == (colnnz == 0).sum()
+        and st.rownnz_hist[3] == ((4 <= rownnz) & (rownnz < 8)).sum()
+        and st.colnnz_max == colnnz.max() )
+check( "rows %s" % dict( st.rows ),
+        st.rows.eq == (b == blo).sum() and sum( st.rows.values() ) == m
+        and st.rows.le == ((blo == -inf) & (b < inf)).sum()
+        and st.rows.eq + st.rows.ranged + st.rows.ge == (blo == b).sum() + (
+            np.isfinite( blo ) & (blo < b)).sum() )
+check( "cols %s" % dict( st.cols ),
+        st.cols.fixed == (lb == ub).sum() and sum( st.cols.values() ) == n
+        and st.cols.free == ((lb == -inf) & (ub == inf)).sum() )
+check( "c nnz, ranges", st.c_nnz == np.count_nonzero( c )
+        and st.ranges.c == (c.min(), c.max()) and st.ranges.ub == (ub.min(), ub.max()) )
+
+    # cache
+st = glp.lp_stats( lp )
+check( "cached", glp.lp_stats( lp ) is st )
+c0 = c.copy()
+lp.c *= -1
+st2 = glp.lp_stats( lp )
+check( "c *= -1 -> new", st2 is not st and st2.ranges.c == (- c0.max(), - c0.min()) )
+lp.b = lp.b.copy()
+check( "lp.b = copy, same crc -> cached", glp.lp_stats( lp ) is st2 )
+lp.b = lp.b + 1
+check( "lp.b + 1 -> new", glp.lp_stats( lp ) is not st2 )
+check( "nothing stored in the LP", "_stats" not in lp )
+lp2 = glp.LP( A=lp.A, b=lp.b, blo=lp.blo, c=lp.c, lb=lp.lb, ub=lp.ub, verbose=0 )
+check( "another LP, the same A and vecs -> cached", glp.lp_stats( lp2 ) is glp.lp_stats( lp ))
+ncache = len( lpstats._cache )
+del lp2
+A1 = lp.A.copy()
+glp.lp_stats( glp.LP( A=A1, b=lp.b, blo=lp.blo, c=lp.c, lb=lp.lb, ub=lp.ub, verbose=0 ))
+check( "A copy -> new entry", len( lpstats._cache ) == ncache + 1 )
+del A1
+gc.collect()
+check( "A gone -> entry dropped", len( lpstats._cache ) == ncache )
+lp.A = lp.A[:-1]
+lp.b, lp.blo = lp.b[:-1], lp.blo[:-1]
+check( "lp.A smaller -> new", glp.lp_stats( lp ).shape == (m - 1, n) )
+
+lp = gen.transportation( 20, 30, compact=True, verbose=0 )
+st = glp.lp_stats( lp )
+check( "PatternMatrix: %s" % st.Akind, st.A_absmin == st.A_absmax == 1
+        and st.A_sketch.sum() == lp.A.nnz and st.rownnz_max == 30 and st.colnnz_max == 2 )
+np.set_printoptions( threshold=10, edgeitems=3 )
+glp.print_lp( lp, verbose=2 )
+
+lp = gen.random_feasible( bigm, bigm, k=10, verbose=0 )
+t0 = time.time()
+glp.lp_stats( lp )
+t1 = time.time()
+with open( "/dev/null", "w" ) as devnull:
+    stdout, sys.stdout = sys.stdout, devnull
+    glp.print_lp( lp )
+    sys.stdout = stdout
+t2 = time.time()
+print( "lp_stats %d x %d: %.2f sec, then print_lp cached %.3f sec" % (
+        bigm, bigm, t1 - t0, t2 - t1 ))
+
+print( "\ntest-lpstats: %d differ" % check.nbad )
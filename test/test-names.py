@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+""" test-names.py: NameTable == a list of str, for every access
+    from_names of lists, unicode arrays, numbers, None, utf-8, empty names;
+    [j] [-1] take( slice, ix, mask ) strings tolist iter np.asarray len;
+    index indices `in`, duplicates -> the first, not found -> -1;
+    generated "x%d" with and without ix, the same answers, nothing allocated;
+    nbytes vs a unicode array;  time index() of 10^5 names vs a dict
+"""
+
+from __future__ import division, print_function
+import sys
+import time
+import numpy as np
+
+from glp.names import NameTable, nametable
+from glp.zutil import Checks, scan_args
+
+def same( t, names ):
+    """ NameTable t == list names, every way to read it """
+    return len(t) == len(names) and list( t ) == names and t.tolist() == names \
+        and [t[j] for j in range( len(t) )] == names \
+        and list( np.asarray( t )) == names and list( t.strings() ) == names
+
+
+#...............................................................................
+n = 100000
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+names = ["x1", "", u"é", u"naïve ü", "x1", "a b", "", "r[3,4]", u"日本"]
+for what, arg in (("list", names), ("unicode array", np.array( names ))):
+    t = NameTable.from_names( arg )
+    check( "from_names %s == list" % what, same( t, names ))
+check( "t[-1]", t[-1] == names[-1] )
+try:
+    t[len(names)]
+    check( "t[n]: IndexError", False )
+except IndexError:
+    check( "t[n]: IndexError", True )
+check( "numbers, None -> str, \"\"", NameTable.from_names([ 3, None, 1.5 ]).tolist() == ["3", "", "1.5"] )
+check( "empty", len( NameTable.from_names( [] )) == 0 and nametable( None ) is None )
+check( "from_names( NameTable ) is it", NameTable.from_names( t ) is t )
+
+    # take
+ix = np.array([ 8, 0, 2, 2, 6 ])
+mask = np.arange( len(names) ) % 3 == 1
+check( "take slice", same( t[1:7:2], names[1:7:2] ))
+check( "take ix, repeats", same( t[ix], [names[j] for j in ix] ))
+check( "take mask", same( t[mask], [nm for nm, k in zip( names, mask ) if k] ))
+check( "take [] ", same( t[[]], [] ))
+
+    # index
+check( "index: duplicates -> the first", t.index( "x1" ) == 0 and t.index( "" ) == 1 )
+check( "index utf-8", t.index( u"日本" ) == 8 and t.index( u"naïve ü" ) == 3 )
+check( "indices, -1 not found", list( t.indices([ "a b", "nope", u"é", "x" ])) == [5, -1, 2, -1] )
+check( "in", "r[3,4]" in t and "r[3]" not in t )
+try:
+    t.index( "nope" )
+    check( "index not found: ValueError", False )
+except ValueError:
+    check( "index not found: ValueError", True )
+check( "index( default=None )", t.index( "nope", default=None ) is None )
+check( "index( default=-1 ) -> -1, as indices()",
+        t.index( "nope", default=-1 ) == -1 == t.indices([ "nope" ])[0] )
+
+    # generated
+g = NameTable.generated( "x%d", 50 )
+gl = ["x%d" % j for j in range( 50 )]
+check( "generated x%d == list, nbytes 0", same( g, gl ) and g.nbytes == 0 )
+check( "generated take -> ix", same( g[ix], [gl[j] for j in ix] ) and g[ix].fmt == "x%d" )
+check( "generated index", list( g.indices([ "x7", "x50", "y7", "x07", "x49" ])) == [7, -1, -1, -1, 49] )
+gi = g[10:20]
+check( "generated with ix: index", gi.index( "x15" ) == 5 and gi.index( "x5", None ) is None )
+r = NameTable.generated( "r(%d)", 5 )
+check( "generated r(%d)", same( r, ["r(%d)" % j for j in range( 5 )] ) and r.index( "r(3)" ) == 3 )
+
+    # big: nbytes, index vs a dict
+big = ["row_%d_%s" % (j, "abc"[j % 3] * (j % 7)) for j in range( n )]
+t = NameTable.from_names( big )
+u = np.array( big )
+check( "%d names: nbytes %.2g, unicode array %.2g" % (n, t.nbytes, u.nbytes ),
+        t.nbytes * 3 < u.nbytes and same( t[::997], big[::997] ))
+rng = np.random.RandomState( 0 )
+q = [big[j] for j in rng.randint( 0, n, 1000 )] + ["nope%d" % j for j in range( 10 )]
+t0 = time.time()
+got = t.indices( q )
+t1 = time.time()
+d = dict( (nm, j) for j, nm in reversed( list( enumerate( big ))))
+want = [d.get( nm, -1 ) for nm in q]
+t2 = time.time()
+check( "indices 1010 of %d: %.3f sec, dict build + lookup %.3f" % (n, t1 - t0, t2 - t1),
+        list( got ) == want )
+
+print( "\ntest-names: %d differ" % check.nbad )
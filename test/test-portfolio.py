@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+""" test-portfolio.py: solve_portfolio on random_feasible, all methods:
+    the winner's obj == fopt, the rest finished or killed, no workers left;
+    an infeasible LP -> method None; logfile lines
+"""
+
+from __future__ import division, print_function
+import multiprocessing
+import os
+import sys
+import tempfile
+import numpy as np
+from scipy import sparse
+
+import glp
+from glp import generators as gen
+from glp.portfolio import methods_all
+from glp.zutil import Checks, scan_args
+
+m = 300
+n = 400
+bigm = 1500
+workers = None
+verbose = 1
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+logfile = os.path.join( tempfile.mkdtemp(), "portfolio.log" )
+
+for mm, nn in ((m, n), (bigm, 4 * bigm // 3)):
+    lp = gen.random_feasible( mm, nn, verbose=0 )
+    sol = glp.solve_portfolio( lp, methods=methods_all, workers=workers,
+            logfile=logfile, verbose=verbose )
+    chk = glp.check_many( lp, sol.x, tol=1e-6 )
+    check( "%s: %s won  obj %.8g  fopt %.8g" % (lp.problemname, sol.method, sol.obj, lp.fopt),
+            sol.method in methods_all and sol.status == "opt"
+            and np.isclose( sol.obj, lp.fopt, rtol=1e-6 ) and chk.ok[0] )
+    check( "  results: %s" % " ".join( "%s %s" % (r.method, r.status) for r in sol.results ),
+            sorted( r.method for r in sol.results ) == sorted( methods_all )
+            and not multiprocessing.active_children() )
+
+    # x + y <= 1, x + y >= 2
+lp = glp.LP( A=sparse.csr_matrix( np.ones(( 2, 2 ))), b=[1, np.inf], blo=[-np.inf, 2],
+        c=[1, 1], problemname="infeasible", verbose=0 )
+sol = glp.solve_portfolio( lp, methods=["glpk-simplex", "highs"], logfile=logfile,
+        verbose=verbose )
+check( "infeasible: method %s  status %s" % (sol.method, sol.status),
+        sol.method is None and sol.status in ("nofeas", "undef")
+        and [r.status for r in sol.results if r.method == "highs"] == ["nofeas"] )
+
+lines = open( logfile ).read().splitlines()
+print( "\n".join( lines ))
+check( "logfile: %d lines" % len(lines), len(lines) == 3 )
+
+print( "\ntest-portfolio: %d differ" % check.nbad )
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+""" test-presolve.py: random_feasible + fixed, empty, singleton, forcing rows and cols
+    presolve -> smaller LP -> gnulp_solve / linprog -> postsolve ==
+    gnulp_solve of the whole LP: the same obj, x feasible, y d with the right signs
+"""
+
+from __future__ import division, print_function
+import sys
+import numpy as np
+from numpy import inf
+from scipy import sparse
+from scipy.optimize import linprog
+
+import glp
+from glp import generators as gen
+from glp.zutil import Checks, scan_args
+
+#...............................................................................
+def extended_lp( m, n, seed=0, maximize=False ):
+    """ random_feasible with every kind of reduction mixed in, x* still feasible """
+    lp = gen.random_feasible( m, n, k=6, seed=seed, verbose=0 )
+    rng = np.random.RandomState( seed )
+    x = lp.xopt
+    A, b, blo, c, lb, ub = lp.A, lp.b, lp.blo, lp.c, lp.lb.copy(), lp.ub.copy()
+    jfix = rng.choice( n, 20, replace=False )
+    lb[jfix] = ub[jfix] = x[jfix]
+    jub = rng.choice( n, 30, replace=False )  # singleton rows a x_j <= a (x_j + 1)
+    a = rng.uniform( .5, 2, size=30 ) * rng.choice( [-1, 1], size=30 )
+    S = sparse.csr_matrix( (a, (np.arange( 30 ), jub)), shape=(30, n) )
+    sb = np.where( a > 0, a * (x[jub] + 1), inf )
+    sblo = np.where( a > 0, -inf, a * (x[jub] + 1) )
+    j0 = (x == 0).nonzero()[0][:6]  # forcing: x_a + x_b <= 0, x >= 0
+    F = sparse.csr_matrix( (np.ones( 6 ), (np.arange( 6 ) // 2, j0)), shape=(3, n) )
+    E = sparse.csr_matrix( (4, n) )  # 2 empty rows, 2 free
+    A = sparse.vstack(( A, S, F, E )).tocsr()
+    A = sparse.hstack(( A, sparse.csr_matrix( (A.shape[0], 5) ))).tocsr()  # empty cols
+    b = np.r_[ b, sb, np.zeros( 3 ), 1, 0, inf, inf ]
+    blo = np.r_[ blo, sblo, np.full( 3, -inf ), -1, 0, -inf, -inf ]
+    c = np.r_[ c, rng.uniform( 0, 1, size=5 ) ]
+    lb, ub = np.r_[ lb, np.zeros( 5 ) ], np.r_[ ub, np.full( 5, 3. ) ]
+    if maximize:
+        c = - c
+    return glp.LP( A=A, b=b, blo=blo, c=c, lb=lb, ub=ub, maximize=maximize,
+            problemname="presolve-test seed%d%s" % (seed, " max" if maximize  else ""),
+            verbose=0 )
+
+
+def kkt( lp, x, y, tol=1e-6 ):
+    """ -> max violation of primal feasibility and the dual signs, min problem """
+    A = lp.A
+    sign = -1 if lp.maximize  else 1
+    yy = sign * y
+    d = sign * lp.c - A.T.dot( yy )
+    Ax = A.dot( x )
+    chk = glp.check_many( lp, x )
+    atlb = np.isclose( x, lp.lb, atol=tol )
+    atub = np.isclose( x, lp.ub, atol=tol )
+    atlo = np.isclose( Ax, lp.blo, atol=tol )
+    athi = np.isclose( Ax, lp.b, atol=tol )
+    dviol = np.r_[ np.where( atlb, 0, np.maximum( d, 0 )) * ~ atub,  # d > 0 needs x at lb
+                   np.where( atub, 0, np.maximum( - d, 0 )) * ~ atlb,
+                   np.where( athi, 0, np.maximum( - yy, 0 )) * ~ atlo,  # y < 0 needs Ax at b
+                   np.where( atlo, 0, np.maximum( yy, 0 )) * ~ athi ]
+    return max( chk.rowviol[0], chk.boundviol[0] ), dviol.max()
+
+
+def solve( lp ):
+    return glp.gnulp_solve( glp.lp_to_gnulp( lp, verbose=0 ), verbose=0 )
+
+
+m = 300
+n = 400
+verbose = 1
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+for seed, maximize in ((0, False), (1, False), (2, True)):
+    lp = extended_lp( m, n, seed=seed, maximize=maximize )
+    full = solve( lp )
+    lpr, post = glp.presolve( lp, verbose=verbose )
+    sol = solve( lpr )
+    back = glp.postsolve( post, sol.x, sol.y )
+    primal, dual = kkt( lp, back.x, back.y )
+    check( "%s: obj %.6g  full %.6g" % (lp.problemname, back.obj, full.obj),
+            post.status == "ok" and np.isclose( back.obj, full.obj, rtol=1e-8 )
+            and np.isclose( back.obj, sol.obj + post.objoffset, rtol=1e-8 )
+            and lpr.A.shape[0] < lp.A.shape[0] and lpr.A.shape[1] < lp.A.shape[1] )
+    check( "  postsolve x y: primal viol %.2g  dual sign viol %.2g" % (primal, dual),
+            primal < 1e-6 and dual < 1e-6 )
+
+    # linprog on the reduced LP
+lp = extended_lp( m, n, seed=0 )
+lpr, post = glp.presolve( lp, verbose=0 )
+_, linrec = glp.lp_to_linprog( lpr, verbose=0 )
+res = linprog( method="highs", **linrec )
+back = glp.postsolve( post, res.x )
+check( "linprog: %s  obj %.6g" % (res.status, back.obj),
+        res.status == 0 and np.isclose( back.obj, solve( lp ).obj, rtol=1e-7 ))
+
+    # infeasible, unbounded
+lp = glp.LP( A=sparse.csr_matrix( np.array([[1., 1], [1, 0]] )), b=[1, inf], blo=[-inf, 2],
+        c=[1, 1], verbose=0 )
+check( "infeasible: x0 >= 2, x0 + x1 <= 1", glp.presolve( lp, verbose=0 )[1].status == "infeasible" )
+lp = glp.LP( A=sparse.csr_matrix( (1, 2) ), b=[1], c=[-1, 0], verbose=0 )
+check( "unbounded: min - x0, x0 in no rows", glp.presolve( lp, verbose=0 )[1].status == "unbounded" )
+lp = glp.LP( A=sparse.csr_matrix( np.array([[1., 1, 0], [1, 0, 1]] )), b=[0, inf], blo=[-inf, 2],
+        c=[1, 1, 1], ub=1, verbose=0 )
+check( "infeasible: x0 + x1 <= 0, x0 + x2 >= 2, forcing x0 both ways",
+        glp.presolve( lp, verbose=0 )[1].status == "infeasible" )
+
+    # the caller's A is not changed: duplicates, explicit 0s
+A = sparse.csr_matrix( (np.array([1., 2, 0, 3]), np.array([1, 1, 0, 2]), np.array([0, 3, 4]) ),
+        shape=(2, 3) )
+before = [x.copy() for x in (A.data, A.indices, A.indptr)]
+lp = glp.LP( A=A, b=[4, 5], c=[1, 1, 1], verbose=0 )
+lpr, post = glp.presolve( lp, verbose=0 )
+check( "caller's A unchanged, not canonical", lp.A is A and all( np.array_equal( x, y )
+        for x, y in zip( before, (A.data, A.indices, A.indptr) )) and A.nnz == 4 )
+
+print( "\ntest-presolve: %d differ" % check.nbad )
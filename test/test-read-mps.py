@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+""" test-read-mps.py: load_lp( engine="native" ) == GLPK's free MPS reader, field for field
+    an edge-case file: RANGES on E L G rows, all bound types, INTORG markers, $ comments,
+    an RHS on the objective, an extra N row;
+    generated LPs written by GLPK's .mps writer, .mps and .mps.gz;  files* from the command line
+    and time both readers
+"""
+
+from __future__ import division, print_function
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+
+import glp
+from glp import generators as gen
+from glp.zutil import Checks, scan_args
+
+edge_mps = """\
+* edge cases: ranges, all bound types, integer markers, comments
+NAME          edge
+ROWS
+ N  cost
+ E  e1
+ E  e2
+ L  l1
+ G  g1
+ N  other
+ G  g2
+COLUMNS
+    x1  cost  1.5   e1  1
+    x1  l1  -2      g1  3e-1
+    MARKER  'MARKER'  'INTORG'
+    i1  cost  -1    e2  2
+    i1  g2  1
+    i2  l1  1       other  5
+    MARKER  'MARKER'  'INTEND'
+    x2  cost  2     e1  -1
+    x2  e2  1.25    g2  -1   $ a comment
+    x3  l1  1
+    x4  cost  0.5
+    x5  g1  1       g2  1
+    x6  e2  -7.5
+RHS
+    rhs  cost  100   e1  1
+    rhs  e2  2       l1  10
+    rhs  g1  -1      g2  0.5
+RANGES
+    rng  e1  3       e2  -4
+    rng  l1  5       g1  2.5
+BOUNDS
+ UP bnd  x1  4
+ MI bnd  x2
+ UP bnd  x2  -1
+ FR bnd  x3
+ FX bnd  x4  2.5
+ BV bnd  i1
+ LI bnd  i2  -3
+ UI bnd  i2  7
+ LO bnd  x5  -2
+ PL bnd  x5
+ UP bnd  x6  -1
+ENDATA
+"""
+
+def lpdiff( lp1, lp2 ):
+    """ -> the fields that differ, floats exact """
+    diff = []
+    if lp1.A.shape != lp2.A.shape or (abs( lp1.A - lp2.A ) > 0).nnz:
+        diff.append( "A" )
+    diff += [k for k in "b blo c lb ub".split() if not np.array_equal( lp1[k], lp2[k] )]
+    diff += [k for k in "rowname colname".split() if list( lp1[k] ) != list( lp2[k] )]
+    if lp1.problemname != lp2.problemname:
+        diff.append( "problemname" )
+    return diff
+
+
+#...............................................................................
+verbose = 0
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+tmpdir = tempfile.mkdtemp( prefix="test-read-mps" )
+mpsfiles = [os.path.join( tmpdir, "edge.mps" )]
+with open( mpsfiles[0], "w" ) as f:
+    f.write( edge_mps )
+for lp in (gen.random_feasible( 300, 400, verbose=0 ), gen.transportation( 30, 40, verbose=0 ),
+           gen.klee_minty( 10, verbose=0 )):
+    mpsfile = os.path.join( tmpdir, "%s.mps" % lp.problemname.split()[0] )
+    lp.problemname = lp.problemname.split()[0]
+    glp.save_lp( mpsfile, lp, verbose=0 )  # GLPK's writer
+    with open( mpsfile, "rb" ) as f, gzip.open( mpsfile + ".gz", "wb" ) as fz:
+        shutil.copyfileobj( f, fz )
+    mpsfiles += [mpsfile, mpsfile + ".gz"]
+
+for mpsfile in fileargs or mpsfiles:
+    t0 = time.time()
+    gnu = glp.load_lp( mpsfile, verbose=verbose )
+    t1 = time.time()
+    nat = glp.load_lp( mpsfile, engine="native", verbose=verbose )
+    t2 = time.time()
+    diff = lpdiff( gnu, nat )
+    check( "%s %s: glpk %.2f sec  native %.2f  %s" % (
+            os.path.basename( mpsfile ), nat.A.shape, t1 - t0, t2 - t1, " ".join( diff )),
+            not diff )
+
+shutil.rmtree( tmpdir, ignore_errors=True )
+print( "\ntest-read-mps: %d differ" % check.nbad )
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+""" test-save-mod.py: save_lp( "x.mod" ), the vectorized writer, == the old per-row writer
+    byte for byte -- old_write_amplmod below, _sumstr per row -- on LPs with = <= >= and
+    two-sided rows, +-1 and near-0 coefficients, b -0, inf ub, names;
+    small blocks == one block, .mod.gz == .mod;  free rows: skipped, the old one left
+    a dangling "name: ";  GLPK reads it back, the same optimum;  time old vs new
+"""
+
+from __future__ import division, print_function
+import gzip
+import os
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+from numpy import inf
+from scipy import sparse
+from scipy.optimize import linprog
+
+import glp
+from glp.save_lp import _write_amplmod
+from glp.zutil import Checks, scan_args
+
+#...............................................................................
+def old_write_amplmod( outfile, lp, header="", footer="end;" ):
+    """ the old _write_amplmod, print per fragment, as it was before the row blocks """
+    f = open( outfile, "w" )
+
+    def pr( *args ):
+        print( *args, end="", file=f )
+
+    if header:
+        pr( header + "\n" )
+    pr( "# problem %s;\n" % lp.problemname )  # not glpsol
+    for varname, lb, ub in zip( lp.colname, lp.lb, lp.ub ):
+        pr( "var %s >= %g" % (varname, lb) )
+        if ub != np.inf:
+            pr( ", <= %g" %  ub )
+        pr( ";\n" )
+    pr( "maximize" if lp.maximize else "minimize", " obj:" )
+    pr( _sumstr( lp.c, names=lp.colname ))  # sum c_j * x_j
+    pr( " ;\n" )
+    pr( "subject to \n" )
+    A = lp.A.tocsr()
+
+    for Arow, rowname, b, blo in zip(
+            A, lp.rowname, lp.b, lp.blo ):
+        pr( "%s: " % rowname )
+        rowsum = _sumstr( Arow, names=lp.colname )  # sum Aij * xj
+        if b == blo:
+            pr( "%s = %g ;\n" % (rowsum, b) )
+            continue
+        if np.isfinite( b ):
+            pr( "%s <= %g ;\n" % (rowsum, b) )
+        if np.isfinite( blo ):
+            if np.isfinite( b ):
+                pr( "%s_: " % rowname )  # both: row <=  row_ >=
+            pr( "%s >= %g ;\n" % (rowsum, blo) )
+    if footer:
+        pr( footer + "\n" )
+    f.close()
+
+
+def _sumstr( x, ix=None, names=None, near0=1e-10, fmt=" %+.6g*" ):
+    """ [2, -3, 1, -1] -> " +2*x0 -3*x1 +x2 -x3" """
+    if sparse.issparse( x ):
+        x = x.tocsr()
+        x, ix = x.data, x.indices
+    if ix is None:
+        ix = range( len(x) )
+    terms = []
+    for j, val in zip( ix, x ):
+        if abs(val) <= near0:
+            continue
+        s = (" +" if val == 1 else
+            " -" if val == -1 else
+            fmt % val)  # +-val*name
+        name = (names[j] if names is not None
+            else "x%d" % j)
+        terms.append( s + name)
+
+    return "".join( terms )
+
+
+def randlp( m, n, density=.02, seed=0, free=False ):
+    """ random LP: eq le ge two-sided rows, +-1 coefs, a few ~ 1e-12, lb 0 / -2, some ub """
+    rng = np.random.RandomState( seed )
+    A = sparse.random( m, n, density=density, random_state=rng, format="csr" )
+    A.data = np.round( A.data * 20 - 10, 3 )
+    A.data[::5] = np.sign( A.data[::5] )
+    A.data[::97] = 1e-12  # near0, dropped
+    A.data[ A.data == 0 ] = 1
+    lb = np.where( rng.rand( n ) < .2, -2., 0. )
+    ub = np.where( rng.rand( n ) < .3, np.round( rng.rand( n ) * 5 + 1, 1 ), inf )
+    b = np.round( A.dot( rng.rand( n )), 2 )  # A x0 ~ b, feasible-ish
+    b[::37] = -0.  # "= -0 ;"
+    kind = rng.randint( 0, 4 + free, m )  # eq le ge two-sided free
+    blo = np.select( [kind == 0, kind == 1, kind == 2, kind == 3], [b, -inf, b - 5, b - 1], -inf )
+    b[ kind == 1 ] += 5
+    b[ kind == 3 ] += 1
+    b[ (kind == 2) | (kind == 4) ] = inf
+    c = np.round( rng.randn( n ), 3 )
+    c[::11] = 1
+    return glp.LP( A=A, b=b, blo=blo, c=c, lb=lb, ub=ub, maximize=bool( seed % 2 ),
+            problemname="rand%d" % seed, rowname=["r%d" % i for i in range( m )],
+            colname=["x_%d" % j for j in range( n )], verbose=0 )
+
+def readbytes( fname ):
+    with (gzip.open if fname.endswith( ".gz" )  else open)( fname, "rb" ) as f:
+        return f.read()
+
+
+#...............................................................................
+m = 300
+n = 400
+bigm = 20000
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+tmpdir = tempfile.mkdtemp( prefix="test-save-mod" )
+old, new = os.path.join( tmpdir, "old.mod" ), os.path.join( tmpdir, "new.mod" )
+
+for seed in range( 3 ):
+    lp = randlp( m, n, seed=seed )
+    old_write_amplmod( old, lp )
+    glp.save_lp( new, lp, verbose=0 )
+    check( "%s %s: new == old, %d bytes" % (lp.problemname, lp.A.shape, os.path.getsize( new )),
+            readbytes( new ) == readbytes( old ))
+    _write_amplmod( new, lp, block=64, verbose=0 )
+    check( "  block=64 == old", readbytes( new ) == readbytes( old ))
+    glp.save_lp( new + ".gz", lp, verbose=0 )
+    check( "  .mod.gz == old", readbytes( new + ".gz" ) == readbytes( old ))
+
+    # free rows: the new writer skips them == the old one without them
+lp = randlp( m, n, seed=3, free=True )
+free = ~ np.isfinite( lp.b ) & ~ np.isfinite( lp.blo )
+keep = np.flatnonzero( ~ free )
+nofree = glp.LP( A=lp.A[keep], b=lp.b[keep], blo=lp.blo[keep], c=lp.c, lb=lp.lb, ub=lp.ub,
+        maximize=lp.maximize, problemname=lp.problemname,
+        rowname=[lp.rowname[i] for i in keep], colname=lp.colname, verbose=0 )
+old_write_amplmod( old, nofree )
+glp.save_lp( new, lp, verbose=0 )
+check( "%d free rows skipped == old without them" % free.sum(),
+        free.any() and readbytes( new ) == readbytes( old ))
+
+    # GLPK reads it back, two-sided rows as 2 rows: the same optimum
+lp = randlp( m, n, seed=4 )
+lp.ub = np.fmin( lp.ub, 10 )  # bounded
+glp.save_lp( new, lp, verbose=0 )
+back = glp.load_lp( new, verbose=0 )
+fun = [linprog( **glp.lp_to_linprog( x, verbose=0 )[1] ).fun for x in [lp, back]]
+check( "GLPK reads the .mod: %d rows -> %d, linprog %.6g %.6g" % (
+        lp.A.shape[0], back.A.shape[0], fun[0], fun[1] ),
+        back.A.shape[1] == n  and np.allclose( fun[0], fun[1], rtol=1e-6 ))
+
+    # time
+lp = randlp( bigm, bigm, density=5. / bigm )
+t0 = time.time()
+old_write_amplmod( old, lp )
+t1 = time.time()
+glp.save_lp( new, lp, verbose=0 )
+t2 = time.time()
+check( "%d x %d  %d nnz: old %.2f sec  new %.2f" % (bigm, bigm, lp.A.nnz, t1 - t0, t2 - t1),
+        readbytes( new ) == readbytes( old ))
+
+shutil.rmtree( tmpdir, ignore_errors=True )
+print( "\ntest-save-mod: %d differ" % check.nbad )
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+""" test-save-native.py: save_lp engine="native" vs GLPK's writers, .lp .mps
+    lp -> save_lp glpk, save_lp native -> load_lp both -> the same LP ?
+    .mps native -> load_lp -> the same as lp, floats exact
+    LPWriter, rows streamed in blocks -> the same as save_lp native
+"""
+
+from __future__ import division, print_function
+import os
+import sys
+import tempfile
+import numpy as np
+from numpy import inf
+from scipy import sparse
+
+import glp
+from glp.zutil import Checks, scan_args, globs
+
+#...............................................................................
+def randlp( m=300, n=400, density=.03, seed=0 ):
+    """ random LP with the edge cases: ranged, empty and free rows, empty columns,
+        all bound types, odd names
+    """
+    rng = np.random.RandomState( seed )
+    A = sparse.random( m, n, density=density, random_state=rng, format="csr" )
+    A.data = np.where( rng.rand( A.nnz ) < .3, np.sign( A.data - .5 ), A.data * 20 - 10 )
+    A.data[::17] /= 3
+    A = sparse.csr_matrix( A.toarray() * (np.arange( m ) % 50 != 7)[:, None] )  # empty rows
+    A[:, 5] = 0  # empty column
+    A.eliminate_zeros()
+    b = np.round( rng.rand( m ) * 10, 3 )
+    blo = b - rng.randint( 0, 5, m )
+    blo[::3] = - inf
+    b[1::3] = inf
+    b[5::11] = blo[5::11] = np.nan  # not row 0: GLPK .mps would make it the objective
+    b[ np.isnan( b ) ] = inf  # free rows
+    blo[ np.isnan( blo ) ] = - inf
+    c = np.where( rng.rand( n ) < .5, 0, np.round( rng.randn( n ), 2 ))
+    lb = np.where( rng.rand( n ) < .8, 0, - inf )
+    lb[::7] = -2.5
+    ub = np.where( rng.rand( n ) < .6, inf, 5 )
+    ub[::9] = np.where( lb[::9] > - inf, lb[::9], 1 )  # fixed
+    ub[::13] = -1  # lb 0 ub -1 too
+    rowname = ["r%d" % i for i in range( m )]
+    rowname[1], rowname[2] = "a b", "1st"
+    colname = ["x%d" % j for j in range( n )]
+    colname[3], colname[4] = "y[1]", "e-4"
+    return glp.LP( A=A, b=b, blo=blo, c=c, lb=lb, ub=ub, problemname="rand %d" % seed,
+            rowname=rowname, colname=colname, verbose=0 )
+
+
+def lpdiff( lp1, lp2, tol=0, names=True, bycol=False, skip=() ):
+    """ -> list of fields that differ, |x - y| > tol (1 + |y|)
+        bycol: columns in name order first, .lp files order them by first use
+    """
+    if bycol:
+        lp1, lp2 = _bycol( lp1 ), _bycol( lp2 )
+    diff = []
+    if lp1.A.shape != lp2.A.shape or _differ( lp1.A.toarray(), lp2.A.toarray(), tol ):
+        diff.append( "A" )
+    for k in "b blo c lb ub".split():
+        if k not in skip and _differ( lp1[k], lp2[k], tol ):
+            diff.append( k )
+    if names:
+        for k in ("rowname", "colname"):
+            if list( lp1[k] ) != list( lp2[k] ):
+                diff.append( k )
+    return diff
+
+
+def _differ( x, y, tol ):
+    if tol == 0:
+        return not np.array_equal( x, y )
+    return not np.allclose( x, y, rtol=tol, atol=tol )
+
+
+def _bycol( lp ):
+    j = np.argsort( np.asarray( lp.colname ), kind="stable" )
+    return glp.LP( A=lp.A.tocsc()[:, j], b=lp.b, blo=lp.blo, c=lp.c[j], lb=lp.lb[j],
+            ub=lp.ub[j], rowname=lp.rowname, colname=np.asarray( lp.colname )[j], verbose=0 )
+
+
+def stream( outfile, lp, rows=50, bucketcols=64 ):
+    """ lp -> LPWriter, `rows` rows at a time, small buckets """
+    A = lp.A.tocsr()
+    with glp.LPWriter( outfile, lp.c, lp.lb, lp.ub, colname=lp.colname,
+            problemname=lp.problemname, bucketcols=bucketcols, verbose=0 ) as w:
+        for i0 in range( 0, A.shape[0], rows ):
+            i1 = min( i0 + rows, A.shape[0] )
+            w.add_rows( A[i0:i1], lp.b[i0:i1], lp.blo[i0:i1],
+                    rowname=np.asarray( lp.rowname )[i0:i1] )
+    return outfile
+
+
+#...............................................................................
+lpfiles = []  # default randlp(), or e.g. "../netlib/zib/mps/*.mps.gz"
+seeds = 3
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+
+tmpdir = tempfile.mkdtemp()
+lps = [(lpfile, glp.load_lp( lpfile, verbose=0 )) for lpfile in fileargs or globs( lpfiles )] \
+    or [("randlp %d" % seed, randlp( seed=seed )) for seed in range( seeds )]
+check = Checks()
+
+for name, lp in lps:
+    print( "\n--", name, lp.A.shape )
+    for suffix in (".lp", ".mps", ".mps.gz"):
+        gnufile = os.path.join( tmpdir, "glpk" + suffix )
+        natfile = os.path.join( tmpdir, "native" + suffix )
+        glp.save_lp( gnufile, lp, verbose=0 )
+        glp.save_lp( natfile, lp, engine="native", verbose=0 )
+        gnu = glp.load_lp( gnufile, verbose=0 )
+        nat = glp.load_lp( natfile, verbose=0 )
+            # GLPK writes 15 / 12 digits, native exact
+        if suffix == ".lp":  # ranged rows -> "~r_i" columns, both
+            diff = lpdiff( gnu, nat, tol=1e-14, bycol=True )
+        else:
+                # GLPK's .mps writer drops the objective if there are free rows
+            free = ~ np.isfinite( lp.b ) & ~ np.isfinite( lp.blo )
+            diff = lpdiff( gnu, nat, tol=1e-9, skip=("c",) if free.any()  else () )
+            diff += ["exact " + d for d in lpdiff( glp.load_lp( natfile, engine="native",
+                        verbose=0 ), nat, names=False )]
+            A, b, blo, _ = glp.lp_gnu.drop_unconstrained_rows(
+                    lp.A, lp.b, lp.blo, None, None, verbose=0 )
+            orig = glp.LP( A=A, b=b, blo=blo, c=lp.c, lb=lp.lb, ub=lp.ub, verbose=0 )
+                # ranged rows: blo + R, rounding
+            diff += ["orig " + d for d in lpdiff( orig, nat, tol=1e-14, names=False )]
+        check( "%-8s native %6.0f kbytes  glpk %6.0f  %s" % (
+                suffix, os.path.getsize( natfile ) / 1e3, os.path.getsize( gnufile ) / 1e3,
+                " ".join( diff )), not diff )
+
+        streamed = glp.load_lp( stream( os.path.join( tmpdir, "stream" + suffix ), lp ),
+                verbose=0 )
+        diff = lpdiff( nat, streamed, bycol=(suffix == ".lp") )  # .lp: all columns in obj:
+        check( "%-8s LPWriter  %s" % (suffix, " ".join( diff )), not diff )
+
+print( "\ntest-save-native: %d differ" % check.nbad )
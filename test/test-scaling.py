@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+""" test-scaling.py: scale gm eq ruiz -> solve -> unscale_solution == solve the unscaled LP
+    max |a| / min |a| before and after;  linprog highs-ipm iterations, unscaled vs scaled
+"""
+
+from __future__ import division, print_function
+import sys
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+import glp
+from glp import generators as gen
+from glp.zutil import Checks, scan_args
+
+#...............................................................................
+def badly_scaled( m, n, seed=0 ):
+    """ random_feasible, rows and cols * 10^-4 .. 10^4 """
+    lp = gen.random_feasible( m, n, k=8, seed=seed, verbose=0 )
+    rng = np.random.RandomState( seed )
+    r = 10. ** rng.uniform( -4, 4, size=m )
+    s = 10. ** rng.uniform( -4, 4, size=n )
+    A = sparse.diags( r ).dot( lp.A ).dot( sparse.diags( s )).tocsr()
+    return glp.LP( A=A, b=lp.b * r, blo=lp.blo * r, c=lp.c * s,
+            problemname="badly-scaled %d x %d" % (m, n), verbose=0 )
+
+
+def solve( lp ):
+    return glp.gnulp_solve( glp.lp_to_gnulp( lp, verbose=0 ), verbose=0 )
+
+
+def ipm( lp ):
+    _, linrec = glp.lp_to_linprog( lp, verbose=0 )
+    res = linprog( method="highs-ipm", options=dict( presolve=False ), **linrec )
+    return res.fun, res.nit
+
+
+m = 300
+n = 400
+verbose = 1
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+for lp in (badly_scaled( m, n ), gen.klee_minty( 20, inc=0, verbose=0 ),
+           gen.transportation( 20, 30, cmax=10**6, verbose=0 )):
+    full = solve( lp )
+    fun0, nit0 = ipm( lp )
+    for method in ("gm", "eq", "ruiz"):
+        lps, fac = glp.scale( lp, method=method, verbose=verbose )
+        sol = solve( lps )
+        back = glp.unscale_solution( fac, sol.x, sol.y, sol.dj )
+        chk = glp.check_many( lp, back.x, tol=1e-7 )
+        d = lp.c - lp.A.T.dot( back.y )
+        fun, nit = ipm( lps )
+        check( "  %s: obj %.8g  full %.8g  ipm iters %d -> %d" % (
+                method, lp.c.dot( back.x ), full.obj, nit0, nit ),
+                np.isclose( lp.c.dot( back.x ), full.obj, rtol=1e-8 ) and chk.ok[0]
+                and np.allclose( d, back.dj, atol=1e-6 * (1 + abs( lp.c ).max() ))
+                and np.isclose( fun, fun0, rtol=1e-6 ))
+
+    # powers of 2: scaling and unscaling are exact
+lp = badly_scaled( 50, 60, seed=1 )
+lps, fac = glp.scale( lp, verbose=0 )
+check( "pow2: unscaled lb ub c exact", np.array_equal( lps.c / fac.s, lp.c )
+        and np.array_equal( lps.lb * fac.s, lp.lb ) and
+        (np.log2( np.r_[ fac.r, fac.s ] ) % 1 == 0).all() )
+
+print( "\ntest-scaling: %d differ" % check.nbad )
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+""" test-solvecache.py: lp_hash the same for csr csc int64 PatternMatrix duplicates -0.,
+    different for a 1-ulp change, maximize, options;
+    cached_solve miss -> hit, the same solution and fields,
+    cancel progress time_limit iter_limit not in the key, itlim not saved;
+    LRU eviction;  hash time of a big LP
+"""
+
+from __future__ import division, print_function
+import os
+import sys
+import tempfile
+import threading
+import time
+import numpy as np
+from scipy import sparse
+
+import glp
+from glp import generators as gen
+from glp.zutil import Bag, Checks, scan_args
+
+m = 300
+n = 400
+bigm = 10**6
+verbose = 1
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+def changed( lp, **kw ):
+    new = Bag( lp )
+    new.update( kw )
+    return new
+
+lp = gen.random_feasible( m, n, verbose=0 )
+key = glp.lp_hash( lp )
+A = lp.A.tocsr()
+coo = A.tocoo()
+dup = sparse.coo_matrix( (np.r_[ coo.data / 2, coo.data / 2, np.zeros( 5 ) ],
+        (np.r_[ coo.row, coo.row, np.arange( 5 ) ], np.r_[ coo.col, coo.col, np.zeros( 5, int ) ])),
+        shape=A.shape )
+i64 = sparse.csr_matrix( (A.data, A.indices.astype( np.int64 ), A.indptr.astype( np.int64 )),
+        shape=A.shape )
+c = lp.c.copy()
+c[ c == 0 ] = -0.
+for what, A2 in (("csc", A.tocsc()), ("int64", i64), ("coo duplicates, 0s", dup)):
+    check( "lp_hash %s == csr" % what, glp.lp_hash( changed( lp, A=A2 )) == key )
+check( "lp_hash -0. == 0.", glp.lp_hash( changed( lp, c=c, problemname="other" )) == key )
+b = lp.b.copy()
+b[0] = np.nextafter( b[0], np.inf )
+for what, lp2, opt in (("b 1 ulp", changed( lp, b=b ), None),
+                       ("maximize", changed( lp, maximize=True ), None),
+                       ("options", lp, dict( solver="interior" ))):
+    check( "lp_hash %s != " % what, glp.lp_hash( lp2, opt ) != key )
+P = glp.compact_A( sparse.csr_matrix( (np.ones( A.nnz ), A.indices, A.indptr), shape=A.shape ))
+check( "lp_hash PatternMatrix == its csr of 1s",
+        glp.lp_hash( changed( lp, A=P )) == glp.lp_hash( changed( lp, A=glp.scipy_A( P ))))
+
+cachedir = tempfile.mkdtemp( prefix="test-solvecache" )
+t0 = time.time()
+sol = glp.cached_solve( lp, cache=cachedir, verbose=verbose )
+tmiss = time.time() - t0
+t0 = time.time()
+hit = glp.cached_solve( changed( lp, A=A.tocsc(), problemname="copy" ), cache=cachedir,
+        verbose=verbose )
+thit = time.time() - t0
+check( "miss %.3f sec, hit %.3f sec: obj %.8g %.8g" % (tmiss, thit, sol.obj, hit.obj),
+        not sol.hit and hit.hit and sol.obj == hit.obj and hit.status == sol.status
+        and sorted( hit ) == sorted( sol ) and hit.status_primal == sol.status_primal
+        and hit.iters == sol.iters
+        and all( np.array_equal( sol[k], hit[k] ) for k in "x y dj Ax".split() ))
+ev = threading.Event()
+hit = glp.cached_solve( lp, cache=cachedir, cancel=ev, progress=lambda p: None, every=.5,
+        verbose=0 )
+check( "cancel progress every: not in the key, a hit", hit.hit and hit.key == sol.key )
+hit = glp.cached_solve( lp, cache=cachedir, time_limit=100, iter_limit=10**6, verbose=0 )
+check( "time_limit iter_limit: not in the key, a hit", hit.hit and hit.key == sol.key )
+lp1 = gen.random_feasible( m, n, seed=9, verbose=0 )
+ndir = len( os.listdir( cachedir ))
+stop = glp.cached_solve( lp1, cache=cachedir, iter_limit=1, verbose=0 )
+again = glp.cached_solve( lp1, cache=cachedir, iter_limit=1, verbose=0 )
+check( "status %s: not saved" % stop.status, stop.status not in glp.solvecache.FINAL
+        and not again.hit and len( os.listdir( cachedir )) == ndir )
+for seed in range( 1, 6 ):
+    glp.cached_solve( gen.random_feasible( m, n, seed=seed, verbose=0 ), cache=cachedir,
+            maxbytes=3 * 12e3, verbose=0 )  # an entry ~ 11k
+check( "maxbytes: %d entries" % len( os.listdir( cachedir )), len( os.listdir( cachedir )) == 3 )
+check( "lru: the first dropped", not glp.cached_solve( lp, cache=cachedir, verbose=0 ).hit )
+
+lp = gen.random_feasible( bigm, bigm, verbose=0 )
+t0 = time.time()
+glp.lp_hash( lp )
+secs = time.time() - t0
+mb = (lp.A.nnz * 16 + 6 * bigm * 8) / 1e6
+print( "lp_hash %s: %.0f MB  %.2f sec  %.0f MB/sec" % (lp.problemname, mb, secs, mb / secs ))
+
+print( "\ntest-solvecache: %d differ" % check.nbad )
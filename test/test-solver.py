@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+""" test-solver.py: Solver warm re-solves == cold gnulp_solve of the changed LP
+    random_feasible, change some of c, b, ub, A, basis save / restore;
+    time a full solve vs a re-solve after a few changes
+"""
+
+from __future__ import division, print_function
+import sys
+import time
+import numpy as np
+from numpy import inf
+from scipy import sparse
+
+import glp
+from glp import generators as gen
+from glp.zutil import Bag, Checks, scan_args
+
+def cold( lp ):
+    return glp.gnulp_solve( glp.lp_to_gnulp( lp, verbose=0 ), verbose=0 )
+
+def changed( lp, **kw ):
+    new = Bag( lp )
+    new.update( kw )
+    return new
+
+
+m = 300
+n = 400
+nchange = 20
+bigm = 1500
+verbose = 1
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+def same( what, warm, lp, meth ):
+    ref = cold( lp )
+    check( "%s: obj %.8g  cold %.8g  %s %s" % (what, warm.obj, ref.obj, warm.meth, warm.status),
+            np.isclose( warm.obj, ref.obj, rtol=1e-9, atol=1e-9 )
+            and warm.status == ref.status and warm.meth == meth )
+
+rng = np.random.RandomState( 0 )
+lp = gen.random_feasible( m, n, verbose=0 )
+s = glp.Solver( lp, verbose=verbose )
+sol = s.solve()
+check( "first solve: obj %.8g  fopt %.8g" % (sol.obj, lp.fopt),
+        np.isclose( sol.obj, lp.fopt, rtol=1e-9 ))
+basis0 = s.get_basis()
+
+    # c up on some cols: still dual feasible, bounded
+j = rng.choice( n, nchange, replace=False )
+c = lp.c.copy()
+c[j] += rng.uniform( 0, 1, size=nchange )
+s.set_obj( c[j], j )
+lp = changed( lp, c=c )
+same( "c", s.solve(), lp, "primal" )
+
+    # b of some <= rows, and ub on some cols
+i = rng.choice( np.flatnonzero( lp.blo == - inf ), nchange, replace=False )
+b = lp.b.copy()
+b[i] += rng.uniform( -.5, 1, size=nchange )
+s.set_row_bounds( lp.blo[i], b[i], i )
+lp = changed( lp, b=b )
+same( "b", s.solve(), lp, "dualp" )
+j = rng.choice( n, nchange, replace=False )
+ub = np.full( n, inf )
+ub[j] = lp.xopt[j] + rng.uniform( 0, 1, size=nchange )
+s.set_col_bounds( 0, ub[j], j )
+lp = changed( lp, ub=ub )
+same( "ub", s.solve(), lp, "dualp" )
+
+    # A[i, j] * 1.01 in cols with x* 0
+A = lp.A.tocoo()
+k = rng.choice( np.flatnonzero( lp.xopt[A.col] == 0 ), nchange, replace=False )
+data = A.data.copy()
+data[k] *= 1.01
+s.set_coefs( A.row[k], A.col[k], data[k] )
+lp = changed( lp, A=sparse.coo_matrix( (data, (A.row, A.col)), shape=A.shape ).tocsr() )
+same( "A", s.solve(), lp, "primal" )
+
+    # basis: back to the first c, b, ub, A and basis -> 0 iterations
+lp0 = gen.random_feasible( m, n, verbose=0 )
+s.set_obj( lp0.c )
+s.set_row_bounds( lp0.blo, lp0.b )
+s.set_col_bounds( 0, inf )
+s.set_coefs( A.row[k], A.col[k], A.data[k] )
+s.set_basis( basis0 )
+sol = s.solve()
+check( "set_basis: obj %.8g  fopt %.8g  %s iters" % (sol.obj, lp0.fopt, sol.iters),
+        np.isclose( sol.obj, lp0.fopt, rtol=1e-9 ) and sol.iters in (0, None) )
+b1 = s.get_basis()
+check( "get_basis == the one set",
+        (b1.rows == basis0.rows).all() and (b1.cols == basis0.cols).all() )
+
+    # time: full solve vs a few changes
+lp = gen.random_feasible( bigm, 4 * bigm // 3, verbose=0 )
+t0 = time.time()
+s = glp.Solver( lp, verbose=0 )
+full = s.solve()
+tfull = time.time() - t0
+i = rng.choice( np.flatnonzero( lp.blo == - inf ), nchange, replace=False )
+s.set_row_bounds( - inf, lp.b[i] + rng.uniform( -.5, 1, size=nchange ), i )
+warm = s.solve()
+j = rng.choice( lp.A.shape[1], nchange, replace=False )
+s.set_obj( lp.c[j] + rng.uniform( 0, 1, size=nchange ), j )
+warm2 = s.solve()
+print( "%s: full solve %.2f sec %s iters,  b changed %.3f sec %s iters,  c changed %.3f sec %s iters" % (
+        lp.problemname, tfull, full.iters, warm.time, warm.iters, warm2.time, warm2.iters ))
+check( "re-solves < 1/5 full solve", max( warm.time, warm2.time ) < tfull / 5 )
+
+print( "\ntest-solver: %d differ" % check.nbad )
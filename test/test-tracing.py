@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+""" test-tracing.py: spans of load_lp gnulp_to_lp ... gnulp_solve, nested right;
+    arrays=True bytes; write_jsonl write_chrome; the cost of span() disabled
+"""
+
+from __future__ import division, print_function
+import json
+import os
+import sys
+import tempfile
+import time
+
+import glp
+from glp import generators as gen
+from glp import tracing as trace
+from glp.zutil import Checks, scan_args
+
+m = 1000
+n = 1500
+ncall = 10**6
+verbose = 1
+
+    # run my.py [a=1 b=None 'c = expr' ...] [file* ...] in shell or IPython
+eqargs, fileargs = scan_args( sys.argv )
+for eqarg in eqargs:
+    exec( eqarg )
+check = Checks()
+
+tmpdir = tempfile.mkdtemp( prefix="test-tracing" )
+lpfile = os.path.join( tmpdir, "rf.glp" )
+lp = gen.random_feasible( m, n, verbose=0 )
+lp.problemname = "rf"  # no blanks in .glp
+glp.save_lp( lpfile, lp, verbose=0 )
+
+def run():
+    lp = glp.load_lp( lpfile, verbose=0 )
+    return glp.gnulp_solve( glp.lp_to_gnulp( lp, verbose=0 ), verbose=0 )
+
+run()
+check( "disabled: no spans", trace.spans() == [] )
+
+for arrays in (False, True):
+    trace.clear()
+    trace.enable( arrays=arrays )
+    with trace.span( "run", arrays=arrays ):
+        run()
+    trace.disable()
+    spans = trace.spans()
+    if verbose:
+        trace.print_spans()
+    byname = dict( (s["name"], s) for s in spans )
+    names = [s["name"] for s in spans]
+    check( "arrays=%s: %s" % (arrays, " ".join( names )),
+            names == "run load_lp gnulp_to_lp drop_unconstrained_rows lp_to_gnulp "
+                     "gnulp_solve scale simplex gnulp_solution".split() )
+    check( "  parents, depths, child wall <= parent wall",
+            byname["scale"]["parent"] == "gnulp_solve" and byname["simplex"]["depth"] == 2
+            and byname["drop_unconstrained_rows"]["parent"] == "gnulp_to_lp"
+            and all( s["wall"] <= byname[s["parent"]]["wall"] + 1e-6
+                     for s in spans if s["parent"] ))
+    check( "  attrs: lp_to_gnulp %s" % byname["lp_to_gnulp"]["attrs"],
+            byname["lp_to_gnulp"]["attrs"]["nnz"] == glp.load_lp( lpfile, verbose=0 ).A.nnz )
+    if arrays:
+        g = byname["gnulp_to_lp"]
+        check( "  gnulp_to_lp alloc %.2f MB  peak %.2f MB, run peak %.2f" % (
+                g["alloc_mb"], g["peak_mb"], byname["run"]["peak_mb"] ),
+                0 < g["alloc_mb"] <= g["peak_mb"] <= byname["run"]["peak_mb"] )
+
+jsonl = os.path.join( tmpdir, "trace.jsonl" )
+chrome = os.path.join( tmpdir, "trace.json" )
+trace.write_jsonl( jsonl )
+trace.write_chrome( chrome )
+lines = [json.loads( line ) for line in open( jsonl )]
+events = json.load( open( chrome ))["traceEvents"]
+check( "write_jsonl %d lines, write_chrome %d events" % (len(lines), len(events)),
+        len(lines) == len(events) == len(spans)
+        and all( e["ph"] == "X" and e["dur"] >= 0 for e in events ))
+
+t0 = time.time()
+for _ in range( ncall ):
+    with trace.span( "x" ):
+        pass
+ns = (time.time() - t0) / ncall * 1e9
+check( "disabled: with span() %.0f ns a call" % ns, ns < 1000 and trace.spans() == spans )
+
+print( "\ntest-tracing: %d differ" % check.nbad )
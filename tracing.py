@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+""" tracing.py: nested timing spans, wall cpu RSS and array bytes per stage, off by default
+    from glp import tracing as trace
+    trace.enable()  # arrays=True: tracemalloc too, numpy allocations -- slower
+    lp = glp.load_lp( "my.mps" )  # load_lp gnulp_to_lp drop_unconstrained_rows ...
+    sol = glp.gnulp_solve( glp.lp_to_gnulp( lp ))  # lp_to_gnulp scale simplex gnulp_solution
+    trace.print_spans()
+    trace.write_jsonl( "my.trace.jsonl" )  # a line per span
+    trace.write_chrome( "my.trace.json" )  # chrome://tracing, perfetto.dev
+
+    with trace.span( "mystage", n=n ): ...  # or @trace.traced on a function
+    trace.note( nnz=A.nnz )  # attrs on the current span
+
+    A span: name depth parent t0 wall cpu rss_mb attrs, + alloc_mb peak_mb with arrays=True --
+        rss_mb: growth of the process's peak RSS, getrusage ru_maxrss, during the span
+        alloc_mb: bytes still allocated at the end - at the start, tracemalloc
+        peak_mb: peak allocated - at the start, children's peaks included
+    Disabled, span() is a flag test and a shared do-nothing object, traced() one more call.
+    GLP_TRACE=file.json or file.jsonl in the environment: enable at import, write at exit.
+"""
+
+from __future__ import division, print_function
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+_on = False
+_arrays = False
+_spans = []  # finished, in end order
+_local = threading.local()  # .stack of open spans, per thread
+_T0 = time.time()
+
+#...............................................................................
+def enable( arrays=False ):
+    """ start recording spans;  arrays=True: tracemalloc, alloc_mb peak_mb """
+    global _on, _arrays
+    _on = True
+    _arrays = arrays
+    if arrays:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+
+def disable():
+    global _on
+    _on = False
+    if _arrays:
+        import tracemalloc
+        tracemalloc.stop()
+
+
+def clear():
+    del _spans[:]
+
+
+def spans():
+    """ -> the finished spans, dicts, in start order """
+    return sorted( _spans, key=lambda s: (s["t0"], s["depth"]) )
+
+
+def span( name, **attrs ):
+    """ with span( "stage", key=val ... ): -- records a span if enabled """
+    if not _on:
+        return _nospan
+    return _Span( name, attrs )
+
+
+def traced( func=None, name=None ):
+    """ @traced or @traced( name="..." ): each call a span """
+    if func is None:
+        return functools.partial( traced, name=name )
+    name = name or func.__name__
+
+    @functools.wraps( func )
+    def wrapper( *args, **kw ):
+        if not _on:
+            return func( *args, **kw )
+        with _Span( name, {} ):
+            return func( *args, **kw )
+    return wrapper
+
+
+def note( **attrs ):
+    """ add attrs to the innermost open span, if any """
+    if _on:
+        stack = getattr( _local, "stack", None )
+        if stack:
+            stack[-1].attrs.update( attrs )
+
+
+#...............................................................................
+def print_spans( spanlist=None ):
+    """ an indented table: wall cpu rss [alloc peak] name attrs """
+    for s in spanlist or spans():
+        mem = "  %8.1f %8.1f" % (s["alloc_mb"], s["peak_mb"]) if "alloc_mb" in s  else ""
+        attrs = "  ".join( "%s %s" % kv for kv in sorted( s["attrs"].items() ))
+        print( "%8.3f %8.3f %8.1f%s  %s%s  %s" % (
+                s["wall"], s["cpu"], s["rss_mb"], mem, "  " * s["depth"], s["name"], attrs ))
+
+
+def write_jsonl( filename, spanlist=None ):
+    """ a JSON line per span """
+    with open( filename, "w" ) as f:
+        for s in spanlist or spans():
+            f.write( json.dumps( s, default=str ) + "\n" )
+
+
+def write_chrome( filename, spanlist=None ):
+    """ Chrome trace event format, "X" complete events, microseconds -- chrome://tracing """
+    events = [dict( name=s["name"], ph="X", ts=s["t0"] * 1e6, dur=s["wall"] * 1e6,
+                    pid=s["pid"], tid=s["tid"],
+                    args=dict( s["attrs"], cpu=s["cpu"], rss_mb=s["rss_mb"],
+                            **dict( (k, s[k]) for k in ("alloc_mb", "peak_mb") if k in s )))
+              for s in spanlist or spans()]
+    with open( filename, "w" ) as f:
+        json.dump( dict( traceEvents=events, displayTimeUnit="ms" ), f, default=str )
+
+
+#...............................................................................
+class _NoSpan( object ):
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, *exc ):
+        return False
+
+_nospan = _NoSpan()
+
+
+class _Span( object ):
+    __slots__ = ("name", "attrs", "t0", "cpu0", "rss0", "mem0", "peak", "stack")
+
+    def __init__( self, name, attrs ):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__( self ):
+        stack = getattr( _local, "stack", None )
+        if stack is None:
+            stack = _local.stack = []
+        if _arrays:
+            import tracemalloc
+            cur, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].peak = max( stack[-1].peak, peak )
+            tracemalloc.reset_peak()
+            self.mem0 = self.peak = cur
+        self.stack = stack
+        stack.append( self )
+        self.rss0 = _maxrss()
+        self.cpu0 = time.process_time()
+        self.t0 = time.time()
+        return self
+
+    def __exit__( self, *exc ):
+        t1 = time.time()
+        cpu1 = time.process_time()
+        stack = self.stack
+        stack.pop()
+        rec = dict( name=self.name, depth=len(stack),
+                parent=stack[-1].name if stack  else None,
+                t0=self.t0 - _T0, wall=t1 - self.t0, cpu=cpu1 - self.cpu0,
+                rss_mb=(_maxrss() - self.rss0) / 1e6,
+                attrs=self.attrs, pid=os.getpid(), tid=threading.current_thread().ident )
+        if _arrays:
+            import tracemalloc
+            cur, peak = tracemalloc.get_traced_memory()
+            peak = max( self.peak, peak )
+            rec.update( alloc_mb=(cur - self.mem0) / 1e6, peak_mb=(peak - self.mem0) / 1e6 )
+            if stack:
+                stack[-1].peak = max( stack[-1].peak, peak )
+        if exc[0] is not None:
+            rec["error"] = exc[0].__name__
+        _spans.append( rec )
+        return False
+
+
+def _maxrss():
+    """ peak RSS of this process, bytes; 0 without resource """
+    if resource is None:
+        return 0
+    return resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss * 1024  # linux KB
+
+
+def _write_at_exit( filename ):
+    (write_chrome if filename.endswith( ".json" )  else write_jsonl)( filename )
+
+if os.environ.get( "GLP_TRACE" ):
+    enable()
+    atexit.register( _write_at_exit, os.environ["GLP_TRACE"] )
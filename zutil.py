@@ -20,13 +20,27 @@ def boundsvec( x, n, none ):
     """ -> n-vec, None -> none e.g. 0 """
     if np.isscalar( x ):
         return x * np.ones( n )
-    x = np.squeeze( x )
+    x = np.atleast_1d( np.squeeze( x ))  # n 1 -> n, 1-vec stays
     assert x.shape == (n,), [x.shape, n]
     x = np.asarray( x, dtype=float )  # None -> NaN
     x[ np.isnan(x) ] = none
     return x
 
 
+class Checks( object ):
+    """ test scripts: check = Checks();  check( "what", ok ) prints "what  ok" or "** differ"
+        ... print( "test-x: %d differ" % check.nbad )
+    """
+    def __init__( self, width=60 ):
+        self.width = width
+        self.nbad = 0
+
+    def __call__( self, what, ok ):
+        print( "%-*s %s" % (self.width, what, "ok" if ok  else "** differ" ))
+        self.nbad += not ok
+        return ok
+
+
 def dot0( A, dot=".", mul=1 ):
     """ make big sparse arrays more readable: A*mul | ints | 0 -> dot """
     import re
@@ -57,8 +71,15 @@ def minavmax( x, fmt="%.3g " ):
 
 
 def nbytes( A ):
-    return np.nbytes( A ) if not sparse.issparse(A) \
-        else A.data.nbytes + A.indices.nbytes + A.indptr.nbytes 
+    """ bytes in the buffers of a numpy array, scipy.sparse csr / csc, PatternMatrix;
+        a 0-stride (broadcast) array counts what's stored, e.g. 8 for PatternMatrix.data
+    """
+    if hasattr( A, "indptr" ):
+        return nbytes( A.data ) + A.indices.nbytes + A.indptr.nbytes
+    if sparse.issparse( A ):
+        return nbytes( A.tocsr() )
+    x = np.asarray( A )
+    return x.itemsize * int( np.prod([ n for n, s in zip( x.shape, x.strides ) if s != 0 ]))
 
 
 def ptime( msg=None, T=[0,0]):
@@ -68,7 +89,7 @@ def ptime( msg=None, T=[0,0]):
         ptime( "message" )
     """
     wall = time.time()  # wallclock
-    cpu = getattr( time, "process_time", time.clock )()  # py3 py2
+    cpu = time.process_time() if hasattr( time, "process_time" )  else time.clock()  # py3 py2
     dwall = wall - T[0]
     dcpu = cpu - T[1]
     if msg:
@@ -132,6 +153,14 @@ def sparsematrix_dict( A, nm="A" ):
     """ np.savez( mynpz, ... **sparsematrix_dict( A )) """
     if type(A).__name__ not in "csr_matrix csc_matrix ".split():
         A = A.tocsr()
+    if type(A).__name__ == "PatternMatrix":  # compact.py, no data array
+        return {
+            nm + "_value"   : np.array([ A.value ]),
+            nm + "_indices" : A.indices,
+            nm + "_indptr"  : A.indptr,
+            nm + "_shape"   : np.array( A.shape ),
+            nm + "_dtype"   : "PatternMatrix"
+            }
     return {
         nm + "_data"    : A.data,
         nm + "_indices" : A.indices,
@@ -141,11 +170,14 @@ def sparsematrix_dict( A, nm="A" ):
         }
 
 def dict_sparsematrix( adict, nm="A" ):
-    data    = adict[ nm + "_data" ]
-    indices = adict[ nm + "_indices" ].astype( int )
-    indptr  = adict[ nm + "_indptr" ].astype( int )
+    indices = adict[ nm + "_indices" ]  # int32 stay int32
+    indptr  = adict[ nm + "_indptr" ]
     shape   = tuple( adict[ nm + "_shape" ])
-    dtype   = str( adict[ nm + "_dtype" ])  # csr_matrix csc_matrix
+    dtype   = str( adict[ nm + "_dtype" ])  # csr_matrix csc_matrix PatternMatrix
+    if dtype == "PatternMatrix":
+        from glp.compact import PatternMatrix
+        return PatternMatrix( indptr, indices, shape, value=adict[ nm + "_value" ][0] )
+    data    = adict[ nm + "_data" ]
     mat = getattr( sparse, dtype )
     return mat( (data, indices, indptr), shape=shape )
 